@@ -4,7 +4,7 @@ Agricultural Portals connector
 from typing import List, Optional
 from datetime import datetime
 from app.connectors.base import BaseConnector
-from app.models.schemas import NewsArticle
+from app.models.schemas import NewsArticle, NewsQuery
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,8 @@ class AgroPortalsConnector(BaseConnector):
         query: Optional[str] = None,
         country: Optional[str] = None,
         commodity: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """
         Fetch news from agricultural portals
@@ -120,4 +121,4 @@ class AgroPortalsConnector(BaseConnector):
             )
         ]
         
-        return mock_articles[:limit]
+        return self._tag_locations(mock_articles[:limit], country)
@@ -2,23 +2,42 @@
 Base connector class for all data sources
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Iterable, Optional, Tuple, TYPE_CHECKING
+from datetime import datetime
 import httpx
 import logging
-from app.models.schemas import NewsArticle, NewsCategory
+from app.models.schemas import NewsArticle, NewsCategory, NewsQuery
 from app.config import settings
 from app.utils.category_classifier import classifier
+from app.utils.model_classifier import model_classifier
+from app.utils.gazetteer import gazetteer
+from app.services.article_index import article_matches, field_matches
+from app.services.metrics import http_client
+from app.services.tracing import span
+
+if TYPE_CHECKING:
+    from app.services.dedup_index import DedupIndex
 
 logger = logging.getLogger(__name__)
 
+# Every NewsQuery predicate: the filter fields plus the since/until window
+ALL_PREDICATES = frozenset({"country", "state", "commodity", "ticker", "category", "time_window"})
+
 
 class BaseConnector(ABC):
     """Abstract base class for all news source connectors"""
     
+    # Predicates the connector applies itself, upstream or before building
+    # articles; the aggregator applies the remaining ones to its results
+    pushdown_predicates: FrozenSet[str] = frozenset()
+    
     def __init__(self):
         self.source_name = self.__class__.__name__.replace("Connector", "").lower()
         self.timeout = settings.REQUEST_TIMEOUT
-        self.classifier = classifier
+        self.classifier = model_classifier or classifier
+        self.gazetteer = gazetteer
+        # Set by an ingesting aggregator to skip articles stored by earlier polls
+        self.dedup_index: Optional["DedupIndex"] = None
         
     @abstractmethod
     async def fetch_news(
@@ -26,7 +45,8 @@ class BaseConnector(ABC):
         query: Optional[str] = None,
         country: Optional[str] = None,
         commodity: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """
         Fetch news from the source and return normalized articles
@@ -36,12 +56,34 @@ class BaseConnector(ABC):
             country: Filter by country
             commodity: Filter by commodity
             limit: Maximum number of results
+            news_query: Full query, for connectors with pushdown_predicates
             
         Returns:
             List of normalized NewsArticle objects
         """
         pass
     
+    async def search(self, news_query: NewsQuery) -> List[NewsArticle]:
+        """
+        Run a structured query, newest first, ready for a k-way merge
+        
+        Args:
+            news_query: Query with search terms, filters and time window
+            
+        Returns:
+            List of normalized NewsArticle objects, newest first. Only the
+            predicates in pushdown_predicates are guaranteed to hold.
+        """
+        articles = await self.fetch_news(
+            query=news_query.query,
+            country=news_query.country,
+            commodity=news_query.commodity,
+            limit=news_query.limit,
+            news_query=news_query
+        )
+        articles.sort(key=lambda a: a.timestamp, reverse=True)
+        return articles
+    
     async def _make_request(
         self, 
         url: str, 
@@ -64,7 +106,7 @@ class BaseConnector(ABC):
             Response JSON or None if failed
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with http_client(self.source_name, timeout=self.timeout) as client:
                 response = await client.request(
                     method=method,
                     url=url,
@@ -145,6 +187,128 @@ class BaseConnector(ABC):
                     
         return tags
     
+    def _in_window(self, timestamp: datetime, news_query: Optional[NewsQuery]) -> bool:
+        """Check a publication time against the query's since/until window"""
+        if news_query is None:
+            return True
+        if news_query.since and timestamp < news_query.since:
+            return False
+        if news_query.until and timestamp >= news_query.until:
+            return False
+        return True
+    
+    def _build_articles(
+        self,
+        source: str,
+        items: Iterable[Dict[str, Any]],
+        news_query: Optional[NewsQuery] = None,
+        default_country: Optional[str] = None
+    ) -> List[NewsArticle]:
+        """
+        Tag raw items and build articles, dropping those a predicate rejects
+        
+        Checks run cheapest first (time window, dedup index, tickers, tags)
+        and stop at the first failing predicate. The items left are then
+        classified together, in one vectorized pass with a model classifier,
+        before the category and location checks. Rejected items never reach
+        classification or model validation.
+        
+        Args:
+            source: Source name (SourceType value)
+            items: Raw items: dicts with a headline and optionally a
+                summary, url and timestamp (publication time, defaults to now)
+            news_query: Query whose filters and time window apply
+            default_country: Country used when none is found in the text
+            
+        Returns:
+            Articles for the items that passed, in item order
+        """
+        filters = news_query.filters if news_query else {}
+        
+        def rejects(field: str, terms: List[Optional[str]]) -> bool:
+            value = filters.get(field)
+            return value is not None and not field_matches(field, value, terms)
+        
+        candidates = []
+        for item in items:
+            headline, summary, url = item["headline"], item.get("summary"), item.get("url")
+            timestamp = item.get("timestamp") or datetime.utcnow()
+            if not self._in_window(timestamp, news_query) or self._is_seen(url, headline):
+                continue
+            candidates.append((headline, summary, url, timestamp))
+        if not candidates:
+            return []
+        
+        articles = []
+        with span("tag", items=len(candidates)):
+            tagged = []
+            for headline, summary, url, timestamp in candidates:
+                text = f"{headline} {summary or ''}"
+                tickers = self._extract_tickers(text)
+                if rejects("ticker", tickers):
+                    continue
+                commodity_tags = self._extract_commodity_tags(text)
+                if rejects("commodity", commodity_tags):
+                    continue
+                tagged.append((headline, summary, url, timestamp, text, tickers, commodity_tags))
+            
+            categories = self._classify_categories([(item[0], item[1]) for item in tagged])
+            for (headline, summary, url, timestamp, text, tickers, commodity_tags), category in zip(tagged, categories):
+                if rejects("category", [category.value]):
+                    continue
+                country, state = self._extract_location(text, news_query.country if news_query else None)
+                country = country or default_country
+                if rejects("country", [country]) or rejects("state", [state]):
+                    continue
+                articles.append(NewsArticle(
+                    headline=headline,
+                    source=source,
+                    category=category,
+                    url=url,
+                    summary=summary,
+                    tickers=tickers,
+                    country=country,
+                    state=state,
+                    commodity_tags=commodity_tags,
+                    timestamp=timestamp
+                ))
+        
+        return articles
+    
+    def _apply_query(
+        self,
+        articles: List[NewsArticle],
+        news_query: Optional[NewsQuery]
+    ) -> List[NewsArticle]:
+        """
+        Apply a query's filters and time window to already-built articles
+        
+        Used for mock data, so connectors keep their pushdown guarantees.
+        """
+        if news_query is None:
+            return articles
+        return [
+            a for a in articles
+            if self._in_window(a.timestamp, news_query) and article_matches(a, **news_query.filters)
+        ]
+    
+    def _is_seen(self, url: Optional[str], headline: Optional[str]) -> bool:
+        """
+        Check whether an article was already ingested by a recent poll
+        
+        Called before tagging so known articles cost one in-memory lookup;
+        the aggregator checks the full index afterwards. Always False when
+        no dedup index is attached (live requests).
+        
+        Args:
+            url: Article URL
+            headline: Article headline
+            
+        Returns:
+            True if the article should be skipped
+        """
+        return self.dedup_index is not None and self.dedup_index.recently_seen(url, headline)
+    
     def _classify_category(self, headline: str, summary: Optional[str] = None) -> NewsCategory:
         """
         Classify news article into a category
@@ -157,4 +321,65 @@ class BaseConnector(ABC):
             NewsCategory enum value
         """
         return self.classifier.classify_article(headline, summary)
-
+    
+    def _classify_categories(self, items: List[Tuple[str, Optional[str]]]) -> List[NewsCategory]:
+        """
+        Classify a batch of articles in one call
+        
+        Args:
+            items: (headline, summary) pairs
+            
+        Returns:
+            NewsCategory for each item
+        """
+        if not items:
+            return []
+        return self.classifier.classify_articles(items)
+    
+    def _extract_location(
+        self,
+        text: str,
+        country: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract country and state/region from text
+        
+        Args:
+            text: Text to extract the location from
+            country: Requested country filter; overrides countries found in text
+            
+        Returns:
+            Tuple of (country, state)
+        """
+        return self.gazetteer.extract(text, country)
+    
+    def _tag_locations(
+        self,
+        articles: List[NewsArticle],
+        country: Optional[str] = None
+    ) -> List[NewsArticle]:
+        """
+        Fill country and state on already-built articles from their text
+        
+        Countries found in the text replace a connector's hard-coded default;
+        when nothing is found the existing country is kept, in canonical form.
+        
+        Args:
+            articles: Articles to tag in place
+            country: Requested country filter
+            
+        Returns:
+            The same list of articles
+        """
+        for article in articles:
+            detected_country, state = self._extract_location(
+                f"{article.headline} {article.summary or ''}", country
+            )
+            if detected_country:
+                article.country = detected_country
+            elif article.country:
+                article.country = self.gazetteer.canonical_country(article.country) or article.country
+            if state:
+                article.state = state
+        
+        return articles
@@ -3,8 +3,9 @@ Google Custom Search API connector
 """
 from typing import List, Optional
 from datetime import datetime
-from app.connectors.base import BaseConnector
-from app.models.schemas import NewsArticle
+import math
+from app.connectors.base import BaseConnector, ALL_PREDICATES
+from app.models.schemas import NewsArticle, NewsQuery
 from app.services.config_service import config
 import logging
 
@@ -14,6 +15,10 @@ logger = logging.getLogger(__name__)
 class GoogleSearchConnector(BaseConnector):
     """Connector for Google Custom Search API"""
     
+    # The since bound goes upstream as dateRestrict; the rest is checked
+    # on raw results before building articles
+    pushdown_predicates = ALL_PREDICATES
+    
     def __init__(self):
         super().__init__()
         self.base_url = "https://www.googleapis.com/customsearch/v1"
@@ -23,14 +28,18 @@ class GoogleSearchConnector(BaseConnector):
         query: Optional[str] = None,
         country: Optional[str] = None,
         commodity: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """Fetch news from Google Custom Search"""
         
         # Check if API key is configured
         if not config.is_service_enabled('google_search'):
             logger.warning("Google API key not configured, returning mock data")
-            return self._get_mock_data(query or commodity or "commodity", country, limit)
+            return self._apply_query(
+                self._get_mock_data(query or commodity or "commodity", country, limit),
+                news_query
+            )
         
         all_articles = []
         
@@ -64,28 +73,23 @@ class GoogleSearchConnector(BaseConnector):
                 "q": search_query,
                 "num": min(articles_per_keyword, 10)
             }
+            if news_query and news_query.since:
+                # Restrict results to the last N days
+                days = math.ceil((datetime.utcnow() - news_query.since).total_seconds() / 86400)
+                params["dateRestrict"] = f"d{max(days, 1)}"
             
             response = await self._make_request(self.base_url, params=params)
             
             if response and "items" in response:
                 # Process results for this keyword
-                for item in response.get("items", []):
-                    headline = item.get("title", "")
-                    summary = item.get("snippet", "")
-                    combined_text = headline + " " + summary
-                    
-                    article = NewsArticle(
-                        headline=headline,
-                        source="google_search",
-                        category=self._classify_category(headline, summary),
-                        url=item.get("link", ""),
-                        summary=summary,
-                        tickers=self._extract_tickers(combined_text),
-                        country=country,
-                        commodity_tags=self._extract_commodity_tags(combined_text),
-                        timestamp=datetime.utcnow()
-                    )
-                    all_articles.append(article)
+                all_articles.extend(self._build_articles(
+                    "google_search",
+                    [
+                        {"headline": item.get("title", ""), "summary": item.get("snippet", ""), "url": item.get("link", "")}
+                        for item in response.get("items", [])
+                    ],
+                    news_query=news_query or NewsQuery(country=country)
+                ))
         
         # Remove duplicates based on headline
         seen_headlines = set()
@@ -172,4 +176,4 @@ class GoogleSearchConnector(BaseConnector):
             )
         ]
         
-        return mock_articles[:limit]
+        return self._tag_locations(mock_articles[:limit], country)
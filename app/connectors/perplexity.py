@@ -3,8 +3,8 @@ Perplexity API connector
 """
 from typing import List, Optional
 from datetime import datetime
-from app.connectors.base import BaseConnector
-from app.models.schemas import NewsArticle
+from app.connectors.base import BaseConnector, ALL_PREDICATES
+from app.models.schemas import NewsArticle, NewsQuery
 from app.config import settings
 import logging
 
@@ -14,6 +14,13 @@ logger = logging.getLogger(__name__)
 class PerplexityConnector(BaseConnector):
     """Connector for Perplexity API"""
     
+    # The since bound goes upstream as a recency filter; the rest is
+    # checked on parsed lines before building articles
+    pushdown_predicates = ALL_PREDICATES
+    
+    # Perplexity recency filter values and the window each one covers
+    RECENCY_FILTERS = [("hour", 3600), ("day", 86400), ("week", 7 * 86400), ("month", 31 * 86400)]
+    
     def __init__(self):
         super().__init__()
         self.api_key = settings.PERPLEXITY_API_KEY
@@ -24,7 +31,8 @@ class PerplexityConnector(BaseConnector):
         query: Optional[str] = None,
         country: Optional[str] = None,
         commodity: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """Fetch news from Perplexity API"""
         
@@ -46,7 +54,7 @@ class PerplexityConnector(BaseConnector):
         # Check if API key is configured
         if not self.api_key or self.api_key == "your_perplexity_api_key_here":
             logger.warning("Perplexity API key not configured, returning mock data")
-            return self._get_mock_data(country, commodity, limit)
+            return self._apply_query(self._get_mock_data(country, commodity, limit), news_query)
         
         # Make API request
         headers = {
@@ -67,6 +75,13 @@ class PerplexityConnector(BaseConnector):
                 }
             ]
         }
+        if news_query and news_query.since:
+            # Smallest recency window that still covers the requested one
+            age = (datetime.utcnow() - news_query.since).total_seconds()
+            for recency, seconds in self.RECENCY_FILTERS:
+                if age <= seconds:
+                    json_data["search_recency_filter"] = recency
+                    break
         
         response = await self._make_request(
             self.base_url,
@@ -77,11 +92,11 @@ class PerplexityConnector(BaseConnector):
         
         if not response:
             logger.warning("Perplexity API returned no results")
-            return self._get_mock_data(country, commodity, limit)
+            return self._apply_query(self._get_mock_data(country, commodity, limit), news_query)
         
         # Parse response and create articles
         # Note: Actual parsing would depend on Perplexity's response format
-        articles = self._parse_perplexity_response(response, country, commodity)
+        articles = self._parse_perplexity_response(response, country, commodity, news_query)
         
         return articles[:limit]
     
@@ -89,7 +104,8 @@ class PerplexityConnector(BaseConnector):
         self, 
         response: dict, 
         country: Optional[str],
-        commodity: Optional[str]
+        commodity: Optional[str],
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """Parse Perplexity API response into NewsArticle objects"""
         articles = []
@@ -101,18 +117,12 @@ class PerplexityConnector(BaseConnector):
             # In production, you'd want more sophisticated parsing
             lines = [line.strip() for line in content.split("\n") if line.strip()]
             
-            for line in lines[:10]:
-                if len(line) > 20:  # Filter out very short lines
-                    article = NewsArticle(
-                        headline=line,
-                        source="perplexity",
-                        summary=line,
-                        tickers=self._extract_tickers(line),
-                        country=country,
-                        commodity_tags=self._extract_commodity_tags(line),
-                        timestamp=datetime.utcnow()
-                    )
-                    articles.append(article)
+            articles = self._build_articles(
+                "perplexity",
+                # Filter out very short lines
+                [{"headline": line, "summary": line} for line in lines[:10] if len(line) > 20],
+                news_query=news_query or NewsQuery(country=country)
+            )
         except Exception as e:
             logger.error(f"Error parsing Perplexity response: {str(e)}")
         
@@ -155,4 +165,4 @@ class PerplexityConnector(BaseConnector):
             )
         ]
         
-        return mock_articles[:limit]
+        return self._tag_locations(mock_articles[:limit], country)
@@ -3,9 +3,12 @@ Zee Business RSS Feed connector
 """
 from typing import List, Optional
 from datetime import datetime
+from urllib.parse import urlsplit
 import feedparser
-from app.connectors.base import BaseConnector
-from app.models.schemas import NewsArticle
+import time
+from app.connectors.base import BaseConnector, ALL_PREDICATES
+from app.models.schemas import NewsArticle, NewsQuery
+from app.services.metrics import metrics
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +17,10 @@ logger = logging.getLogger(__name__)
 class ZeeBusinessConnector(BaseConnector):
     """Connector for Zee Business RSS feeds"""
     
+    # RSS has no query parameters: everything is checked on feed entries
+    # before building articles
+    pushdown_predicates = ALL_PREDICATES
+    
     def __init__(self):
         super().__init__()
         # Zee Business RSS feed URLs
@@ -27,7 +34,8 @@ class ZeeBusinessConnector(BaseConnector):
         query: Optional[str] = None,
         country: Optional[str] = None,
         commodity: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        news_query: Optional[NewsQuery] = None
     ) -> List[NewsArticle]:
         """
         Fetch news from Zee Business RSS feeds
@@ -37,37 +45,36 @@ class ZeeBusinessConnector(BaseConnector):
         """
         
         articles = []
+        entries_read = 0
         
         try:
             for feed_url in self.feed_urls:
                 logger.info(f"Fetching RSS feed from {feed_url}")
+                started = time.perf_counter()
                 feed = feedparser.parse(feed_url)
+                self._record_feed(feed_url, feed, time.perf_counter() - started)
+                # Without filters only the first `limit` entries can be used
+                entries = feed.entries if news_query and news_query.filters else feed.entries[:limit]
+                entries_read += len(entries)
                 
-                for entry in feed.entries[:limit]:
-                    # Extract data from RSS entry
-                    title = entry.get("title", "")
-                    link = entry.get("link", "")
-                    summary = entry.get("summary", "") or entry.get("description", "")
-                    
+                items = []
+                for entry in entries:
                     # Parse published date
                     published = entry.get("published_parsed")
-                    timestamp = datetime(*published[:6]) if published else datetime.utcnow()
-                    
-                    # Create normalized article
-                    article = NewsArticle(
-                        headline=title,
-                        source="zee_business",
-                        url=link,
-                        summary=summary,
-                        tickers=self._extract_tickers(title + " " + summary),
-                        country=country or "India",  # Zee Business is primarily India-focused
-                        commodity_tags=self._extract_commodity_tags(title + " " + summary),
-                        timestamp=timestamp
-                    )
-                    articles.append(article)
-                    
-                    if len(articles) >= limit:
-                        break
+                    items.append({
+                        "headline": entry.get("title", ""),
+                        "summary": entry.get("summary", "") or entry.get("description", ""),
+                        "url": entry.get("link", ""),
+                        "timestamp": datetime(*published[:6]) if published else datetime.utcnow()
+                    })
+                
+                # Normalized articles (items filtered out or already seen are dropped)
+                articles.extend(self._build_articles(
+                    "zee_business",
+                    items,
+                    news_query=news_query or NewsQuery(country=country),
+                    default_country="India"  # Zee Business is primarily India-focused
+                ))
                 
                 if len(articles) >= limit:
                     break
@@ -75,15 +82,24 @@ class ZeeBusinessConnector(BaseConnector):
         except Exception as e:
             logger.error(f"Error fetching Zee Business RSS: {str(e)}")
             # Return mock data on error
-            return self._get_mock_data(country, commodity, limit)
+            return self._apply_query(self._get_mock_data(country, commodity, limit), news_query)
         
-        # If no articles fetched, return mock data
-        if not articles:
+        # If the feeds could not be read, return mock data
+        if not entries_read:
             logger.warning("No articles fetched from Zee Business, using mock data")
-            return self._get_mock_data(country, commodity, limit)
+            return self._apply_query(self._get_mock_data(country, commodity, limit), news_query)
         
         return articles[:limit]
     
+    def _record_feed(self, feed_url: str, feed, seconds: float) -> None:
+        """Record a feed fetch in the upstream metrics (feedparser bypasses httpx)"""
+        error = None
+        if feed.get("status", 200) >= 400:
+            error = f"http_{feed.status}"
+        elif feed.bozo and not feed.entries:
+            error = type(feed.bozo_exception).__name__
+        metrics.observe_upstream(self.source_name, urlsplit(feed_url).hostname or "", seconds, error)
+    
     def _get_mock_data(
         self,
         country: Optional[str],
@@ -134,4 +150,4 @@ class ZeeBusinessConnector(BaseConnector):
             )
         ]
         
-        return mock_articles[:limit]
+        return self._tag_locations(mock_articles[:limit], country)
@@ -4,12 +4,28 @@ Main FastAPI application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
+from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
+from app.middleware import (
+    ActivityLogMiddleware,
+    AdmissionMiddleware,
+    ApiKeyAuthMiddleware,
+    MetricsMiddleware,
+    TracingMiddleware
+)
 from app.routes import router
 from app.routes.climate_api import router as climate_router
 from app.routes.status import router as status_router
+from app.routes.subscriptions import router as subscriptions_router
+from app.services.account_store import account_store
+from app.services.activity_log import activity_logger
+from app.services.admission import admission
+from app.services.api_auth import authenticator
+from app.services.article_store import article_store
+from app.services.database import database
+from app.services.ingestion import ingestion
 
 # Configure logging
 logging.basicConfig(
@@ -19,8 +35,53 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources and start background workers; undo on shutdown"""
+    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    logger.info(f"Debug mode: {settings.DEBUG}")
+    logger.info("API documentation available at /docs")
+    if database.enabled:
+        try:
+            await database.connect()
+        except Exception as e:
+            # Account features are unavailable until the next restart
+            logger.error(f"Database unavailable: {str(e)}")
+    try:
+        await article_store.open()
+    except Exception as e:
+        # Requests fall back to live fetches while the store is unavailable
+        logger.error(f"Article store unavailable: {str(e)}")
+    try:
+        await account_store.open()
+    except Exception as e:
+        # Activity, saved query and alert features fail until it is reachable
+        logger.error(f"Account store unavailable: {str(e)}")
+    if settings.INGEST_ENABLED:
+        ingestion.start()
+    if settings.ACTIVITY_LOG_ENABLED:
+        activity_logger.start()
+    if settings.API_AUTH_ENABLED:
+        authenticator.start()
+    if settings.ADMISSION_ENABLED or settings.METRICS_ENABLED:
+        # Measures the event-loop lag both use
+        admission.start()
+
+    yield
+
+    logger.info(f"Shutting down {settings.APP_NAME}")
+    await admission.stop()
+    await ingestion.stop()
+    await activity_logger.stop()
+    await authenticator.stop()
+    await account_store.close()
+    await article_store.close()
+    await database.close()
+
+
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="""
@@ -53,6 +114,25 @@ app = FastAPI(
     openapi_url="/openapi.json"
 )
 
+
+# Later registrations wrap earlier ones: activity logging runs outside
+# authentication so it also records rejected requests, admission control
+# runs outside both so shed requests cost no key lookup or log row, metrics
+# wrap all three so shed and rejected requests are counted too, tracing
+# wraps everything so Server-Timing covers the whole request, and CORS
+# runs outermost so every response (and preflight) gets its headers.
+# Disabled features add no layer at all.
+if settings.API_AUTH_ENABLED:
+    app.add_middleware(ApiKeyAuthMiddleware)
+if settings.ACTIVITY_LOG_ENABLED:
+    app.add_middleware(ActivityLogMiddleware)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -62,10 +142,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
 # Include routers
 app.include_router(router)
 app.include_router(climate_router)
 app.include_router(status_router)
+app.include_router(subscriptions_router)
 
 
 @app.get("/", include_in_schema=False)
@@ -74,20 +156,6 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event"""
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info("API documentation available at /docs")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown event"""
-    logger.info(f"Shutting down {settings.APP_NAME}")
-
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
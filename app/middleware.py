@@ -0,0 +1,285 @@
+"""
+ASGI middleware: tracing, metrics, admission control, API-key authentication and activity logging
+
+Each layer is plain ASGI rather than BaseHTTPMiddleware, so it adds one
+function call per request instead of a task and a memory stream, and sees
+a streamed response through to its last chunk. main.py only installs the
+layers whose feature is enabled.
+"""
+from typing import Any, Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.responses import JSONResponse
+from starlette.websockets import WebSocketClose
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import json
+import time
+
+from app.config import settings
+from app.services.activity_log import activity_logger
+from app.services.admission import Overloaded, admission, route_class
+from app.services.api_auth import AuthError, authenticator
+from app.services.metrics import metrics
+from app.services.tracing import span_tree, start_trace, server_timing, to_otlp, traceparent
+
+
+def _api_key(headers: Headers) -> Optional[str]:
+    """Key from the X-API-Key header or an "Authorization: Bearer" header"""
+    api_key = headers.get("x-api-key")
+    if api_key:
+        return api_key
+    authorization = headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        return authorization[7:].strip()
+    return None
+
+
+def _route_path(scope: Scope) -> Optional[str]:
+    """Template of the matched route (set by the router), or None"""
+    route = scope.get("route")
+    return getattr(route, "path", None)
+
+
+class TracingMiddleware:
+    """
+    Trace each request and summarize its spans in a Server-Timing header (TRACING_ENABLED)
+
+    Server-Timing is only added to responses with a Content-Length: a
+    streamed response sends its headers before its spans (connector
+    fetches, encoding) have run. Every response gets a traceparent header.
+
+    With TRACING_DEBUG, `?trace=tree` (or `?trace=true`) adds the span tree
+    to JSON responses under "trace", and `?trace=otlp` adds it as OTLP/JSON.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        debug = ""
+        if settings.TRACING_DEBUG:
+            debug = QueryParams(scope["query_string"]).get("trace", "").lower()
+            if debug in ("0", "false"):
+                debug = ""
+
+        with start_trace(
+            f"{method} {path}",
+            Headers(scope=scope).get("traceparent"),
+            **{"http.request.method": method, "url.path": path}
+        ) as root:
+            start: Optional[Message] = None
+            body = []
+
+            async def send_traced(message: Message) -> None:
+                nonlocal start
+                if message["type"] == "http.response.start":
+                    route = _route_path(scope)
+                    if route is not None:
+                        root.name = f"{method} {route}"
+                        root.attributes["http.route"] = route
+                    root.attributes["http.response.status_code"] = message["status"]
+
+                    headers = MutableHeaders(scope=message)
+                    headers["traceparent"] = traceparent(root)
+                    if "content-length" not in headers:
+                        # Streamed: spans are still to come
+                        await send(message)
+                        return
+                    root.end()
+                    headers["Server-Timing"] = server_timing(root)
+                    if debug and headers.get("content-type", "").startswith("application/json"):
+                        start = message
+                        return
+                    await send(message)
+                    return
+
+                if start is None or message["type"] != "http.response.body":
+                    await send(message)
+                    return
+
+                # Buffer the JSON body to add the span tree to it
+                body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                content = json.loads(b"".join(body))
+                if isinstance(content, dict):
+                    content["trace"] = to_otlp(root) if debug == "otlp" else span_tree(root)
+                encoded = json.dumps(content, separators=(",", ":")).encode("utf-8")
+                MutableHeaders(scope=start)["content-length"] = str(len(encoded))
+                await send(start)
+                await send({"type": "http.response.body", "body": encoded})
+
+            await self.app(scope, receive, send_traced)
+
+
+class MetricsMiddleware:
+    """Record latency and status per route template, and requests in flight (METRICS_ENABLED)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_recorded(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.inflight += 1
+        try:
+            await self.app(scope, receive, send_recorded)
+        finally:
+            metrics.inflight -= 1
+            # The matched route is only known once routing ran; templates keep
+            # label cardinality bounded (unmatched paths share one label)
+            metrics.observe_request(
+                scope["method"],
+                _route_path(scope) or "unmatched",
+                status,
+                time.perf_counter() - started
+            )
+
+
+class AdmissionMiddleware:
+    """
+    Run requests as admission control allows (ADMISSION_ENABLED)
+
+    Shed requests get a fast 503; shed WebSockets, which count as streams,
+    are closed with code 1013 (try again later). A slot is held until the
+    response, streamed or not, has been sent in full.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        websocket = scope["type"] == "websocket"
+        if (scope["type"] != "http" and not websocket) or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        request_class = "stream" if websocket else route_class(scope["path"], QueryParams(scope["query_string"]))
+        try:
+            await admission.acquire(request_class)
+        except Overloaded:
+            if websocket:
+                await WebSocketClose(code=1013, reason="Server is overloaded")(scope, receive, send)
+                return
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, retry shortly"},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(request_class)
+
+
+class ApiKeyAuthMiddleware:
+    """
+    Require a valid API key within its quota on /api/ routes and WebSockets (API_AUTH_ENABLED)
+
+    Browsers cannot set headers on a WebSocket handshake, so sockets may
+    also pass the key as an `api_key` query parameter. A rejected socket
+    is closed with code 1008 (policy violation) before it is accepted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        websocket = scope["type"] == "websocket"
+        if (
+            (scope["type"] != "http" and not websocket)
+            or scope.get("method") == "OPTIONS"
+            or not path.startswith("/api/")
+            or path in settings.API_AUTH_EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        api_key = _api_key(Headers(scope=scope))
+        if api_key is None and websocket:
+            api_key = QueryParams(scope["query_string"]).get("api_key")
+        try:
+            info, bucket = await authenticator.authenticate(api_key)
+        except AuthError as e:
+            if websocket:
+                await WebSocketClose(code=1008, reason=e.detail)(scope, receive, send)
+                return
+            response = JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        # Read by handlers (and the activity log) as request.state
+        state: Dict[str, Any] = scope.setdefault("state", {})
+        state["user_id"] = info.user_id
+        state["api_key_id"] = info.key_id
+        state["plan"] = info.plan
+
+        if websocket:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_limits(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(info.max_calls)
+                headers["X-RateLimit-Remaining"] = str(int(bucket.tokens))
+            await send(message)
+
+        await self.app(scope, receive, send_limits)
+
+
+class ActivityLogMiddleware:
+    """Record each API request as an api_call activity (queued, written in batches; ACTIVITY_LOG_ENABLED)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_logged(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_logged)
+        finally:
+            headers = Headers(scope=scope)
+            client = scope.get("client")
+            await activity_logger.log(
+                "api_call",
+                user_id=scope.get("state", {}).get("user_id"),
+                resource=scope["path"],
+                ip_address=client[0] if client else None,
+                user_agent=headers.get("user-agent"),
+                metadata={
+                    "method": scope["method"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+                }
+            )
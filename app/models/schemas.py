@@ -1,9 +1,9 @@
 """
 Pydantic models for request/response schemas
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -27,6 +27,18 @@ class NewsCategory(str, Enum):
     GEOPOLITICS = "geopolitics"  # Policies, regulations, international relations
 
 
+class SortOrder(str, Enum):
+    """Result orderings"""
+    RECENCY = "recency"  # Newest first
+    RELEVANCE = "relevance"  # Blended query relevance, recency, source and tag score
+
+
+class StreamFormat(str, Enum):
+    """Wire formats for streamed responses"""
+    SSE = "sse"  # text/event-stream
+    NDJSON = "ndjson"  # One JSON object per line
+
+
 class NewsArticle(BaseModel):
     """Normalized news article schema"""
     headline: str = Field(..., description="Article headline/title")
@@ -55,12 +67,36 @@ class NewsArticle(BaseModel):
         }
 
 
+class NewsQuery(BaseModel):
+    """Structured query passed from the aggregator to each connector"""
+    query: Optional[str] = Field(None, description="Search terms")
+    country: Optional[str] = Field(None, description="Country to search for")
+    commodity: Optional[str] = Field(None, description="Commodity to search for")
+    limit: int = Field(10, description="Maximum results per source")
+    since: Optional[datetime] = Field(None, description="Only articles published at or after this time")
+    until: Optional[datetime] = Field(None, description="Only articles published before this time")
+    filters: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Predicates articles must match (country, state, commodity, ticker, category)"
+    )
+
+    @field_validator("since", "until")
+    @classmethod
+    def _naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Article timestamps are naive UTC; "...Z" or "+05:30" request
+        # parameters are converted so the two can be compared
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class ResponseMetadata(BaseModel):
     """Metadata for aggregated responses"""
     total_results: int = Field(..., description="Total number of articles returned")
     sources_used: List[str] = Field(..., description="List of sources that returned data")
     failed_sources: List[str] = Field(default_factory=list, description="Sources that failed to fetch")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (paginated requests only)")
 
 
 class AggregatedNewsResponse(BaseModel):
@@ -94,6 +130,22 @@ class AggregatedNewsResponse(BaseModel):
         }
 
 
+class ArticleChange(BaseModel):
+    """An article added to or updated in the article store"""
+    key: str = Field(..., description="Stable article identity; later changes to the article reuse it")
+    seq: int = Field(..., description="Position in the change feed")
+    article: NewsArticle = Field(..., description="Current version of the article")
+
+
+class ChangeFeedResponse(BaseModel):
+    """Response schema for the incremental change feed"""
+    status: str = Field(default="success", description="Response status")
+    data: List[ArticleChange] = Field(..., description="Changes in feed order")
+    next_cursor: str = Field(..., description="Cursor to pass as `since` on the next poll")
+    has_more: bool = Field(False, description="More changes are pending; poll again immediately")
+    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+
+
 class ErrorResponse(BaseModel):
     """Error response schema"""
     status: str = Field(default="error", description="Response status")
@@ -1,27 +1,159 @@
 """
 API routes for news aggregation
 """
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
-from datetime import datetime
+from fastapi import APIRouter, Query, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime, timedelta
+import json
+import logging
 
 from app.models.schemas import (
     AggregatedNewsResponse,
+    ArticleChange,
+    ChangeFeedResponse,
     ResponseMetadata,
     SourceType,
     NewsCategory,
+    SortOrder,
+    StreamFormat,
+    NewsArticle,
     HealthResponse,
     ErrorResponse
 )
 from app.services import NewsAggregatorService
+from app.services.account_store import account_store
+from app.services.activity_log import activity_logger
+from app.services.admission import admission
+from app.services.api_auth import authenticator
+from app.services.article_store import article_store, search_terms
 from app.services.cache_service import cache
-from app.utils.normalizer import deduplicate_articles
+from app.services.database import database
+from app.services.ingestion import ingestion
+from app.services.pagination import (
+    NewsPaginator,
+    CursorExpiredError,
+    InvalidCursorError,
+    encode_cursor,
+    decode_search_cursor,
+    decode_token,
+    query_fingerprint
+)
+from app.services.ranking import ranking
+from app.services.tracing import TracedRoute, span
+from app.utils.normalizer import ArticleDeduplicator, deduplicate_articles
 from app.config import settings
 
-router = APIRouter(prefix="/api/v1", tags=["news"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["news"], route_class=TracedRoute)
 
 # Initialize service
 news_service = NewsAggregatorService()
+paginator = NewsPaginator(news_service)
+
+
+async def _read_store(
+    filters: Dict[str, Optional[str]],
+    query: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = 20
+) -> Optional[List[NewsArticle]]:
+    """
+    Read articles from the ingested store
+    
+    Returns:
+        Matching articles (possibly none), or None when the caller should
+        fetch live (store reads disabled, ingestion stale or store error)
+    """
+    if not settings.NEWS_READ_FROM_STORE or not article_store.is_fresh():
+        return None
+    
+    try:
+        with span("store.query"):
+            articles = await article_store.query(filters=filters, query=query, since=since, limit=limit)
+    except Exception as e:
+        logger.error(f"Article store read failed, fetching live: {str(e)}")
+        return None
+    
+    return articles
+
+
+def _event(stream_format: StreamFormat, event: str, payload: Dict[str, Any]) -> str:
+    """Serialize one stream event as SSE or NDJSON"""
+    payload = jsonable_encoder(payload)
+    if stream_format == StreamFormat.SSE:
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"event": event, "data": payload}) + "\n"
+
+
+async def _stored_batches(articles: List[NewsArticle]) -> AsyncIterator[Tuple[str, Optional[List[NewsArticle]]]]:
+    """Replay store results as one batch per source, like iter_streams, with stale sources as failed"""
+    batches: Dict[str, List[NewsArticle]] = {}
+    for article in articles:
+        batches.setdefault(article.source, []).append(article)
+    for source, batch in batches.items():
+        yield source, batch
+    for source in article_store.stale_sources():
+        yield source, None
+
+
+async def _stream_news(
+    stream_format: StreamFormat,
+    batches: AsyncIterator[Tuple[str, Optional[List[NewsArticle]]]],
+    deduplicate: bool = True,
+    limit: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Turn per-source batches into stream events
+    
+    Emits an `articles` event per source as soon as it finishes (only
+    articles not already sent: the first copy of a story wins), a
+    `source_failed` event per source that raised or timed out (a source
+    with no matches is not a failure), and a final `metadata` event.
+    Stops early, cancelling pending sources, once `limit` articles are sent.
+    """
+    deduplicator = ArticleDeduplicator() if deduplicate else None
+    sent = 0
+    successful_sources: List[str] = []
+    failed_sources: List[str] = []
+    
+    try:
+        async for source, articles in batches:
+            if articles is None:
+                failed_sources.append(source)
+                yield _event(stream_format, "source_failed", {"source": source})
+                continue
+            
+            successful_sources.append(source)
+            # "is not None": an empty deduplicator is falsy (it has a __len__)
+            if deduplicator is not None:
+                articles = [a for a in articles if deduplicator.add(a)]
+            if limit is not None:
+                articles = articles[:limit - sent]
+            if articles:
+                sent += len(articles)
+                yield _event(stream_format, "articles", {"source": source, "data": articles})
+            if limit is not None and sent >= limit:
+                break
+    finally:
+        await batches.aclose()
+    
+    metadata = ResponseMetadata(
+        total_results=sent,
+        sources_used=successful_sources,
+        failed_sources=failed_sources,
+        timestamp=datetime.utcnow()
+    )
+    yield _event(stream_format, "metadata", metadata.model_dump())
+
+
+def _streaming_response(stream_format: StreamFormat, events: AsyncIterator[str]) -> StreamingResponse:
+    media_type = "text/event-stream" if stream_format == StreamFormat.SSE else "application/x-ndjson"
+    # Keep proxies from buffering the stream
+    return StreamingResponse(events, media_type=media_type, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -46,7 +178,11 @@ async def get_aggregated_news(
     commodity: Optional[str] = Query(None, description="Filter by commodity"),
     ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
     limit: int = Query(10, ge=1, le=100, description="Maximum results per source"),
-    deduplicate: bool = Query(True, description="Remove duplicate articles")
+    deduplicate: bool = Query(True, description="Remove duplicate articles"),
+    sort: SortOrder = Query(SortOrder.RECENCY, description="Result order: recency or relevance"),
+    page_size: Optional[int] = Query(None, ge=1, le=100, description="Articles per page (enables cursor pagination)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's metadata.next_cursor"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream articles per source as they arrive (sse or ndjson)")
 ):
     """
     Get aggregated news from all sources
@@ -62,34 +198,112 @@ async def get_aggregated_news(
     - **ticker**: Ticker symbol filter (e.g., "WHEAT", "GOLD")
     - **limit**: Max results per source (1-100)
     - **deduplicate**: Remove duplicate headlines
+    - **sort**: `recency` (newest first) or `relevance` (query match, recency, source, tags)
+    - **page_size**: Articles per page; returns `metadata.next_cursor` for the next page
+    - **cursor**: Continue from a previous page (pass the same other parameters)
+    - **stream**: `sse` or `ndjson` to receive each source's articles as soon as
+      it responds, then a final `metadata` event
     
     **Example:**
     ```
     GET /api/v1/news?commodity=agriculture&country=India&state=Maharashtra&limit=5
+    GET /api/v1/news?commodity=agriculture&stream=sse
+    GET /api/v1/news?commodity=agriculture&page_size=20
+    GET /api/v1/news?commodity=agriculture&page_size=20&cursor=eyJzIjoi...
     ```
+    
+    **Freshness:**
+    - Unpaginated requests are served from the ingested article store while
+      ingestion is current; otherwise all sources are fetched live
+    - Store-served responses list sources whose ingestion has fallen behind
+      (no successful poll within ARTICLE_STORE_MAX_AGE) in `failed_sources`
+    
+    **Pagination:**
+    - Pages are served from a merged snapshot kept for NEWS_SNAPSHOT_TTL seconds
+    - An expired cursor returns 410 Gone: request the first page again
     """
     try:
-        # Fetch from all sources
-        articles, successful_sources, failed_sources = await news_service.fetch_from_all_sources(
+        if stream:
+            if page_size or cursor or sort == SortOrder.RELEVANCE:
+                raise HTTPException(
+                    status_code=400,
+                    detail="stream cannot be combined with pagination or sort=relevance"
+                )
+            filters = {"country": country, "state": state, "ticker": ticker}
+            stored = await _read_store(
+                filters=news_service.resolve_filters(country, state, commodity, ticker),
+                query=query,
+                limit=limit * len(news_service.connectors)
+            )
+            batches = _stored_batches(stored) if stored is not None else news_service.iter_streams(
+                query=query,
+                country=country,
+                commodity=commodity,
+                limit_per_source=limit,
+                filters=filters
+            )
+            return _streaming_response(stream, _stream_news(stream, batches, deduplicate))
+        
+        if page_size or cursor:
+            if sort == SortOrder.RELEVANCE:
+                raise HTTPException(status_code=400, detail="sort=relevance is not supported with cursor pagination")
+            articles, next_cursor, successful_sources, failed_sources = await paginator.page(
+                page_size=page_size or 20,
+                cursor=cursor,
+                query=query,
+                country=country,
+                commodity=commodity,
+                limit_per_source=limit,
+                deduplicate=deduplicate,
+                filters={"country": country, "state": state, "ticker": ticker}
+            )
+            return AggregatedNewsResponse(
+                status="success",
+                data=articles,
+                metadata=ResponseMetadata(
+                    total_results=len(articles),
+                    sources_used=successful_sources,
+                    failed_sources=failed_sources,
+                    timestamp=datetime.utcnow(),
+                    next_cursor=next_cursor
+                )
+            )
+        
+        articles = await _read_store(
+            filters=news_service.resolve_filters(country, state, commodity, ticker),
             query=query,
-            country=country,
-            commodity=commodity,
-            limit_per_source=limit
+            limit=limit * len(news_service.connectors)
         )
         
-        # Apply additional filters if specified
-        if ticker or state or (country and not country in [a.country for a in articles if a.country]):
-            articles = news_service.filter_articles(
-                articles=articles,
+        if articles is not None:
+            successful_sources = sorted({a.source for a in articles})
+            failed_sources = article_store.stale_sources()
+        else:
+            # Fetch from all sources
+            articles, successful_sources, failed_sources = await news_service.fetch_from_all_sources(
+                query=query,
                 country=country,
-                state=state,
                 commodity=commodity,
-                ticker=ticker
+                limit_per_source=limit
             )
+            
+            # Apply additional filters if specified
+            if ticker or state or (country and not country in [a.country for a in articles if a.country]):
+                articles = news_service.filter_articles(
+                    articles=articles,
+                    country=country,
+                    state=state,
+                    commodity=commodity,
+                    ticker=ticker
+                )
         
         # Deduplicate if requested
         if deduplicate:
-            articles = deduplicate_articles(articles)
+            with span("dedup"):
+                articles = deduplicate_articles(articles)
+        
+        if sort == SortOrder.RELEVANCE:
+            articles = ranking.rank(articles, query or commodity)
         
         # Create response
         return AggregatedNewsResponse(
@@ -103,10 +317,76 @@ async def get_aggregated_news(
             )
         )
         
+    except HTTPException:
+        raise
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/news/changes", response_model=ChangeFeedResponse)
+async def get_news_changes(
+    since: Optional[str] = Query(None, description="Cursor from the previous response's next_cursor (omit to start from the beginning)"),
+    country: Optional[str] = Query(None, description="Filter by country"),
+    commodity: Optional[str] = Query(None, description="Filter by commodity tag"),
+    ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    category: Optional[NewsCategory] = Query(None, description="Filter by news category"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum changes per response")
+):
+    """
+    Get articles added or updated since a cursor
+    
+    An append-only feed over the ingested article store: every insert or
+    content change gets the next position, so a client that keeps the
+    returned cursor only downloads what changed since its last poll.
+    
+    **Query Parameters:**
+    - **since**: Cursor from the previous response (omit for a full sync)
+    - **country**, **commodity**, **ticker**, **category**: Only changes to matching articles
+    - **limit**: Max changes per response (1-500)
+    
+    **Sync loop:**
+    1. `GET /api/v1/news/changes` and store every article under its `key`
+    2. Poll `GET /api/v1/news/changes?since=<next_cursor>` and upsert by `key`
+    3. When `has_more` is true, poll again right away
+    
+    Keep the same filters for the lifetime of a cursor.
+    """
+    after_seq = 0
+    if since:
+        try:
+            after_seq = decode_token(since).get("q")
+            if not isinstance(after_seq, int) or after_seq < 0:
+                raise InvalidCursorError("Invalid cursor: malformed position")
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        changes, last_seq, has_more = await article_store.changes(
+            after_seq=after_seq,
+            filters=news_service.resolve_filters(
+                country=country,
+                commodity=commodity,
+                ticker=ticker,
+                category=category.value if category else None
+            ),
+            limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return ChangeFeedResponse(
+        status="success",
+        data=[ArticleChange(key=key, seq=seq, article=article) for key, seq, article in changes],
+        next_cursor=encode_cursor({"q": last_seq}),
+        has_more=has_more,
+        timestamp=datetime.utcnow()
+    )
+
+
 @router.get("/news/product/{product}", response_model=AggregatedNewsResponse)
 async def get_product_news(
     product: str,
@@ -114,7 +394,9 @@ async def get_product_news(
     country: Optional[str] = Query(None, description="Filter by country"),
     state: Optional[str] = Query(None, description="Filter by state/region"),
     limit: int = Query(10, ge=1, le=50, description="Maximum results"),
-    refresh: bool = Query(False, description="Force refresh cache")
+    since: Optional[datetime] = Query(None, description="Only articles published at or after this time"),
+    refresh: bool = Query(False, description="Force refresh cache"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream articles per source as they arrive (sse or ndjson)")
 ):
     """
     Get news for a specific product/commodity with category filtering
@@ -135,7 +417,10 @@ async def get_product_news(
     - **country**: Country filter
     - **state**: State/region filter
     - **limit**: Max results (1-50)
+    - **since**: Publication time lower bound (ISO 8601), pushed down to sources
     - **refresh**: Force cache refresh (bypasses 1-hour cache)
+    - **stream**: `sse` or `ndjson` to receive each source's articles as soon as
+      it responds (up to `limit`), then a final `metadata` event; not cached
     
     **Examples:**
     ```
@@ -153,44 +438,69 @@ async def get_product_news(
     try:
         # Build cache key
         category_str = category.value if category else "overview"
-        cache_key = f"product_{product}_{category_str}_{country or 'all'}_{state or 'all'}"
+        filters = {
+            "country": country,
+            "state": state,
+            "category": category_str,
+            "ticker": product.upper()  # Try to match as ticker too
+        }
+        
+        if stream:
+            stored = await _read_store(
+                filters=news_service.resolve_filters(**filters),
+                since=since,
+                limit=limit * 2
+            )
+            batches = _stored_batches(stored) if stored is not None else news_service.iter_streams(
+                query=product,
+                country=country,
+                commodity=product,
+                category=category_str,
+                limit_per_source=limit,
+                filters=filters,
+                since=since
+            )
+            return _streaming_response(stream, _stream_news(stream, batches, limit=limit))
+        
+        cache_key = f"product_{product}_{category_str}_{country or 'all'}_{state or 'all'}_{since.isoformat() if since else 'any'}"
         
         # Check cache unless refresh requested
         if not refresh:
-            cached_response = cache.get(cache_key)
+            with span("cache.get"):
+                cached_response = cache.get(cache_key)
             if cached_response:
                 return cached_response
         
-        # Fetch news for the product
-        # Request more items than needed to ensure we have enough after filtering
-        fetch_limit = limit * 2 if category else limit
-        
-        articles, successful_sources, failed_sources = await news_service.fetch_from_all_sources(
-            query=product,
-            country=country,
-            commodity=product,
-            category=category_str,
-            limit_per_source=fetch_limit
-        )
-        
-        # Filter by category and other criteria
-        articles = news_service.filter_articles(
-            articles=articles,
-            country=country,
-            state=state,
-            category=category_str,
-            ticker=product.upper()  # Try to match as ticker too
+        # Overfetch from the store so near-duplicates can be dropped
+        articles = await _read_store(
+            filters=news_service.resolve_filters(**filters),
+            since=since,
+            limit=limit * 2
         )
         
-        # Deduplicate
-        articles = deduplicate_articles(articles)
+        if articles is not None:
+            with span("dedup"):
+                articles = deduplicate_articles(articles)[:limit]
+            successful_sources = sorted({a.source for a in articles})
+            failed_sources = article_store.stale_sources()
+        else:
+            # Merge sources newest first, filtering and deduplicating until the page is full
+            articles, successful_sources, failed_sources = await news_service.fetch_top(
+                limit=limit,
+                query=product,
+                country=country,
+                commodity=product,
+                category=category_str,
+                filters=filters,
+                since=since
+            )
         
         # Create response
         response = AggregatedNewsResponse(
             status="success",
-            data=articles[:limit],
+            data=articles,
             metadata=ResponseMetadata(
-                total_results=len(articles[:limit]),
+                total_results=len(articles),
                 sources_used=successful_sources,
                 failed_sources=failed_sources,
                 timestamp=datetime.utcnow()
@@ -262,6 +572,137 @@ async def get_news_from_source(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search", response_model=AggregatedNewsResponse)
+async def search_news(
+    q: str = Query(..., min_length=1, description="Search text (all words must match)"),
+    country: Optional[str] = Query(None, description="Filter by country"),
+    commodity: Optional[str] = Query(None, description="Filter by commodity tag"),
+    ticker: Optional[str] = Query(None, description="Filter by ticker symbol"),
+    category: Optional[NewsCategory] = Query(None, description="Filter by news category"),
+    since: Optional[datetime] = Query(None, description="Only articles published at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only articles published before this time"),
+    sort: SortOrder = Query(SortOrder.RELEVANCE, description="Result order: relevance or recency"),
+    page_size: int = Query(20, ge=1, le=100, description="Articles per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's metadata.next_cursor")
+):
+    """
+    Search ingested articles
+    
+    Full-text search over the headline and summary of every article in the
+    article store (no upstream requests). Words are stemmed, so "prices"
+    also matches "price"; headline matches rank above summary matches.
+    
+    **Query Parameters:**
+    - **q**: Search text
+    - **country**, **commodity**, **ticker**, **category**: Structured filters
+    - **since**, **until**: Publication time range (ISO 8601)
+    - **sort**: `relevance` (full-text rank) or `recency` (newest first)
+    - **page_size**: Articles per page; returns `metadata.next_cursor`
+    - **cursor**: Continue from a previous page (pass the same other parameters)
+    
+    **Example:**
+    ```
+    GET /api/v1/search?q=wheat export ban&country=India&since=2025-11-01T00:00:00
+    ```
+    """
+    if not search_terms(q):
+        raise HTTPException(status_code=400, detail="Search text must contain at least one word")
+    
+    fingerprint = query_fingerprint(
+        q=q,
+        country=country,
+        commodity=commodity,
+        ticker=ticker,
+        category=category,
+        since=since,
+        until=until,
+        sort=sort
+    )
+    
+    after = None
+    if cursor:
+        try:
+            state = decode_search_cursor(cursor, sort.value)
+            if state.get("f") != fingerprint:
+                raise InvalidCursorError("Cursor does not match the query parameters")
+            after = state["k"]
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        articles, next_key = await article_store.search(
+            q,
+            filters=news_service.resolve_filters(
+                country=country,
+                commodity=commodity,
+                ticker=ticker,
+                category=category.value if category else None
+            ),
+            since=since,
+            until=until,
+            order=sort.value,
+            after=after,
+            limit=page_size
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return AggregatedNewsResponse(
+        status="success",
+        data=articles,
+        metadata=ResponseMetadata(
+            total_results=len(articles),
+            sources_used=sorted({a.source for a in articles}),
+            failed_sources=[],
+            timestamp=datetime.utcnow(),
+            next_cursor=encode_cursor({"k": next_key, "f": fingerprint}) if next_key else None
+        )
+    )
+
+
+@router.get("/saved-queries/{query_id}/matches", response_model=AggregatedNewsResponse)
+async def get_saved_query_matches(
+    request: Request,
+    query_id: UUID,
+    limit: int = Query(20, ge=1, le=100, description="Maximum results")
+):
+    """
+    Get ingested articles that matched a saved query
+
+    New articles are matched against saved queries as they are ingested,
+    so this returns the latest hits without re-running the query. Only the
+    query's owner can read them; anyone else gets 404, as for a missing query.
+
+    **Path Parameters:**
+    - **query_id**: Saved query ID (UUID)
+
+    **Query Parameters:**
+    - **limit**: Max results (1-100)
+    """
+    try:
+        owned = await account_store.owns_saved_query(str(query_id), getattr(request.state, "user_id", None))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not owned:
+        raise HTTPException(status_code=404, detail="Saved query not found")
+
+    try:
+        articles = await article_store.saved_query_matches(str(query_id), limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return AggregatedNewsResponse(
+        status="success",
+        data=articles,
+        metadata=ResponseMetadata(
+            total_results=len(articles),
+            sources_used=sorted({article.source for article in articles}),
+            failed_sources=[],
+            timestamp=datetime.utcnow()
+        )
+    )
+
+
 @router.get("/sources")
 async def get_available_sources():
     """
@@ -362,3 +803,100 @@ async def get_cache_stats():
         "status": "success",
         "cache_stats": cache.get_stats()
     }
+
+
+@router.get("/activity/stats")
+async def get_activity_stats():
+    """
+    Get activity logging statistics
+    
+    Returns queue depth and counts of logged, dropped and written api_call rows.
+    """
+    return {
+        "status": "success",
+        "activity_stats": activity_logger.get_stats()
+    }
+
+
+@router.get("/activity/usage")
+async def get_activity_usage(
+    request: Request,
+    hours: int = Query(24, ge=1, le=24 * 90, description="Hours of history"),
+    action: Optional[str] = Query("api_call", description="Activity action")
+):
+    """
+    Get hourly activity counts for usage charts
+    
+    Served from the hourly rollups, so the cost does not depend on how many
+    raw activity rows exist. Counts only the caller's own activity; without
+    API key authentication there is no caller, and every user's is counted.
+    """
+    try:
+        usage = await account_store.activity_usage(
+            since=datetime.utcnow() - timedelta(hours=hours),
+            user_id=getattr(request.state, "user_id", None),
+            action=action
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "status": "success",
+        "data": usage,
+        "total": sum(row["calls"] for row in usage)
+    }
+
+
+@router.get("/admission/stats")
+async def get_admission_stats():
+    """
+    Get admission control statistics
+    
+    Returns in-flight and waiting requests, event-loop lag, and admitted,
+    queued and shed counts per request class (critical, read, fanout, stream).
+    """
+    return {
+        "status": "success",
+        "admission_stats": admission.get_stats()
+    }
+
+
+@router.get("/auth/stats")
+async def get_auth_stats():
+    """
+    Get API-key authentication statistics
+    
+    Returns key cache hits and misses, rejected and throttled requests.
+    """
+    return {
+        "status": "success",
+        "auth_stats": authenticator.get_stats()
+    }
+
+
+@router.get("/database/stats")
+async def get_database_stats():
+    """
+    Get account database pool statistics
+    
+    Returns pool size, idle connections, acquire counts and wait times.
+    """
+    return {
+        "status": "success",
+        "database_stats": database.get_stats()
+    }
+
+
+@router.get("/ingestion/stats")
+async def get_ingestion_stats():
+    """
+    Get article store and ingestion statistics
+    
+    Returns stored article count, store freshness, per-source poll counters
+    and saved-query percolator counters.
+    """
+    return {
+        "status": "success",
+        "store": await article_store.get_stats(),
+        "ingestion": ingestion.get_stats()
+    }
@@ -5,8 +5,9 @@ from ..services.weather_service import WeatherService
 from ..services.agriculture_service import AgricultureService
 from ..services.price_service import PriceService
 from ..services.calculation_service import CalculationService
+from ..services.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/v1/climate", tags=["climate"])
+router = APIRouter(prefix="/api/v1/climate", tags=["climate"], route_class=TracedRoute)
 
 # Initialize services
 weather_service = WeatherService()
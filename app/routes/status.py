@@ -1,7 +1,10 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from app.services.config_service import config
+from app.services.metrics import metrics
+from app.services.tracing import TracedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 @router.get("/api/v1/status")
 async def get_api_status():
@@ -60,4 +63,10 @@ async def get_api_status():
             "disabled_services": total_services - enabled_count,
             "coverage_percentage": round((enabled_count / total_services) * 100, 1)
         }
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Request, upstream, admission and cache metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
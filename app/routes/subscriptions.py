@@ -0,0 +1,169 @@
+"""
+Subscription routes: long-poll and WebSocket push of new data
+"""
+from fastapi import APIRouter, Query, HTTPException, WebSocket, WebSocketDisconnect
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from app.config import settings
+from app.services.event_bus import EVENT_TYPES, Interest, event_bus
+from app.services.pagination import InvalidCursorError, encode_cursor, decode_token
+from app.services.tracing import TracedRoute
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/subscribe", tags=["subscriptions"], route_class=TracedRoute)
+
+
+def _interest(
+    types: Optional[List[str]],
+    products: Optional[List[str]],
+    commodities: Optional[List[str]]
+) -> Interest:
+    """
+    Build an Interest, validating event types
+
+    Raises:
+        ValueError: If an event type is unknown
+    """
+    unknown = [t for t in types or () if t.lower() not in EVENT_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown event types: {', '.join(unknown)} (expected {', '.join(EVENT_TYPES)})")
+    return Interest(types, products, commodities)
+
+
+def _cursor(seq: int) -> str:
+    return encode_cursor({"b": event_bus.bus_id, "e": seq})
+
+
+@router.get("")
+async def long_poll(
+    types: Optional[List[str]] = Query(None, description="Event types: news, weather_alert (default all)"),
+    products: Optional[List[str]] = Query(None, description="Products/tickers of interest (e.g. wheat)"),
+    commodities: Optional[List[str]] = Query(None, description="Commodity tags of interest (e.g. grains)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous response (omit to start now)"),
+    timeout: int = Query(25, ge=0, description="Seconds to wait for an event (capped at SUBSCRIBE_MAX_WAIT)")
+):
+    """
+    Wait for new data matching a subscription
+
+    Returns as soon as matching events are available (or after `timeout`
+    seconds with no events). Clients loop, passing `next_cursor` back, and
+    receive only what changed: new articles from ingestion (`news`) and new
+    weather alerts (`weather_alert`).
+
+    **Query Parameters:**
+    - **types**: Event types to receive (repeat the parameter for several)
+    - **products**: Products or tickers, e.g. `products=wheat&products=gold`
+    - **commodities**: Commodity tags, e.g. `commodities=grains`
+    - **cursor**: Continue after the previous response
+    - **timeout**: Max seconds to wait
+
+    **Reset:**
+    When `reset` is true the cursor is too old (or from a restarted server)
+    and events were missed; resync with `/api/v1/news/changes`, then keep
+    polling with the returned `next_cursor`.
+    """
+    try:
+        interest = _interest(types, products, commodities)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    after_seq = event_bus.last_seq
+    if cursor:
+        try:
+            state = decode_token(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if state.get("b") != event_bus.bus_id or not isinstance(state.get("e"), int) or state["e"] > event_bus.last_seq:
+            return {"status": "success", "events": [], "next_cursor": _cursor(event_bus.last_seq), "reset": True}
+        after_seq = state["e"]
+
+    events, complete = await event_bus.wait(after_seq, interest, min(timeout, settings.SUBSCRIBE_MAX_WAIT))
+
+    return {
+        "status": "success",
+        "events": [event.to_dict() for event in events],
+        # Everything up to the last published event has been checked
+        "next_cursor": _cursor(event_bus.last_seq),
+        "reset": not complete
+    }
+
+
+@router.websocket("/ws")
+async def websocket_subscribe(websocket: WebSocket):
+    """
+    Push matching events over a WebSocket
+
+    The client sends its subscription as JSON, and may send a new one at
+    any time to change it:
+    `{"types": ["news"], "products": ["wheat"], "commodities": ["grains"]}`
+
+    The server then sends each matching event as JSON
+    (`{"seq", "type", "timestamp", "data"}`), an `{"type": "error"}` message
+    for an invalid subscription, and `{"type": "reset"}` if the client fell
+    too far behind and should resync with `/api/v1/news/changes`.
+
+    With API_AUTH_ENABLED the handshake needs an API key, in the X-API-Key
+    or Authorization header or as `?api_key=`; a rejected socket is closed
+    with code 1008.
+    """
+    await websocket.accept()
+    subscriber = None
+    receive = asyncio.create_task(websocket.receive_json())
+    get = None
+
+    try:
+        while True:
+            pending = {receive} | ({get} if get else set())
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            # Deliver first, so a subscription change cannot drop a received event
+            if get and get in done:
+                await websocket.send_json(get.result().to_dict())
+                if subscriber.overflowed:
+                    subscriber.overflowed = False
+                    await websocket.send_json({"type": "reset"})
+                get = asyncio.create_task(subscriber.queue.get())
+
+            if receive in done:
+                message: Dict[str, Any] = receive.result()
+                receive = asyncio.create_task(websocket.receive_json())
+                try:
+                    interest = _interest(message.get("types"), message.get("products"), message.get("commodities"))
+                except (ValueError, AttributeError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+
+                if subscriber:
+                    event_bus.unsubscribe(subscriber)
+                if get:
+                    get.cancel()
+                subscriber = event_bus.subscribe(interest)
+                get = asyncio.create_task(subscriber.queue.get())
+                await websocket.send_json({"type": "subscribed", "seq": event_bus.last_seq})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Subscription socket closed: {str(e)}")
+    finally:
+        receive.cancel()
+        if get:
+            get.cancel()
+        if subscriber:
+            event_bus.unsubscribe(subscriber)
+
+
+@router.get("/stats")
+async def get_subscription_stats():
+    """
+    Get event bus statistics
+
+    Returns sequence number, buffered events and connected subscribers.
+    """
+    return {
+        "status": "success",
+        "bus_stats": event_bus.get_stats()
+    }
@@ -1,6 +1,16 @@
 """
 Services package initialization
+
+NewsAggregatorService is exported lazily: the aggregator imports the
+connectors, which import services (tracing, metrics, article matching)
+themselves, so importing it here would make `import app.connectors` circular.
 """
-from app.services.aggregator import NewsAggregatorService
 
 __all__ = ["NewsAggregatorService"]
+
+
+def __getattr__(name: str):
+    if name == "NewsAggregatorService":
+        from app.services.aggregator import NewsAggregatorService
+        return NewsAggregatorService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
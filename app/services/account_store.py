@@ -0,0 +1,813 @@
+"""
+Persistent account and activity data: saved queries, alerts, activity logs and dashboard counters
+"""
+from typing import Dict, Any, List, Optional, Set, Tuple
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from app.config import settings
+from app.services.article_store import utc_naive
+from app.services.database import Database, database
+
+logger = logging.getLogger(__name__)
+
+# Counters kept per user in user_dashboard_counters
+DASHBOARD_COLUMNS = ("saved_queries_count", "active_alerts_count", "total_api_calls")
+
+# activity_hourly user_id for activity without a user
+NIL_USER_ID = "00000000-0000-0000-0000-000000000000"
+
+# activity_logs partition name suffixes per partition period
+PARTITION_FORMATS = {"day": "%Y%m%d", "month": "%Y%m"}
+
+
+def _api_call_counts(rows: List[Tuple[Any, ...]]) -> List[Tuple[str, int, datetime]]:
+    """Sum a batch of activity rows into (user_id, api_calls, last_activity) per user"""
+    counts: Dict[str, List[Any]] = {}
+    for user_id, action, *_, created_at in rows:
+        if user_id is None or action != "api_call":
+            continue
+        entry = counts.setdefault(user_id, [0, created_at])
+        entry[0] += 1
+        entry[1] = max(entry[1], created_at)
+    return [(user_id, calls, last) for user_id, (calls, last) in counts.items()]
+
+
+def _hourly_counts(rows: List[Tuple[Any, ...]]) -> List[Tuple[datetime, str, str, int, datetime]]:
+    """Sum a batch of activity rows into (hour, user_id, action, calls, last_at) rollups"""
+    counts: Dict[Tuple[datetime, str, str], List[Any]] = {}
+    for user_id, action, *_, created_at in rows:
+        key = (created_at.replace(minute=0, second=0, microsecond=0), user_id or NIL_USER_ID, action)
+        entry = counts.setdefault(key, [0, created_at])
+        entry[0] += 1
+        entry[1] = max(entry[1], created_at)
+    return [(*key, calls, last) for key, (calls, last) in counts.items()]
+
+
+def _without_unknown_users(rows: List[Tuple[Any, ...]], known: Set[str]) -> List[Tuple[Any, ...]]:
+    """Clear the user_id of activity rows whose user is not in known"""
+    return [row if row[0] is None or row[0] in known else (None, *row[1:]) for row in rows]
+
+
+def _partition_bounds(timestamp: datetime, period: str) -> Tuple[datetime, datetime]:
+    """Start of the day or month containing timestamp, and start of the next one"""
+    if period == "day":
+        lower = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return lower, lower + timedelta(days=1)
+    lower = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return lower, (lower + timedelta(days=32)).replace(day=1)
+
+
+class AccountStore(ABC):
+    """
+    Users' saved queries and alerts, and the activity they generate
+
+    Background workers read saved queries and alerts (percolator, alert
+    engine) and write activity in batches (activity logger); request
+    handlers read the hourly rollups and dashboard counters.
+    """
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Connect and create the schema"""
+        pass
+
+    @abstractmethod
+    async def load_saved_queries(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """
+        Get every saved query for the percolator
+
+        Returns:
+            List of (id, user_id, query_params) tuples
+        """
+        pass
+
+    @abstractmethod
+    async def owns_saved_query(self, query_id: str, user_id: Optional[str]) -> bool:
+        """
+        Check whether a saved query exists and belongs to a user
+
+        Args:
+            query_id: Saved query ID
+            user_id: Requesting user (None without authentication, which
+                only owns queries saved without a user)
+        """
+        pass
+
+    @abstractmethod
+    async def load_alerts(self) -> List[Tuple[str, Optional[str], str, Optional[str], Optional[str], Optional[float]]]:
+        """
+        Get every active user alert for the alert engine
+
+        Returns:
+            List of (id, user_id, alert_type, commodity, country, threshold_value) tuples
+        """
+        pass
+
+    @abstractmethod
+    async def mark_alerts_triggered(self, triggered: List[Tuple[str, datetime]]) -> int:
+        """
+        Set last_triggered_at for a batch of alerts in one statement
+
+        Args:
+            triggered: (alert_id, triggered_at) pairs
+
+        Returns:
+            Number of alerts updated
+        """
+        pass
+
+    @abstractmethod
+    async def insert_activity(self, rows: List[Tuple[Any, ...]]) -> int:
+        """
+        Bulk-insert activity_logs rows and add their api_calls to the dashboard counters
+
+        Args:
+            rows: (user_id, action, resource, ip_address, user_agent, metadata, created_at) tuples
+
+        Returns:
+            Number of rows written
+        """
+        pass
+
+    @abstractmethod
+    async def maintain_activity(self) -> Dict[str, int]:
+        """
+        Manage activity_logs partitions and retention
+
+        Creates the partitions for the current and next
+        ACTIVITY_LOG_PARTITIONS_AHEAD periods, drops (or deletes) activity
+        older than ACTIVITY_LOG_RETENTION_DAYS and rollups older than
+        ACTIVITY_ROLLUP_RETENTION_DAYS (0 keeps them).
+
+        Returns:
+            Dictionary with created/dropped partition and deleted row counts
+        """
+        pass
+
+    @abstractmethod
+    async def activity_usage(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get hourly activity counts from the rollups
+
+        Args:
+            since: First hour (inclusive)
+            until: End of the range (exclusive, default now)
+            user_id: Only this user's activity (default everyone)
+            action: Only this action (default every action)
+
+        Returns:
+            List of {"hour", "action", "calls"} in hour order
+        """
+        pass
+
+    @abstractmethod
+    async def dashboard_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's dashboard counters (a single-row lookup)
+
+        Returns:
+            Dictionary of DASHBOARD_COLUMNS plus last_activity, or None if
+            the user has no counters yet
+        """
+        pass
+
+    @abstractmethod
+    async def reconcile_dashboard_counters(self) -> int:
+        """
+        Recompute every user's dashboard counters from the base tables
+
+        Corrects drift from writes that bypassed the triggers or the
+        activity writer. Run periodically. API calls are summed from
+        activity_hourly, so dropped activity_logs partitions still count.
+
+        Returns:
+            Number of counter rows written
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release connections"""
+
+
+class SQLiteAccountStore(AccountStore):
+    """
+    Account store in a local SQLite file, mirroring database/schema.sql
+
+    sqlite3 is blocking, so every call runs in a worker thread via
+    asyncio.to_thread; a lock serializes access to the shared connection.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store (the database is opened on first use)
+
+        Args:
+            path: SQLite database path
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS saved_queries ("
+            " id TEXT PRIMARY KEY,"
+            " user_id TEXT,"
+            " name TEXT NOT NULL,"
+            " query_params TEXT NOT NULL,"
+            " is_favorite INTEGER DEFAULT 0,"
+            " created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,"
+            " updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ");"
+            # Mirrors activity_logs in database/schema.sql
+            "CREATE TABLE IF NOT EXISTS activity_logs ("
+            " id INTEGER PRIMARY KEY,"
+            " user_id TEXT,"
+            " action TEXT NOT NULL,"
+            " resource TEXT,"
+            " ip_address TEXT,"
+            " user_agent TEXT,"
+            " metadata TEXT DEFAULT '{}',"
+            " created_at TIMESTAMP NOT NULL"
+            ");"
+            "CREATE INDEX IF NOT EXISTS idx_activity_logs_user_id ON activity_logs (user_id);"
+            "CREATE INDEX IF NOT EXISTS idx_activity_logs_created_at ON activity_logs (created_at);"
+            "CREATE TABLE IF NOT EXISTS activity_hourly ("
+            " hour TIMESTAMP NOT NULL,"
+            " user_id TEXT NOT NULL,"
+            " action TEXT NOT NULL,"
+            " calls INTEGER NOT NULL DEFAULT 0,"
+            " last_at TIMESTAMP,"
+            " PRIMARY KEY (hour, user_id, action)"
+            ") WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS idx_activity_hourly_user ON activity_hourly (user_id, hour);"
+            # Mirrors user_dashboard_counters in database/schema.sql, with the
+            # same saved query and alert triggers
+            "CREATE TABLE IF NOT EXISTS user_dashboard_counters ("
+            " user_id TEXT PRIMARY KEY,"
+            " saved_queries_count INTEGER NOT NULL DEFAULT 0,"
+            " active_alerts_count INTEGER NOT NULL DEFAULT 0,"
+            " total_api_calls INTEGER NOT NULL DEFAULT 0,"
+            " last_activity TIMESTAMP,"
+            " reconciled_at TIMESTAMP"
+            ");"
+            "CREATE TRIGGER IF NOT EXISTS count_saved_queries_insert AFTER INSERT ON saved_queries"
+            " WHEN new.user_id IS NOT NULL BEGIN"
+            " INSERT INTO user_dashboard_counters (user_id, saved_queries_count) VALUES (new.user_id, 1)"
+            " ON CONFLICT (user_id) DO UPDATE SET saved_queries_count = saved_queries_count + 1;"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS count_saved_queries_delete AFTER DELETE ON saved_queries"
+            " WHEN old.user_id IS NOT NULL BEGIN"
+            " UPDATE user_dashboard_counters SET saved_queries_count = saved_queries_count - 1"
+            " WHERE user_id = old.user_id;"
+            " END;"
+            # Mirrors user_alerts in database/schema.sql
+            "CREATE TABLE IF NOT EXISTS user_alerts ("
+            " id TEXT PRIMARY KEY,"
+            " user_id TEXT,"
+            " alert_type TEXT NOT NULL,"
+            " commodity TEXT,"
+            " country TEXT,"
+            " threshold_value REAL,"
+            " is_active INTEGER DEFAULT 1,"
+            " last_triggered_at TIMESTAMP,"
+            " created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,"
+            " updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            ");"
+            "CREATE TRIGGER IF NOT EXISTS count_active_alerts_insert AFTER INSERT ON user_alerts"
+            " WHEN new.user_id IS NOT NULL AND new.is_active BEGIN"
+            " INSERT INTO user_dashboard_counters (user_id, active_alerts_count) VALUES (new.user_id, 1)"
+            " ON CONFLICT (user_id) DO UPDATE SET active_alerts_count = active_alerts_count + 1;"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS count_active_alerts_delete AFTER DELETE ON user_alerts"
+            " WHEN old.user_id IS NOT NULL AND old.is_active BEGIN"
+            " UPDATE user_dashboard_counters SET active_alerts_count = active_alerts_count - 1"
+            " WHERE user_id = old.user_id;"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS count_active_alerts_update AFTER UPDATE OF is_active ON user_alerts"
+            " WHEN new.user_id IS NOT NULL AND (new.is_active != 0) != (old.is_active != 0) BEGIN"
+            " INSERT INTO user_dashboard_counters (user_id, active_alerts_count)"
+            " VALUES (new.user_id, CASE WHEN new.is_active THEN 1 ELSE -1 END)"
+            " ON CONFLICT (user_id) DO UPDATE SET active_alerts_count = active_alerts_count + excluded.active_alerts_count;"
+            " END;"
+        )
+        self._conn = conn
+        return conn
+
+    def _open(self) -> None:
+        with self._lock:
+            self._connect()
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    def _load_saved_queries(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        with self._lock:
+            rows = self._connect().execute("SELECT id, user_id, query_params FROM saved_queries").fetchall()
+        return [(query_id, user_id, json.loads(params)) for query_id, user_id, params in rows]
+
+    async def load_saved_queries(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        return await asyncio.to_thread(self._load_saved_queries)
+
+    def _owns_saved_query(self, query_id: str, user_id: Optional[str]) -> bool:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT 1 FROM saved_queries WHERE id = ? AND user_id IS ?",
+                (query_id, user_id)
+            ).fetchone() is not None
+
+    async def owns_saved_query(self, query_id: str, user_id: Optional[str]) -> bool:
+        return await asyncio.to_thread(self._owns_saved_query, query_id, user_id)
+
+    def _load_alerts(self) -> List[Tuple[str, Optional[str], str, Optional[str], Optional[str], Optional[float]]]:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT id, user_id, alert_type, commodity, country, threshold_value"
+                " FROM user_alerts WHERE is_active"
+            ).fetchall()
+
+    async def load_alerts(self) -> List[Tuple[str, Optional[str], str, Optional[str], Optional[str], Optional[float]]]:
+        return await asyncio.to_thread(self._load_alerts)
+
+    def _mark_alerts_triggered(self, triggered: List[Tuple[str, datetime]]) -> int:
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.executemany(
+                "UPDATE user_alerts SET last_triggered_at = ? WHERE id = ?",
+                [(triggered_at, alert_id) for alert_id, triggered_at in triggered]
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    async def mark_alerts_triggered(self, triggered: List[Tuple[str, datetime]]) -> int:
+        if not triggered:
+            return 0
+        return await asyncio.to_thread(self._mark_alerts_triggered, triggered)
+
+    def _insert_activity(self, rows: List[Tuple[Any, ...]]) -> int:
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO activity_logs (user_id, action, resource, ip_address, user_agent, metadata, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row[:5], json.dumps(row[5]), row[6]) for row in rows]
+            )
+            # Same transaction, so the counters never drift from the rows
+            conn.executemany(
+                "INSERT INTO user_dashboard_counters (user_id, total_api_calls, last_activity) VALUES (?, ?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET"
+                " total_api_calls = total_api_calls + excluded.total_api_calls,"
+                " last_activity = MAX(COALESCE(last_activity, excluded.last_activity), excluded.last_activity)",
+                _api_call_counts(rows)
+            )
+            conn.executemany(
+                "INSERT INTO activity_hourly (hour, user_id, action, calls, last_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (hour, user_id, action) DO UPDATE SET"
+                " calls = calls + excluded.calls,"
+                " last_at = MAX(COALESCE(last_at, excluded.last_at), excluded.last_at)",
+                _hourly_counts(rows)
+            )
+            conn.commit()
+        return len(rows)
+
+    def _maintain_activity(self) -> Dict[str, int]:
+        # SQLite has no partitions; retention is a range delete on created_at
+        now = datetime.utcnow()
+        deleted = rollups_deleted = 0
+        with self._lock:
+            conn = self._connect()
+            if settings.ACTIVITY_LOG_RETENTION_DAYS:
+                deleted = conn.execute(
+                    "DELETE FROM activity_logs WHERE created_at < ?",
+                    (now - timedelta(days=settings.ACTIVITY_LOG_RETENTION_DAYS),)
+                ).rowcount
+            if settings.ACTIVITY_ROLLUP_RETENTION_DAYS:
+                rollups_deleted = conn.execute(
+                    "DELETE FROM activity_hourly WHERE hour < ?",
+                    (now - timedelta(days=settings.ACTIVITY_ROLLUP_RETENTION_DAYS),)
+                ).rowcount
+            conn.commit()
+        return {"created": 0, "dropped": 0, "deleted": deleted, "rollups_deleted": rollups_deleted}
+
+    async def maintain_activity(self) -> Dict[str, int]:
+        return await asyncio.to_thread(self._maintain_activity)
+
+    def _activity_usage(
+        self,
+        since: datetime,
+        until: Optional[datetime],
+        user_id: Optional[str],
+        action: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        conditions = ["hour >= ?", "hour < ?"]
+        params: List[Any] = [utc_naive(since), utc_naive(until or datetime.utcnow())]
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if action:
+            conditions.append("action = ?")
+            params.append(action)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT hour, action, SUM(calls) FROM activity_hourly WHERE {' AND '.join(conditions)}"
+                " GROUP BY hour, action ORDER BY hour, action",
+                params
+            ).fetchall()
+        return [{"hour": datetime.fromisoformat(hour), "action": name, "calls": calls} for hour, name, calls in rows]
+
+    async def activity_usage(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._activity_usage, since, until, user_id, action)
+
+    async def insert_activity(self, rows: List[Tuple[Any, ...]]) -> int:
+        if not rows:
+            return 0
+        return await asyncio.to_thread(self._insert_activity, rows)
+
+    def _dashboard_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT saved_queries_count, active_alerts_count, total_api_calls, last_activity"
+                " FROM user_dashboard_counters WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(DASHBOARD_COLUMNS, row[:3]), last_activity=row[3] and datetime.fromisoformat(row[3]))
+
+    async def dashboard_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._dashboard_stats, user_id)
+
+    def _reconcile_dashboard_counters(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT INTO user_dashboard_counters"
+                " (user_id, saved_queries_count, active_alerts_count, total_api_calls, last_activity, reconciled_at)"
+                " WITH users AS ("
+                " SELECT user_id FROM saved_queries UNION SELECT user_id FROM user_alerts"
+                " UNION SELECT user_id FROM activity_hourly WHERE action = 'api_call' AND user_id != ?"
+                " UNION SELECT user_id FROM user_dashboard_counters"
+                "),"
+                " sq AS (SELECT user_id, COUNT(*) AS n FROM saved_queries GROUP BY user_id),"
+                " ua AS (SELECT user_id, COUNT(*) AS n FROM user_alerts WHERE is_active GROUP BY user_id),"
+                " al AS (SELECT user_id, SUM(calls) AS n, MAX(last_at) AS last FROM activity_hourly"
+                "  WHERE action = 'api_call' GROUP BY user_id)"
+                " SELECT u.user_id, COALESCE(sq.n, 0), COALESCE(ua.n, 0), COALESCE(al.n, 0), al.last, ?"
+                " FROM users u LEFT JOIN sq USING (user_id) LEFT JOIN ua USING (user_id) LEFT JOIN al USING (user_id)"
+                " WHERE u.user_id IS NOT NULL"
+                " ON CONFLICT (user_id) DO UPDATE SET"
+                " saved_queries_count = excluded.saved_queries_count,"
+                " active_alerts_count = excluded.active_alerts_count,"
+                " total_api_calls = excluded.total_api_calls,"
+                " last_activity = excluded.last_activity,"
+                " reconciled_at = excluded.reconciled_at",
+                (NIL_USER_ID, datetime.utcnow())
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    async def reconcile_dashboard_counters(self) -> int:
+        return await asyncio.to_thread(self._reconcile_dashboard_counters)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PostgresAccountStore(AccountStore):
+    """
+    Account store on the database layer's pool (DATABASE_URL, requires asyncpg)
+
+    The tables live beside users and subscriptions in database/schema.sql,
+    so activity writes, alert loads and dashboard reads share the pool,
+    its sizing and its acquire statistics with API-key lookups.
+    """
+
+    def __init__(self, db: Database):
+        """
+        Initialize the store
+
+        Args:
+            db: Data-access layer whose pool the store borrows
+        """
+        self.database = db
+
+    async def open(self) -> None:
+        await self.database.connect()
+        async with self.database.acquire() as conn:
+            # Only missing when database/schema.sql predates the rollups
+            await conn.execute(
+                "CREATE TABLE IF NOT EXISTS activity_hourly ("
+                " hour TIMESTAMP WITH TIME ZONE NOT NULL,"
+                " user_id UUID NOT NULL,"
+                " action VARCHAR(100) NOT NULL,"
+                " calls BIGINT NOT NULL DEFAULT 0,"
+                " last_at TIMESTAMP WITH TIME ZONE,"
+                " PRIMARY KEY (hour, user_id, action)"
+                ");"
+                "CREATE TABLE IF NOT EXISTS user_dashboard_counters ("
+                " user_id UUID PRIMARY KEY,"
+                " saved_queries_count INTEGER NOT NULL DEFAULT 0,"
+                " active_alerts_count INTEGER NOT NULL DEFAULT 0,"
+                " total_api_calls BIGINT NOT NULL DEFAULT 0,"
+                " last_activity TIMESTAMP WITH TIME ZONE,"
+                " reconciled_at TIMESTAMP WITH TIME ZONE"
+                ");"
+            )
+            # Before the activity writer starts, so its first rows have a
+            # partition to go to instead of the default one
+            if await self._partitioned(conn):
+                await self._create_partitions(conn, datetime.now(timezone.utc))
+
+    @staticmethod
+    async def _partitioned(conn: Any) -> bool:
+        """Whether activity_logs is the partitioned table of database/schema.sql"""
+        return bool(await conn.fetchval(
+            "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('activity_logs')"
+        ))
+
+    @staticmethod
+    async def _create_partitions(conn: Any, now: datetime) -> int:
+        """
+        Create the missing activity_logs partitions for the current and next
+        ACTIVITY_LOG_PARTITIONS_AHEAD periods
+
+        Rows for a period that arrived before its partition sit in the
+        default partition, which PostgreSQL will not let a new partition
+        overlap; they are moved into the partition as it is attached.
+
+        Returns:
+            Number of partitions created
+        """
+        period = settings.ACTIVITY_LOG_PARTITION
+        default = await conn.fetchval(
+            "SELECT partdefid::regclass::text FROM pg_partitioned_table"
+            " WHERE partrelid = 'activity_logs'::regclass AND partdefid != 0"
+        )
+        created = 0
+        lower, upper = _partition_bounds(now, period)
+        for _ in range(settings.ACTIVITY_LOG_PARTITIONS_AHEAD + 1):
+            name = f"activity_logs_p{lower.strftime(PARTITION_FORMATS[period])}"
+            if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name):
+                bounds = f"FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+                if default is None:
+                    await conn.execute(f"CREATE TABLE {name} PARTITION OF activity_logs FOR VALUES {bounds}")
+                else:
+                    async with conn.transaction():
+                        await conn.execute(f"CREATE TABLE {name} (LIKE activity_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+                        await conn.execute(
+                            f"WITH moved AS (DELETE FROM {default} WHERE created_at >= $1 AND created_at < $2 RETURNING *)"
+                            f" INSERT INTO {name} SELECT * FROM moved",
+                            lower,
+                            upper
+                        )
+                        await conn.execute(f"ALTER TABLE activity_logs ATTACH PARTITION {name} FOR VALUES {bounds}")
+                created += 1
+            lower, upper = upper, _partition_bounds(upper, period)[1]
+        return created
+
+    async def load_saved_queries(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        async with self.database.acquire() as conn:
+            rows = await conn.fetch("SELECT id, user_id, query_params FROM saved_queries")
+        return [
+            (str(row["id"]), str(row["user_id"]), json.loads(row["query_params"]))
+            for row in rows
+        ]
+
+    async def owns_saved_query(self, query_id: str, user_id: Optional[str]) -> bool:
+        async with self.database.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM saved_queries"
+                " WHERE id = $1::uuid AND user_id IS NOT DISTINCT FROM $2::uuid)",
+                query_id,
+                user_id
+            )
+
+    async def load_alerts(self) -> List[Tuple[str, Optional[str], str, Optional[str], Optional[str], Optional[float]]]:
+        async with self.database.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id, user_id, alert_type, commodity, country, threshold_value"
+                " FROM user_alerts WHERE is_active"
+            )
+        return [
+            (
+                str(row["id"]),
+                str(row["user_id"]),
+                row["alert_type"],
+                row["commodity"],
+                row["country"],
+                float(row["threshold_value"]) if row["threshold_value"] is not None else None
+            )
+            for row in rows
+        ]
+
+    async def mark_alerts_triggered(self, triggered: List[Tuple[str, datetime]]) -> int:
+        if not triggered:
+            return 0
+
+        async with self.database.acquire() as conn:
+            result = await conn.execute(
+                "UPDATE user_alerts SET last_triggered_at = t.triggered_at AT TIME ZONE 'UTC'"
+                " FROM unnest($1::uuid[], $2::timestamp[]) AS t(id, triggered_at)"
+                " WHERE user_alerts.id = t.id",
+                [alert_id for alert_id, _ in triggered],
+                [triggered_at for _, triggered_at in triggered]
+            )
+        return int(result.split()[-1])
+
+    async def insert_activity(self, rows: List[Tuple[Any, ...]]) -> int:
+        if not rows:
+            return 0
+
+        records = []
+        for user_id, action, resource, ip_address, user_agent, metadata, created_at in rows:
+            try:
+                ip_address = ipaddress.ip_address(ip_address) if ip_address else None
+            except ValueError:
+                ip_address = None
+            records.append((
+                user_id, action, resource, ip_address, user_agent, json.dumps(metadata),
+                created_at.replace(tzinfo=timezone.utc)
+            ))
+
+        user_ids = sorted({record[0] for record in records if record[0] is not None})
+        async with self.database.acquire() as conn:
+            async with conn.transaction():
+                if user_ids:
+                    # Rows of users deleted since they were logged lose their
+                    # user, as ON DELETE SET NULL would have done; otherwise
+                    # the foreign keys would fail the whole batch. The lock
+                    # keeps the users that exist from going away until commit.
+                    known = {
+                        str(row["id"]) for row in await conn.fetch(
+                            "SELECT id FROM users WHERE id = ANY($1::uuid[]) FOR KEY SHARE", user_ids
+                        )
+                    }
+                    records = _without_unknown_users(records, known)
+                counts = _api_call_counts(records)
+                # COPY is the cheapest bulk path into PostgreSQL
+                await conn.copy_records_to_table(
+                    "activity_logs",
+                    records=records,
+                    columns=["user_id", "action", "resource", "ip_address", "user_agent", "metadata", "created_at"]
+                )
+                if counts:
+                    await conn.execute(
+                        "INSERT INTO user_dashboard_counters (user_id, total_api_calls, last_activity)"
+                        " SELECT * FROM unnest($1::uuid[], $2::bigint[], $3::timestamptz[])"
+                        " ON CONFLICT (user_id) DO UPDATE SET"
+                        " total_api_calls = user_dashboard_counters.total_api_calls + EXCLUDED.total_api_calls,"
+                        " last_activity = GREATEST(user_dashboard_counters.last_activity, EXCLUDED.last_activity)",
+                        *map(list, zip(*counts))
+                    )
+                await conn.execute(
+                    "INSERT INTO activity_hourly (hour, user_id, action, calls, last_at)"
+                    " SELECT * FROM unnest($1::timestamptz[], $2::uuid[], $3::text[], $4::bigint[], $5::timestamptz[])"
+                    " ON CONFLICT (hour, user_id, action) DO UPDATE SET"
+                    " calls = activity_hourly.calls + EXCLUDED.calls,"
+                    " last_at = GREATEST(activity_hourly.last_at, EXCLUDED.last_at)",
+                    *map(list, zip(*_hourly_counts(records)))
+                )
+        return len(records)
+
+    async def maintain_activity(self) -> Dict[str, int]:
+        now = datetime.now(timezone.utc)
+        result = {"created": 0, "dropped": 0, "deleted": 0, "rollups_deleted": 0}
+        cutoff = now - timedelta(days=settings.ACTIVITY_LOG_RETENTION_DAYS) if settings.ACTIVITY_LOG_RETENTION_DAYS else None
+
+        async with self.database.acquire() as conn:
+            if await self._partitioned(conn):
+                result["created"] = await self._create_partitions(conn, now)
+
+                if cutoff:
+                    names = await conn.fetch(
+                        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+                        " WHERE i.inhparent = 'activity_logs'::regclass"
+                    )
+                    for (name,) in names:
+                        match = re.fullmatch(r"activity_logs_p(\d{6}|\d{8})", name)
+                        if not match:
+                            # The default partition, whose rows cannot be dropped by period
+                            status = await conn.execute(f"DELETE FROM {name} WHERE created_at < $1", cutoff)
+                            result["deleted"] += int(status.split()[-1])
+                            continue
+                        suffix = match.group(1)
+                        partition_period = "day" if len(suffix) == 8 else "month"
+                        lower = datetime.strptime(suffix, PARTITION_FORMATS[partition_period]).replace(tzinfo=timezone.utc)
+                        # Only whole partitions past retention; dropping is instant, unlike DELETE
+                        if _partition_bounds(lower, partition_period)[1] <= cutoff:
+                            await conn.execute(f"DROP TABLE {name}")
+                            result["dropped"] += 1
+            elif cutoff:
+                # Unpartitioned table from an older schema
+                status = await conn.execute("DELETE FROM activity_logs WHERE created_at < $1", cutoff)
+                result["deleted"] = int(status.split()[-1])
+
+            if settings.ACTIVITY_ROLLUP_RETENTION_DAYS:
+                status = await conn.execute(
+                    "DELETE FROM activity_hourly WHERE hour < $1",
+                    now - timedelta(days=settings.ACTIVITY_ROLLUP_RETENTION_DAYS)
+                )
+                result["rollups_deleted"] = int(status.split()[-1])
+        return result
+
+    async def activity_usage(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        async with self.database.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT hour, action, SUM(calls) AS calls FROM activity_hourly"
+                " WHERE hour >= $1 AND hour < $2"
+                " AND ($3::uuid IS NULL OR user_id = $3::uuid) AND ($4::text IS NULL OR action = $4)"
+                " GROUP BY hour, action ORDER BY hour, action",
+                utc_naive(since).replace(tzinfo=timezone.utc),
+                utc_naive(until or datetime.utcnow()).replace(tzinfo=timezone.utc),
+                user_id,
+                action
+            )
+        return [{"hour": row["hour"], "action": row["action"], "calls": row["calls"]} for row in rows]
+
+    async def dashboard_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        async with self.database.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT saved_queries_count, active_alerts_count, total_api_calls, last_activity"
+                " FROM user_dashboard_counters WHERE user_id = $1::uuid",
+                user_id
+            )
+        return dict(row) if row is not None else None
+
+    async def reconcile_dashboard_counters(self) -> int:
+        async with self.database.acquire() as conn:
+            result = await conn.execute(
+                "INSERT INTO user_dashboard_counters"
+                " (user_id, saved_queries_count, active_alerts_count, total_api_calls, last_activity, reconciled_at)"
+                " SELECT u.id, COALESCE(sq.n, 0), COALESCE(ua.n, 0), COALESCE(al.n, 0), al.last, NOW()"
+                " FROM users u"
+                " LEFT JOIN (SELECT user_id, COUNT(*) AS n FROM saved_queries GROUP BY user_id) sq"
+                "  ON sq.user_id = u.id"
+                " LEFT JOIN (SELECT user_id, COUNT(*) AS n FROM user_alerts WHERE is_active GROUP BY user_id) ua"
+                "  ON ua.user_id = u.id"
+                " LEFT JOIN (SELECT user_id, SUM(calls) AS n, MAX(last_at) AS last FROM activity_hourly"
+                "  WHERE action = 'api_call' GROUP BY user_id) al ON al.user_id = u.id"
+                " ON CONFLICT (user_id) DO UPDATE SET"
+                " saved_queries_count = EXCLUDED.saved_queries_count,"
+                " active_alerts_count = EXCLUDED.active_alerts_count,"
+                " total_api_calls = EXCLUDED.total_api_calls,"
+                " last_activity = EXCLUDED.last_activity,"
+                " reconciled_at = EXCLUDED.reconciled_at"
+            )
+        return int(result.split()[-1])
+
+def create_account_store() -> AccountStore:
+    """
+    Create the store for the configured databases
+
+    Returns:
+        PostgresAccountStore on the database layer when DATABASE_URL is set,
+        else SQLiteAccountStore beside a SQLite article store (a PostgreSQL
+        article store without DATABASE_URL gets a PostgresAccountStore that
+        fails to open, leaving account features unavailable)
+    """
+    url = settings.ARTICLE_STORE_URL
+    if database.enabled or not url.startswith("sqlite:///"):
+        return PostgresAccountStore(database)
+    return SQLiteAccountStore(url[len("sqlite:///"):])
+
+
+# Global account store
+account_store = create_account_store()
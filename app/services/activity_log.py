@@ -0,0 +1,232 @@
+"""
+Asynchronous activity logging: requests enqueue, a background writer bulk-inserts
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import logging
+from app.config import settings
+from app.services.account_store import AccountStore, account_store
+
+logger = logging.getLogger(__name__)
+
+# What to do when the queue is full: drop the entry, or make the caller wait
+POLICIES = ("drop", "block")
+
+# (user_id, action, resource, ip_address, user_agent, metadata, created_at)
+ActivityRow = Tuple[Optional[str], str, Optional[str], Optional[str], Optional[str], Dict[str, Any], datetime]
+
+
+class ActivityLogger:
+    """
+    Buffers activity_logs rows in a bounded queue and writes them in bulk
+
+    Logging an event is an O(1) enqueue; no database work happens on the
+    request path. A writer task takes up to batch_size rows at a time,
+    waiting at most flush_interval seconds for a batch to fill, and writes
+    each batch with a single bulk insert (COPY on PostgreSQL). When the
+    queue is full the "drop" policy discards the new row and counts it,
+    while "block" makes the caller wait for room.
+
+    Each batch also adds its api_calls to user_dashboard_counters and its
+    hourly rollups to activity_hourly. Background tasks reconcile the
+    counters every DASHBOARD_RECONCILE_INTERVAL seconds and, every
+    ACTIVITY_MAINTENANCE_INTERVAL seconds, create upcoming activity_logs
+    partitions and drop expired ones.
+    """
+
+    def __init__(
+        self,
+        store: AccountStore,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        policy: Optional[str] = None
+    ):
+        """
+        Initialize the logger
+
+        Args:
+            store: Store the rows are written to
+            max_queue: Rows buffered before backpressure applies (defaults to ACTIVITY_LOG_QUEUE_SIZE)
+            batch_size: Most rows per insert (defaults to ACTIVITY_LOG_BATCH_SIZE)
+            flush_interval: Longest a row waits to be written (defaults to ACTIVITY_LOG_FLUSH_INTERVAL)
+            policy: "drop" or "block" (defaults to ACTIVITY_LOG_POLICY)
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        self.store = store
+        self.max_queue = max_queue or settings.ACTIVITY_LOG_QUEUE_SIZE
+        self.batch_size = batch_size or settings.ACTIVITY_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.ACTIVITY_LOG_FLUSH_INTERVAL
+        self.policy = (policy or settings.ACTIVITY_LOG_POLICY).lower()
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown activity log policy: {self.policy} (expected {', '.join(POLICIES)})")
+        # Created on start, inside the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        # Rows taken off the queue but not yet handed to a write, and the
+        # write in flight, so stop() loses neither
+        self._batch: List[ActivityRow] = []
+        self._writing: Optional[asyncio.Future] = None
+        self._stats = {"logged": 0, "dropped": 0, "written": 0, "batches": 0, "errors": 0}
+
+    async def log(
+        self,
+        action: str,
+        user_id: Optional[str] = None,
+        resource: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Enqueue an activity row
+
+        Args:
+            action: Action name ('api_call', 'login', ...)
+            user_id: Acting user, if known
+            resource: Resource accessed
+            ip_address: Client address
+            user_agent: Client user agent
+            metadata: Additional context
+
+        Returns:
+            False if the row was dropped (logger stopped, or queue full under "drop")
+        """
+        if self._queue is None:
+            return False
+
+        row = (user_id, action, resource, ip_address, user_agent, metadata or {}, datetime.utcnow())
+        if self.policy == "block":
+            await self._queue.put(row)
+        else:
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self._stats["dropped"] += 1
+                return False
+        self._stats["logged"] += 1
+        return True
+
+    async def _next_batch(self) -> None:
+        """Wait for a row, then take more until the batch is full or flush_interval passes"""
+        batch = self._batch
+        batch.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            # Take whatever is already queued without waiting
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _write(self, batch: List[ActivityRow]) -> None:
+        try:
+            self._stats["written"] += await self.store.insert_activity(batch)
+            self._stats["batches"] += 1
+        except Exception as e:
+            # Activity logs are best effort; a failed batch is not retried
+            self._stats["errors"] += 1
+            logger.error(f"Writing {len(batch)} activity rows failed: {str(e)}")
+
+    async def _run(self) -> None:
+        """Write batches forever"""
+        while True:
+            await self._next_batch()
+            batch, self._batch = self._batch, []
+            # Shielded so stopping the writer does not abandon a batch mid-write
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+
+    async def _run_reconcile(self) -> None:
+        """Reconcile dashboard counters forever"""
+        interval = settings.DASHBOARD_RECONCILE_INTERVAL
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                updated = await self.store.reconcile_dashboard_counters()
+                self._stats["reconciled_at"] = datetime.utcnow().isoformat()
+                logger.info(f"Reconciled dashboard counters for {updated} users")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Dashboard counter reconciliation failed: {str(e)}")
+
+    async def _run_maintenance(self) -> None:
+        """Maintain activity partitions and retention forever, starting now"""
+        interval = settings.ACTIVITY_MAINTENANCE_INTERVAL
+        while True:
+            try:
+                result = await self.store.maintain_activity()
+                self._stats["maintenance"] = {**result, "at": datetime.utcnow().isoformat()}
+                logger.info(f"Activity maintenance: {result}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Activity maintenance failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """Start the writer, reconciliation and maintenance tasks (no-op if already running)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if settings.DASHBOARD_RECONCILE_INTERVAL and (self._reconcile_task is None or self._reconcile_task.done()):
+            self._reconcile_task = asyncio.create_task(self._run_reconcile())
+        if settings.ACTIVITY_MAINTENANCE_INTERVAL and (self._maintenance_task is None or self._maintenance_task.done()):
+            self._maintenance_task = asyncio.create_task(self._run_maintenance())
+
+    async def stop(self) -> None:
+        """Stop the writer and write whatever is still queued"""
+        for task in (self._reconcile_task, self._maintenance_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reconcile_task = self._maintenance_task = None
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._writing is not None:
+            await self._writing
+            self._writing = None
+        if self._queue is None:
+            return
+
+        queue, self._queue = self._queue, None
+        rows, self._batch = self._batch, []
+        while not queue.empty():
+            rows.append(queue.get_nowait())
+        for start in range(0, len(rows), self.batch_size):
+            await self._write(rows[start:start + self.batch_size])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get activity logging statistics
+
+        Returns:
+            Dictionary with queue depth and logged/dropped/written counters
+        """
+        return {
+            **self._stats,
+            "policy": self.policy,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "running": self._task is not None and not self._task.done()
+        }
+
+
+# Global activity logger
+activity_logger = ActivityLogger(account_store)
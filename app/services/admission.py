@@ -0,0 +1,253 @@
+"""
+Admission control: bounds concurrent requests and sheds low-priority work under load
+"""
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import logging
+from app.config import settings
+from app.services.article_store import article_store
+
+logger = logging.getLogger(__name__)
+
+# Request classes sharing ADMISSION_MAX_INFLIGHT, most important first
+PRIORITIES = ("critical", "read", "fanout")
+# Plus open streams and long-polls, which hold a connection for minutes
+# while mostly idle, so they get their own pool (ADMISSION_MAX_STREAMS)
+CLASSES = PRIORITIES + ("stream",)
+
+# Classes of exact paths, then of path prefixes (first match wins); any
+# other path is a "read" (store- and cache-backed). Fan-outs call every
+# connector or the weather and price services per request.
+ROUTE_CLASSES: Dict[str, str] = {
+    "/api/v1/health": "critical",
+    "/api/v1/status": "critical",
+    "/metrics": "critical",
+    "/api/v1/subscribe": "stream",
+    "/api/v1/news": "fanout",
+    # Read from the article store, unlike the other /news/ routes
+    "/api/v1/news/changes": "read"
+}
+ROUTE_PREFIXES: List[Tuple[str, str]] = [
+    ("/api/v1/climate/", "fanout"),
+    # /news/product/{product} and /news/{source}, which calls one upstream live
+    ("/api/v1/news/", "fanout")
+]
+# Fan-outs answered from the article store, without any upstream call,
+# while ingestion is current (unpaginated requests only)
+STORE_BACKED = ("/api/v1/news", "/api/v1/news/product/")
+
+
+def _served_from_store(path: str, params: Mapping[str, str]) -> bool:
+    return (
+        (path == STORE_BACKED[0] or path.startswith(STORE_BACKED[1]))
+        and settings.NEWS_READ_FROM_STORE
+        and not params.get("page_size")
+        and not params.get("cursor")
+        and article_store.is_fresh()
+    )
+
+
+def route_class(path: str, params: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Class of a request (statistics endpoints are critical)
+
+    Args:
+        path: Request path
+        params: Query parameters; `stream` makes any request a stream, and
+            store-backed fan-outs are reads while the store is fresh
+    """
+    params = params or {}
+    if params.get("stream"):
+        return "stream"
+    path = path.rstrip("/") or path
+    request_class = ROUTE_CLASSES.get(path)
+    if request_class is None:
+        if path.endswith("/stats"):
+            return "critical"
+        request_class = next((cls for prefix, cls in ROUTE_PREFIXES if path.startswith(prefix)), "read")
+    if request_class == "fanout" and _served_from_store(path, params):
+        return "read"
+    return request_class
+
+
+class Overloaded(Exception):
+    """A request was shed; answer 503 with Retry-After"""
+
+
+class AdmissionController:
+    """
+    Admits requests by priority while tracking in-flight work and loop lag
+
+    At most ADMISSION_MAX_INFLIGHT requests run at once, and fan-outs may
+    use only ADMISSION_FANOUT_SHARE of those slots. Critical requests
+    (health, status, stats) are never queued or shed. Others wait up to
+    ADMISSION_QUEUE_TIMEOUT for a slot, in priority order, in a queue of at
+    most ADMISSION_MAX_QUEUE; beyond that they are shed. Streams and
+    long-polls are limited to ADMISSION_MAX_STREAMS apart from all that,
+    and are shed rather than queued at the limit. A monitor task measures
+    event-loop lag: once it passes ADMISSION_MAX_LAG_MS fan-outs are shed
+    outright, and past twice that, reads and new streams are too.
+    """
+
+    def __init__(self):
+        self.inflight = dict.fromkeys(CLASSES, 0)
+        self.lag_ms = 0.0
+        # (priority, arrival, request class, future) of waiting requests
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "admitted": dict.fromkeys(CLASSES, 0),
+            "queued": dict.fromkeys(CLASSES, 0),
+            "shed": dict.fromkeys(CLASSES, 0)
+        }
+
+    @property
+    def total_inflight(self) -> int:
+        """Requests holding ADMISSION_MAX_INFLIGHT slots (streams excluded)"""
+        return sum(self.inflight[request_class] for request_class in PRIORITIES)
+
+    def _limit(self, request_class: str) -> int:
+        if request_class == "fanout":
+            return max(1, int(settings.ADMISSION_MAX_INFLIGHT * settings.ADMISSION_FANOUT_SHARE))
+        return settings.ADMISSION_MAX_INFLIGHT
+
+    def _lagging(self, request_class: str) -> bool:
+        """Whether loop lag alone rules a class out"""
+        max_lag = settings.ADMISSION_MAX_LAG_MS
+        if request_class == "fanout":
+            return self.lag_ms > max_lag
+        return self.lag_ms > 2 * max_lag
+
+    def _can_admit(self, request_class: str) -> bool:
+        return (
+            not self._lagging(request_class)
+            and self.total_inflight < settings.ADMISSION_MAX_INFLIGHT
+            and self.inflight[request_class] < self._limit(request_class)
+        )
+
+    def _shed(self, request_class: str) -> Overloaded:
+        self._stats["shed"][request_class] += 1
+        return Overloaded(request_class)
+
+    def _start(self, request_class: str) -> None:
+        self.inflight[request_class] += 1
+        self._stats["admitted"][request_class] += 1
+
+    async def acquire(self, request_class: str) -> None:
+        """
+        Wait for a slot
+
+        Raises:
+            Overloaded: If the request is shed
+        """
+        if request_class == "critical":
+            self._start(request_class)
+            return
+        if request_class == "stream":
+            if self._lagging(request_class) or self.inflight["stream"] >= settings.ADMISSION_MAX_STREAMS:
+                raise self._shed(request_class)
+            self._start(request_class)
+            return
+
+        priority = PRIORITIES.index(request_class)
+        # Do not overtake waiters of the same or a higher priority
+        ahead = any(waiter[0] <= priority for waiter in self._waiters)
+        if not ahead and self._can_admit(request_class):
+            self._start(request_class)
+            return
+        if self._lagging(request_class) or len(self._waiters) >= settings.ADMISSION_MAX_QUEUE:
+            raise self._shed(request_class)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._arrivals), request_class, future)
+        heapq.heappush(self._waiters, waiter)
+        self._stats["queued"][request_class] += 1
+        try:
+            # _wake counts the request in flight when it resolves the future
+            await asyncio.wait_for(asyncio.shield(future), settings.ADMISSION_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if future.done():
+                # Admitted just as the wait timed out
+                return
+            future.cancel()
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            raise self._shed(request_class)
+        except asyncio.CancelledError:
+            # The client went away: hand the slot on, or leave the queue
+            if future.done() and not future.cancelled():
+                self.release(request_class)
+            elif waiter in self._waiters:
+                future.cancel()
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self, request_class: str) -> None:
+        """Free a slot and admit whoever can now run"""
+        self.inflight[request_class] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Admit waiting requests in priority order while slots allow"""
+        if not self._waiters:
+            return
+        remaining = []
+        for waiter in sorted(self._waiters):
+            request_class, future = waiter[2], waiter[3]
+            if not future.done() and self._can_admit(request_class):
+                self._start(request_class)
+                future.set_result(None)
+            elif not future.done():
+                remaining.append(waiter)
+        heapq.heapify(remaining)
+        self._waiters = remaining
+
+    async def _monitor(self) -> None:
+        """Measure event-loop lag as the overshoot of a short sleep (smoothed)"""
+        loop = asyncio.get_running_loop()
+        interval = settings.ADMISSION_LAG_INTERVAL
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            lag_ms = max(0.0, (loop.time() - started - interval) * 1000)
+            self.lag_ms = 0.7 * self.lag_ms + 0.3 * lag_ms
+            # Falling lag can let queued requests in
+            self._wake()
+
+    def start(self) -> None:
+        """Start the lag monitor (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        """Stop the lag monitor"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get admission statistics
+
+        Returns:
+            Dictionary with in-flight and waiting requests, loop lag and
+            admitted/queued/shed counts per class
+        """
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "inflight": dict(self.inflight),
+            "waiting": len(self._waiters),
+            "loop_lag_ms": round(self.lag_ms, 2),
+            "max_inflight": settings.ADMISSION_MAX_INFLIGHT,
+            "max_streams": settings.ADMISSION_MAX_STREAMS,
+            **{name: dict(counts) for name, counts in self._stats.items()}
+        }
+
+
+# Global admission controller
+admission = AdmissionController()
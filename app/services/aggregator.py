@@ -1,10 +1,13 @@
 """
 News aggregator service - orchestrates multiple connectors
 """
-from typing import List, Optional, Dict, Tuple
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Tuple
+from datetime import datetime
 import asyncio
+import heapq
 import logging
-from app.models.schemas import NewsArticle, SourceType
+from app.config import settings
+from app.models.schemas import NewsArticle, NewsQuery, SourceType
 from app.connectors import (
     GoogleSearchConnector,
     PerplexityConnector,
@@ -12,6 +15,13 @@ from app.connectors import (
     ZeeBusinessConnector,
     AgroPortalsConnector
 )
+from app.connectors.base import BaseConnector
+from app.services.article_index import article_matches
+from app.services.dedup_index import DedupIndex
+from app.services.fetch_budget import fetch_budget
+from app.services.tracing import span
+from app.utils.gazetteer import gazetteer
+from app.utils.normalizer import ArticleDeduplicator
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +29,16 @@ logger = logging.getLogger(__name__)
 class NewsAggregatorService:
     """Service to aggregate news from multiple sources"""
     
-    def __init__(self):
-        """Initialize all connectors"""
+    def __init__(self, dedup_index: Optional[DedupIndex] = None):
+        """
+        Initialize all connectors
+        
+        Args:
+            dedup_index: Persistent index of ingested articles. When given,
+                the aggregator only returns articles not recorded by
+                earlier fetches (ingestion mode); record_ingested adds
+                them once they are stored.
+        """
         self.connectors = {
             SourceType.GOOGLE_SEARCH: GoogleSearchConnector(),
             SourceType.PERPLEXITY: PerplexityConnector(),
@@ -28,6 +46,31 @@ class NewsAggregatorService:
             SourceType.ZEE_BUSINESS: ZeeBusinessConnector(),
             SourceType.AGRO_PORTALS: AgroPortalsConnector()
         }
+        self.dedup_index = dedup_index
+        for connector in self.connectors.values():
+            connector.dedup_index = dedup_index
+    
+    async def _only_new(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        """
+        Drop articles ingested before (ingestion mode only)
+        
+        Connectors already skip articles recorded by recent polls before
+        tagging; this checks the full index and also covers mock data.
+        """
+        if self.dedup_index is None:
+            return articles
+        return await self.dedup_index.filter_unseen(articles)
+    
+    async def record_ingested(self, articles: List[NewsArticle]) -> int:
+        """
+        Record stored articles in the dedup index (ingestion mode only)
+        
+        Returns:
+            Number of new keys recorded
+        """
+        if self.dedup_index is None:
+            return 0
+        return await self.dedup_index.add_many((a.url, a.headline) for a in articles)
     
     async def fetch_from_source(
         self,
@@ -54,33 +97,15 @@ class NewsAggregatorService:
                 commodity=commodity,
                 limit=limit
             )
-            return articles, None
+            return await self._only_new(articles), None
             
         except Exception as e:
             error_msg = f"Error fetching from {source}: {str(e)}"
             logger.error(error_msg)
             return [], error_msg
     
-    async def fetch_from_all_sources(
-        self,
-        query: Optional[str] = None,
-        country: Optional[str] = None,
-        commodity: Optional[str] = None,
-        category: Optional[str] = None,
-        limit_per_source: int = 5
-    ) -> Tuple[List[NewsArticle], List[str], List[str]]:
-        """
-        Fetch news from all sources concurrently
-        
-        Returns:
-            Tuple of (all_articles, successful_sources, failed_sources)
-        """
-        # Create tasks for all connectors
-        tasks = []
-        source_names = []
-        
-        # Modify query based on category to get relevant results
-        search_query = query
+    def _search_query(self, query: Optional[str], category: Optional[str]) -> Optional[str]:
+        """Add category keywords to the query to get relevant results"""
         category_query_enhancers = {
             "trade": "export import trading deal contract shipment logistics",
             "price": "price cost surge rally decline volatility futures forecast",
@@ -92,48 +117,329 @@ class NewsAggregatorService:
         if query and category and category != "overview":
             if category in category_query_enhancers:
                 # Add category-specific keywords to improve relevance
-                search_query = f"{query} {category_query_enhancers[category]}"
+                return f"{query} {category_query_enhancers[category]}"
         elif category and category != "overview" and category in category_query_enhancers:
             # If no query but category specified, use category keywords
-            search_query = category_query_enhancers[category]
-        
-        for source_type, connector in self.connectors.items():
-            tasks.append(
-                connector.fetch_news(
-                    query=search_query,
-                    country=country,
-                    commodity=commodity,
-                    limit=limit_per_source
-                )
-            )
-            source_names.append(source_type.value)
+            return category_query_enhancers[category]
+        
+        return query
+    
+    def _news_query(
+        self,
+        query: Optional[str],
+        country: Optional[str],
+        commodity: Optional[str],
+        category: Optional[str],
+        limit_per_source: int,
+        filters: Optional[Dict[str, Optional[str]]],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> NewsQuery:
+        """Build the query sent to every connector"""
+        return NewsQuery(
+            query=self._search_query(query, category),
+            country=country,
+            commodity=commodity,
+            limit=limit_per_source,
+            since=since,
+            until=until,
+            filters={
+                field: value
+                for field, value in self.resolve_filters(**(filters or {})).items()
+                if value is not None
+            }
+        )
+    
+    async def _search_source(
+        self,
+        source_type: SourceType,
+        news_query: NewsQuery,
+        budgets: Optional[Dict[str, int]] = None
+    ) -> Tuple[str, Optional[List[NewsArticle]]]:
+        """
+        Run the query on one connector
+        
+        Returns:
+            Tuple of (source_name, articles or None if the source failed)
+        """
+        source_name = source_type.value
+        connector = self.connectors[source_type]
+        if budgets and source_name in budgets:
+            news_query = news_query.model_copy(update={"limit": budgets[source_name]})
+        
+        try:
+            with span(f"connector.{source_name}", source=source_name, limit=news_query.limit):
+                result = await connector.search(news_query)
+        except Exception as e:
+            logger.error(f"Source {source_name} failed: {str(e)}")
+            return source_name, None
+        
+        if not isinstance(result, list):
+            return source_name, None
+        with span("filter", source=source_name):
+            return source_name, self._apply_remaining(connector, result, news_query)
+    
+    async def fetch_streams(
+        self,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        commodity: Optional[str] = None,
+        category: Optional[str] = None,
+        limit_per_source: int = 5,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        budgets: Optional[Dict[str, int]] = None
+    ) -> Tuple[List[List[NewsArticle]], List[str], List[str]]:
+        """
+        Fetch newest-first article lists from all sources concurrently
+        
+        Filters and the time window travel to every connector in a NewsQuery;
+        whatever a connector cannot push down is applied to its results here.
+        
+        Args:
+            query: Search query
+            country: Country to search for
+            commodity: Commodity to search for
+            category: Category used to enhance the query
+            limit_per_source: Articles requested per source
+            filters: Keyword arguments for filter_articles (country, state,
+                commodity, ticker, category)
+            since: Only articles published at or after this time
+            until: Only articles published before this time
+            budgets: Per-source request sizes overriding limit_per_source
         
-        # Execute all tasks concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Returns:
+            Tuple of (per_source_articles, successful_sources, failed_sources)
+        """
+        news_query = self._news_query(
+            query, country, commodity, category, limit_per_source, filters, since, until
+        )
+        
+        # Execute all connectors concurrently
+        results = await asyncio.gather(*(
+            self._search_source(source_type, news_query, budgets) for source_type in self.connectors
+        ))
         
         # Process results
-        all_articles = []
+        streams = []
         successful_sources = []
         failed_sources = []
         
-        for source_name, result in zip(source_names, results):
-            if isinstance(result, Exception):
-                logger.error(f"Source {source_name} failed: {str(result)}")
+        for source_name, result in results:
+            if result is None:
                 failed_sources.append(source_name)
-            elif isinstance(result, list):
-                all_articles.extend(result)
-                if result:  # Only add to successful if we got results
-                    successful_sources.append(source_name)
-                else:
-                    failed_sources.append(source_name)
+                continue
+            streams.append(result)
+            if result:  # Only add to successful if we got results
+                successful_sources.append(source_name)
             else:
                 failed_sources.append(source_name)
         
-        # Sort articles by timestamp (newest first)
-        all_articles.sort(key=lambda x: x.timestamp, reverse=True)
+        return streams, successful_sources, failed_sources
+    
+    async def iter_streams(
+        self,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        commodity: Optional[str] = None,
+        category: Optional[str] = None,
+        limit_per_source: int = 5,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[str, Optional[List[NewsArticle]]]]:
+        """
+        Yield each source's newest-first articles as soon as it finishes
+        
+        Takes the same arguments as fetch_streams. Connectors still pending
+        when the caller stops iterating are cancelled.
+        
+        Yields:
+            Tuple of (source_name, articles or None if the source failed),
+            in completion order
+        """
+        news_query = self._news_query(
+            query, country, commodity, category, limit_per_source, filters, since, until
+        )
+        tasks = [
+            asyncio.create_task(self._search_source(source_type, news_query))
+            for source_type in self.connectors
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def _apply_remaining(
+        connector: BaseConnector,
+        articles: List[NewsArticle],
+        news_query: NewsQuery
+    ) -> List[NewsArticle]:
+        """Apply the query predicates the connector did not push down"""
+        pushed = connector.pushdown_predicates
+        remaining = {f: v for f, v in news_query.filters.items() if f not in pushed}
+        check_window = "time_window" not in pushed and (news_query.since or news_query.until)
+        
+        if not remaining and not check_window:
+            return articles
+        
+        return [
+            a for a in articles
+            if article_matches(a, **remaining)
+            and not (check_window and (
+                (news_query.since and a.timestamp < news_query.since)
+                or (news_query.until and a.timestamp >= news_query.until)
+            ))
+        ]
+    
+    @staticmethod
+    def merge_by_recency(streams: List[List[NewsArticle]]) -> Iterator[NewsArticle]:
+        """
+        Lazily merge newest-first lists into one newest-first stream
+        
+        A k-way heap merge: producing the first n articles costs
+        O(n log k) for k sources instead of sorting everything.
+        """
+        return heapq.merge(*streams, key=lambda a: a.timestamp, reverse=True)
+    
+    async def fetch_from_all_sources(
+        self,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        commodity: Optional[str] = None,
+        category: Optional[str] = None,
+        limit_per_source: int = 5
+    ) -> Tuple[List[NewsArticle], List[str], List[str]]:
+        """
+        Fetch news from all sources concurrently
+        
+        Returns:
+            Tuple of (all_articles, successful_sources, failed_sources),
+            articles newest first
+        """
+        streams, successful_sources, failed_sources = await self.fetch_streams(
+            query=query,
+            country=country,
+            commodity=commodity,
+            category=category,
+            limit_per_source=limit_per_source
+        )
+        
+        all_articles = await self._only_new(list(self.merge_by_recency(streams)))
         
         return all_articles, successful_sources, failed_sources
     
+    async def fetch_top(
+        self,
+        limit: int,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        commodity: Optional[str] = None,
+        category: Optional[str] = None,
+        limit_per_source: Optional[int] = None,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        deduplicate: bool = True
+    ) -> Tuple[List[NewsArticle], List[str], List[str]]:
+        """
+        Fetch the newest `limit` articles matching filters across all sources
+        
+        Filters are pushed down to the connectors; the filtered streams are
+        merged newest first and deduplicated on the fly, and merging stops
+        as soon as the page is full.
+        
+        Args:
+            limit: Page size
+            query: Search query
+            country: Country passed to connectors
+            commodity: Commodity passed to connectors
+            category: Category used to enhance the query
+            limit_per_source: Articles requested per source; when omitted,
+                budgets are planned from each source's observed yield
+            filters: Keyword arguments for filter_articles (country, state,
+                commodity, ticker, category)
+            since: Only articles published at or after this time
+            deduplicate: Drop near-duplicate headlines
+            
+        Returns:
+            Tuple of (articles, successful_sources, failed_sources)
+        """
+        budgets = None
+        if limit_per_source is None and settings.FETCH_BUDGET_ENABLED:
+            budgets = fetch_budget.plan(
+                [source.value for source in self.connectors], limit, category, commodity
+            )
+        
+        streams, successful_sources, failed_sources = await self.fetch_streams(
+            query=query,
+            country=country,
+            commodity=commodity,
+            category=category,
+            limit_per_source=limit_per_source or limit,
+            filters=filters,
+            since=since,
+            budgets=budgets
+        )
+        
+        deduplicator = ArticleDeduplicator() if deduplicate else None
+        # "is not None": an empty deduplicator is falsy (it has a __len__)
+        page: List[NewsArticle] = deduplicator.articles if deduplicator is not None else []
+        duplicates: Dict[str, int] = {}
+        
+        with span("dedup"):
+            for article in self.merge_by_recency(streams):
+                if len(page) >= limit:
+                    break
+                if deduplicator is not None:
+                    if not deduplicator.add(article):
+                        duplicates[article.source] = duplicates.get(article.source, 0) + 1
+                else:
+                    page.append(article)
+        
+        if budgets:
+            # Articles left unmerged count as kept: they passed all filters
+            kept = {source: 0 for source in budgets}
+            for stream in streams:
+                for article in stream:
+                    kept[article.source] = kept.get(article.source, 0) + 1
+            for source, requested in budgets.items():
+                fetch_budget.record(
+                    source, requested, kept[source] - duplicates.get(source, 0), category, commodity
+                )
+            fetch_budget.record_outcome(
+                limit, sum(kept.values()) - sum(duplicates.values()), category, commodity
+            )
+        
+        return page, successful_sources, failed_sources
+    
+    @staticmethod
+    def resolve_filters(
+        country: Optional[str] = None,
+        state: Optional[str] = None,
+        commodity: Optional[str] = None,
+        ticker: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Normalize filter values into article_matches fields
+        
+        Returns:
+            Dictionary of field -> value (None when the filter is unset)
+        """
+        return {
+            # Articles carry canonical names, so resolve aliases like "USA"
+            "country": (gazetteer.canonical_country(country) or country) if country else None,
+            "state": (gazetteer.canonical_state(state, country) or state) if state else None,
+            "commodity": commodity,
+            "ticker": ticker,
+            "category": category if category and category != "overview" else None
+        }
+    
     def filter_articles(
         self,
         articles: List[NewsArticle],
@@ -157,38 +463,9 @@ class NewsAggregatorService:
         Returns:
             Filtered list of articles
         """
-        filtered = articles
-        
-        if country:
-            filtered = [
-                a for a in filtered 
-                if a.country and country.lower() in a.country.lower()
-            ]
-        
-        if state:
-            filtered = [
-                a for a in filtered
-                if a.state and state.lower() in a.state.lower()
-            ]
-        
-        if commodity:
-            filtered = [
-                a for a in filtered
-                if any(commodity.lower() in tag.lower() for tag in a.commodity_tags)
-            ]
-        
-        if ticker:
-            ticker_upper = ticker.upper()
-            filtered = [
-                a for a in filtered
-                if ticker_upper in a.tickers
-            ]
-        
-        if category and category != "overview":
-            filtered = [
-                a for a in filtered
-                if a.category.value == category
-            ]
-        
-        return filtered
-
+        if not any((country, state, commodity, ticker, category and category != "overview")):
+            return articles
+        
+        # One pass, checking every filter per article
+        filters = self.resolve_filters(country, state, commodity, ticker, category)
+        return [a for a in articles if article_matches(a, **filters)]
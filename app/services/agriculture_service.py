@@ -1,8 +1,8 @@
-import httpx
 import asyncio
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import logging
+from .metrics import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ class AgricultureService:
                 'format': 'JSON'
             }
             
-            async with httpx.AsyncClient() as client:
+            async with http_client("agriculture") as client:
                 response = await client.get(f"{self.usda_base_url}/api_GET", params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -82,7 +82,7 @@ class AgricultureService:
                 'format': 'json'
             }
             
-            async with httpx.AsyncClient() as client:
+            async with http_client("agriculture") as client:
                 response = await client.get(f"{self.fao_base_url}/en/data", params=params)
                 if response.status_code == 200:
                     data = response.json()
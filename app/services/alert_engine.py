@@ -0,0 +1,226 @@
+"""
+Threshold alert engine: evaluates users' alerts against price and weather ticks
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from bisect import bisect_right
+from datetime import datetime
+import logging
+from app.config import settings
+from app.services.account_store import AccountStore
+from app.utils.gazetteer import gazetteer
+
+logger = logging.getLogger(__name__)
+
+# Metric each alert type is evaluated on:
+#   price_change  - absolute daily change of a commodity price, in percent
+#   weather_alert - worst active weather alert severity for a commodity
+ALERT_TYPES = ("price_change", "weather_alert")
+
+# Weather alert severities as metric values
+SEVERITY_LEVELS = {"low": 1.0, "medium": 2.0, "high": 3.0, "critical": 4.0}
+
+# Threshold used when an alert does not set threshold_value
+DEFAULT_THRESHOLDS = {"price_change": 5.0, "weather_alert": SEVERITY_LEVELS["high"]}
+
+# (alert_type, commodity)
+AlertKey = Tuple[str, str]
+
+
+def _country(country: Optional[str]) -> Optional[str]:
+    return (gazetteer.canonical_country(country) or country).lower() if country else None
+
+
+class AlertRule:
+    """One active user alert"""
+
+    __slots__ = ("id", "user_id", "country", "threshold")
+
+    def __init__(self, alert_id: str, user_id: Optional[str], country: Optional[str], threshold: float):
+        self.id = alert_id
+        self.user_id = user_id
+        self.country = country
+        self.threshold = threshold
+
+
+class ThresholdIndex:
+    """Alerts for one (alert_type, commodity), sorted by threshold"""
+
+    __slots__ = ("thresholds", "rules")
+
+    def __init__(self, rules: List[AlertRule]):
+        rules.sort(key=lambda rule: rule.threshold)
+        self.rules = rules
+        self.thresholds = [rule.threshold for rule in rules]
+
+    def crossed(self, previous: float, value: float) -> List[AlertRule]:
+        """Rules with previous < threshold <= value (empty unless the value rose)"""
+        if value <= previous:
+            return []
+        return self.rules[bisect_right(self.thresholds, previous):bisect_right(self.thresholds, value)]
+
+    def reached(self, value: float) -> List[AlertRule]:
+        """Rules with threshold <= value"""
+        return self.rules[:bisect_right(self.thresholds, value)]
+
+
+class AlertEngine:
+    """
+    Evaluates active user_alerts as ticks arrive
+
+    Alerts are grouped by (alert_type, commodity) into arrays sorted by
+    threshold. A tick moves a metric from its previous value to a new one;
+    the alerts that fire are exactly those whose threshold lies in between,
+    found with two binary searches, so a tick costs O(log n + fired) however
+    many alerts are loaded. An alert fires when the metric rises to or past
+    its threshold, and fires again only after the metric has dropped below
+    it. Alerts new since the previous load (all of them after a restart)
+    fire on their first tick if the metric is already at or past their
+    threshold.
+
+    Fired alerts are buffered and written to last_triggered_at in one batch
+    by flush().
+    """
+
+    def __init__(self):
+        self._index: Dict[AlertKey, ThresholdIndex] = {}
+        self._last: Dict[Tuple[str, str, Optional[str]], float] = {}
+        # Alert ids loaded so far, and those not yet evaluated by a tick
+        self._known: set = set()
+        self._fresh: set = set()
+        self._pending: Dict[str, datetime] = {}
+        self._count = 0
+        self.loaded_at: Optional[datetime] = None
+        self._stats = {"ticks": 0, "triggered": 0, "written": 0}
+
+    def load(self, rows: Iterable[Tuple[str, Optional[str], str, Optional[str], Optional[str], Optional[float]]]) -> int:
+        """
+        Replace the index with a new set of active alerts
+
+        Args:
+            rows: (id, user_id, alert_type, commodity, country, threshold_value) tuples;
+                unsupported alert types and alerts without a commodity are skipped
+
+        Returns:
+            Number of alerts indexed
+        """
+        groups: Dict[AlertKey, List[AlertRule]] = {}
+        for alert_id, user_id, alert_type, commodity, country, threshold in rows:
+            alert_type = (alert_type or "").lower()
+            if alert_type not in ALERT_TYPES or not commodity:
+                continue
+            groups.setdefault((alert_type, commodity.lower()), []).append(AlertRule(
+                str(alert_id),
+                user_id and str(user_id),
+                _country(country),
+                float(threshold) if threshold is not None else DEFAULT_THRESHOLDS[alert_type]
+            ))
+
+        self._index = {key: ThresholdIndex(rules) for key, rules in groups.items()}
+        self._count = sum(len(rules) for rules in groups.values())
+        loaded = {rule.id for rules in groups.values() for rule in rules}
+        self._fresh = (self._fresh | (loaded - self._known)) & loaded
+        self._known = loaded
+        self.loaded_at = datetime.utcnow()
+        return self._count
+
+    def is_stale(self) -> bool:
+        """Whether alerts should be reloaded (ALERT_REFRESH_SECONDS)"""
+        if self.loaded_at is None:
+            return True
+        return (datetime.utcnow() - self.loaded_at).total_seconds() > settings.ALERT_REFRESH_SECONDS
+
+    def commodities(self, alert_type: str) -> List[str]:
+        """Commodities with at least one alert of a type"""
+        return sorted(commodity for kind, commodity in self._index if kind == alert_type)
+
+    def tick(self, alert_type: str, commodity: str, value: float, country: Optional[str] = None) -> List[AlertRule]:
+        """
+        Feed a new metric value and fire the alerts it crosses
+
+        Args:
+            alert_type: Alert type the metric belongs to (see ALERT_TYPES)
+            commodity: Commodity the value is for
+            value: New metric value
+            country: Country the value is for (None for global values like
+                prices, which fire alerts of every country)
+
+        Returns:
+            Alerts fired by this tick
+        """
+        commodity = commodity.lower()
+        country = _country(country)
+        state_key = (alert_type, commodity, country)
+        previous = self._last.get(state_key)
+        self._last[state_key] = value
+        self._stats["ticks"] += 1
+
+        index = self._index.get((alert_type, commodity))
+        if index is None:
+            return []
+
+        def applies(rule: AlertRule) -> bool:
+            return country is None or rule.country is None or rule.country == country
+
+        fired = [rule for rule in index.crossed(previous, value) if applies(rule)] if previous is not None else []
+        if self._fresh:
+            # New alerts have no earlier value to cross from: they fire if
+            # the metric is already past them, then behave like the rest
+            fired_ids = {rule.id for rule in fired}
+            fired.extend(
+                rule for rule in index.reached(value)
+                if rule.id in self._fresh and rule.id not in fired_ids and applies(rule)
+            )
+            self._fresh.difference_update(rule.id for rule in index.rules if applies(rule))
+        if fired:
+            now = datetime.utcnow()
+            for rule in fired:
+                self._pending[rule.id] = now
+            self._stats["triggered"] += len(fired)
+        return fired
+
+    def take_pending(self) -> List[Tuple[str, datetime]]:
+        """Remove and return the (alert_id, triggered_at) pairs waiting to be written"""
+        pending, self._pending = self._pending, {}
+        return list(pending.items())
+
+    async def flush(self, store: AccountStore) -> int:
+        """
+        Write last_triggered_at for every alert fired since the last flush
+
+        Args:
+            store: AccountStore holding user_alerts
+
+        Returns:
+            Number of alerts updated
+        """
+        pending = self.take_pending()
+        if not pending:
+            return 0
+        try:
+            written = await store.mark_alerts_triggered(pending)
+        except Exception:
+            # Keep the batch for the next flush, unless newer triggers replaced it
+            for alert_id, triggered_at in pending:
+                self._pending.setdefault(alert_id, triggered_at)
+            raise
+        self._stats["written"] += written
+        return written
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get alert engine statistics
+
+        Returns:
+            Dictionary with indexed alert counts and tick counters
+        """
+        return {
+            **self._stats,
+            "alerts": self._count,
+            "groups": len(self._index),
+            "pending": len(self._pending),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None
+        }
+
+
+# Global alert engine
+alert_engine = AlertEngine()
@@ -0,0 +1,261 @@
+"""
+API-key authentication with an in-memory key cache and per-key token buckets
+"""
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timezone
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.services.database import Database, database
+
+logger = logging.getLogger(__name__)
+
+
+class AuthError(Exception):
+    """A request cannot be served; carries the HTTP status and headers to answer with"""
+
+    def __init__(self, status_code: int, detail: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.headers = headers or {}
+
+
+class _LookupAbandoned(Exception):
+    """The request doing a shared key lookup was cancelled; waiters retry it"""
+
+
+class KeyInfo:
+    """A validated API key and the quota of its owner's plan"""
+
+    __slots__ = ("key_id", "user_id", "plan", "max_calls", "expires_at")
+
+    def __init__(self, row: Dict[str, Any]):
+        self.key_id = str(row["key_id"])
+        self.user_id = str(row["user_id"])
+        self.plan = row.get("plan_type") or "free"
+        self.max_calls = row.get("max_api_calls") or settings.API_DEFAULT_MAX_CALLS
+        self.expires_at: Optional[datetime] = row.get("expires_at")
+
+
+class TokenBucket:
+    """
+    Refills at max_calls per API_QUOTA_PERIOD seconds, holding at most
+    API_RATE_BURST tokens (or max_calls, if smaller)
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, max_calls: int):
+        self.rate = max_calls / settings.API_QUOTA_PERIOD
+        self.capacity = float(min(max_calls, settings.API_RATE_BURST))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> Tuple[bool, float]:
+        """
+        Take one token
+
+        Returns:
+            Tuple of (allowed, seconds until a token is available)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True, 0.0
+        return False, (1 - self.tokens) / self.rate
+
+
+class ApiKeyAuthenticator:
+    """
+    Validates API keys against the database without a query per request
+
+    Looked-up keys are cached for API_KEY_CACHE_TTL seconds, unknown or
+    unusable keys for API_KEY_NEGATIVE_TTL seconds, in an LRU bounded by
+    API_KEY_CACHE_SIZE; concurrent misses for one key share one query.
+    Quotas are enforced by a token bucket per key, in memory. Usage (call
+    counts and last use) accumulates in memory and is written to api_keys
+    in one batch every API_USAGE_FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, db: Database):
+        """
+        Initialize the authenticator
+
+        Args:
+            db: Data-access layer the keys are read from
+        """
+        self.db = db
+        # key -> (KeyInfo or None for a rejected key, monotonic expiry)
+        self._cache: "OrderedDict[str, Tuple[Optional[KeyInfo], float]]" = OrderedDict()
+        self._lookups: Dict[str, asyncio.Future] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        # key_id -> [calls, last used (naive UTC)]
+        self._usage: Dict[str, list] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "negative_hits": 0, "rejected": 0, "throttled": 0, "flushed": 0}
+
+    async def _lookup(self, api_key: str) -> Optional[KeyInfo]:
+        """Read a key from the database; None when it is unknown or unusable"""
+        row = await self.db.get_api_key(api_key)
+        if row is None or not row["is_active"]:
+            return None
+        if row["expires_at"] is not None and row["expires_at"] <= datetime.now(timezone.utc):
+            return None
+        return KeyInfo(row)
+
+    async def _resolve(self, api_key: str) -> Optional[KeyInfo]:
+        """Get a key from the cache, or look it up once however many requests wait for it"""
+        while True:
+            cached = self._cache.get(api_key)
+            if cached is not None and cached[1] > time.monotonic():
+                self._cache.move_to_end(api_key)
+                self._stats["hits" if cached[0] is not None else "negative_hits"] += 1
+                return cached[0]
+
+            pending = self._lookups.get(api_key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except _LookupAbandoned:
+                # The request doing the lookup went away; one waiter takes it over
+                continue
+
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._lookups[api_key] = future
+        try:
+            info = await self._lookup(api_key)
+        except BaseException as e:
+            # Waiters must always be woken: with the error, or, if this
+            # request was cancelled, with a signal to retry the lookup
+            future.set_exception(e if isinstance(e, Exception) else _LookupAbandoned())
+            # Retrieved here so an unawaited future does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._lookups[api_key]
+
+        ttl = settings.API_KEY_CACHE_TTL if info is not None else settings.API_KEY_NEGATIVE_TTL
+        self._cache[api_key] = (info, time.monotonic() + ttl)
+        self._cache.move_to_end(api_key)
+        while len(self._cache) > settings.API_KEY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        future.set_result(info)
+        return info
+
+    async def authenticate(self, api_key: Optional[str]) -> Tuple[KeyInfo, TokenBucket]:
+        """
+        Validate a key and charge one call to its quota
+
+        Args:
+            api_key: Key presented by the client
+
+        Returns:
+            Tuple of (key info, the key's bucket after the charge)
+
+        Raises:
+            AuthError: 401 for a missing or invalid key, 429 when the quota
+                is used up, 503 when keys cannot be checked
+        """
+        if not api_key:
+            raise AuthError(401, "Missing API key (X-API-Key header)", {"WWW-Authenticate": "ApiKey"})
+
+        try:
+            info = await self._resolve(api_key)
+        except Exception as e:
+            logger.error(f"API key lookup failed: {str(e)}")
+            raise AuthError(503, "Authentication is temporarily unavailable", {"Retry-After": "5"})
+
+        if info is None or (info.expires_at is not None and info.expires_at <= datetime.now(timezone.utc)):
+            self._stats["rejected"] += 1
+            raise AuthError(401, "Invalid or expired API key", {"WWW-Authenticate": "ApiKey"})
+
+        bucket = self._buckets.get(info.key_id)
+        if bucket is None or bucket.rate != info.max_calls / settings.API_QUOTA_PERIOD:
+            # New key, or its plan changed since the bucket was made
+            bucket = self._buckets[info.key_id] = TokenBucket(info.max_calls)
+        allowed, retry_after = bucket.take()
+        if not allowed:
+            self._stats["throttled"] += 1
+            raise AuthError(429, "API call quota exceeded", {"Retry-After": str(max(1, round(retry_after)))})
+
+        usage = self._usage.setdefault(info.key_id, [0, None])
+        usage[0] += 1
+        usage[1] = datetime.utcnow()
+        return info, bucket
+
+    async def flush(self) -> int:
+        """
+        Write accumulated usage to api_keys
+
+        Returns:
+            Number of keys updated
+        """
+        if not self._usage:
+            return 0
+        usage, self._usage = self._usage, {}
+        try:
+            updated = await self.db.touch_api_keys(
+                [(key_id, calls, used_at) for key_id, (calls, used_at) in usage.items()]
+            )
+        except Exception:
+            # Merge back so the counts are written next time
+            for key_id, (calls, used_at) in usage.items():
+                current = self._usage.setdefault(key_id, [0, used_at])
+                current[0] += calls
+                current[1] = max(current[1], used_at)
+            raise
+        self._stats["flushed"] += updated
+        return updated
+
+    async def _run(self) -> None:
+        """Flush usage forever"""
+        while True:
+            await asyncio.sleep(settings.API_USAGE_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Flushing API key usage failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start the usage flusher (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write the remaining usage"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Flushing API key usage failed: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get authentication statistics
+
+        Returns:
+            Dictionary with cache, bucket and usage counters
+        """
+        return {
+            **self._stats,
+            "enabled": settings.API_AUTH_ENABLED,
+            "cached_keys": len(self._cache),
+            "buckets": len(self._buckets),
+            "pending_usage": len(self._usage)
+        }
+
+
+# Global authenticator
+authenticator = ApiKeyAuthenticator(database)
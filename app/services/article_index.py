@@ -0,0 +1,65 @@
+"""
+Article filter matching shared by connectors, the aggregator, the store and the percolator
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.models.schemas import NewsArticle
+
+# Fields matched by substring (e.g. "grain" matches the "grains" tag);
+# all other fields match exactly
+SUBSTRING_FIELDS = {"country", "state", "commodity"}
+
+
+def field_values(article: NewsArticle) -> Iterator[Tuple[str, str]]:
+    """Yield the (field, lowercased value) pairs an article is indexed under"""
+    if article.country:
+        yield "country", article.country.lower()
+    if article.state:
+        yield "state", article.state.lower()
+    yield "category", article.category.value
+    for tag in article.commodity_tags:
+        yield "commodity", tag.lower()
+    for ticker in article.tickers:
+        yield "ticker", ticker.lower()
+
+
+def field_matches(field: str, value: str, terms: Iterable[Optional[str]]) -> bool:
+    """
+    Check one filter against the values an article has for that field
+
+    Args:
+        field: country, state, commodity, ticker or category
+        value: Filter value
+        terms: The article's values for the field
+
+    Returns:
+        True if any term matches (substring for SUBSTRING_FIELDS, else exact)
+    """
+    key = value.lower()
+    substring = field in SUBSTRING_FIELDS
+    return any(
+        term and (key in term.lower() if substring else key == term.lower())
+        for term in terms
+    )
+
+
+def article_matches(article: NewsArticle, **filters: Optional[str]) -> bool:
+    """
+    Check a single article against filters
+
+    Args:
+        article: Article to check
+        **filters: field=value pairs; None values are ignored
+
+    Returns:
+        True if the article matches every filter
+    """
+    terms: Dict[str, List[str]] = {}
+    for field, term in field_values(article):
+        terms.setdefault(field, []).append(term)
+
+    return all(
+        field_matches(field, value, terms.get(field, ()))
+        for field, value in filters.items()
+        if value is not None
+    )
+
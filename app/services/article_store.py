@@ -0,0 +1,979 @@
+"""
+Persistent article store fed by background ingestion (SQLite or PostgreSQL)
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from app.config import settings
+from app.models.schemas import NewsArticle, NewsCategory
+from app.services.article_index import article_matches, field_matches
+from app.services.dedup_index import canonicalize_url, content_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Column order shared by inserts and selects
+COLUMNS = (
+    "source", "headline", "summary", "url", "category", "country", "state",
+    "tickers", "commodity_tags", "published_at"
+)
+
+# Columns whose change makes an upsert count as an update (and bumps seq)
+CONTENT_COLUMNS = ("headline", "summary", "category", "country", "state", "tickers", "commodity_tags")
+
+# Rows read per round trip while post-filtering a query
+FETCH_BATCH = 200
+
+# Search result orders: (ORDER BY, keyset condition for rows after the cursor)
+SEARCH_ORDERS = {
+    "relevance": ("score DESC, id ASC", "(score < ? OR (score = ? AND id > ?))"),
+    "recency": ("published_at DESC, id DESC", "(published_at < ? OR (published_at = ? AND id < ?))")
+}
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+# (sort value, row id) of the last result of a page
+SearchKey = List[Any]
+
+# (article_key, seq, article) entry of the change feed
+Change = Tuple[str, int, NewsArticle]
+
+
+def search_terms(text: str) -> List[str]:
+    """Words of a search text; punctuation and operators are ignored"""
+    return _TERM_RE.findall(text.lower())
+
+
+def article_key(article: NewsArticle) -> str:
+    """Stable identity of an article: canonical URL, else content fingerprint"""
+    canonical = canonicalize_url(article.url)
+    return f"u:{canonical}" if canonical else f"c:{content_fingerprint(article.headline)}"
+
+
+def utc_naive(timestamp: datetime) -> datetime:
+    """Store every timestamp as naive UTC so they order correctly"""
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _to_row(article: NewsArticle) -> Tuple[Any, ...]:
+    return (
+        article.source,
+        article.headline,
+        article.summary,
+        article.url,
+        article.category.value,
+        article.country,
+        article.state,
+        json.dumps(article.tickers),
+        json.dumps(article.commodity_tags),
+        utc_naive(article.timestamp)
+    )
+
+
+def _from_row(row: Tuple[Any, ...]) -> NewsArticle:
+    source, headline, summary, url, category, country, state, tickers, tags, published_at = row
+    if isinstance(published_at, str):
+        published_at = datetime.fromisoformat(published_at)
+    return NewsArticle(
+        headline=headline,
+        source=source,
+        category=NewsCategory(category),
+        tickers=json.loads(tickers),
+        country=country,
+        state=state,
+        commodity_tags=json.loads(tags),
+        timestamp=published_at,
+        url=url,
+        summary=summary
+    )
+
+
+def _matches(article: NewsArticle, filters: Dict[str, Optional[str]]) -> bool:
+    """
+    article_matches, except that a commodity also matches the headline or summary
+
+    Live fetches search for the commodity rather than filter on tags, so
+    "wheat" finds a "Wheat prices surge" article tagged only "grains".
+    """
+    commodity = filters.get("commodity")
+    if not article_matches(article, **{f: v for f, v in filters.items() if f != "commodity"}):
+        return False
+    if commodity is None:
+        return True
+    key = commodity.lower()
+    return (
+        field_matches("commodity", commodity, article.commodity_tags)
+        or key in article.headline.lower()
+        or key in (article.summary or "").lower()
+    )
+
+
+def _conditions(
+    filters: Dict[str, Optional[str]],
+    query: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    like: str
+) -> Tuple[List[str], List[Any]]:
+    """
+    Build WHERE conditions (with "?" placeholders) for a store query
+
+    The conditions select a superset of the matching rows: list fields are
+    JSON text, so their LIKE patterns can match across elements. Rows are
+    re-checked with _matches after reading.
+    """
+    conditions: List[str] = []
+    params: List[Any] = []
+
+    if since:
+        conditions.append("published_at >= ?")
+        params.append(utc_naive(since))
+    if until:
+        conditions.append("published_at < ?")
+        params.append(utc_naive(until))
+
+    for field, value in filters.items():
+        if value is None:
+            continue
+        if field == "category":
+            conditions.append("category = ?")
+            params.append(value)
+        elif field in ("country", "state"):
+            conditions.append(f"{field} {like} ?")
+            params.append(f"%{value}%")
+        elif field == "commodity":
+            conditions.append(f"(commodity_tags {like} ? OR headline {like} ? OR summary {like} ?)")
+            params.extend([f"%{value}%"] * 3)
+        elif field == "ticker":
+            conditions.append(f"tickers {like} ?")
+            params.append(f'%"{value}"%')
+
+    for term in (query or "").split():
+        conditions.append(f"(headline {like} ? OR summary {like} ?)")
+        params.extend([f"%{term}%", f"%{term}%"])
+
+    return conditions, params
+
+
+class ArticleStore(ABC):
+    """
+    Durable copy of ingested articles that request handlers read from
+
+    Every article is keyed by article_key and upserted, so re-polling a
+    source is idempotent. Each insert or content change takes the next
+    value of a monotonically increasing seq, which lets readers ask for
+    everything that changed after a point.
+    """
+
+    def __init__(self):
+        self.last_write: Optional[datetime] = None
+        # Ingested source -> its last successful poll (None before the first)
+        self.source_polls: Dict[str, Optional[datetime]] = {}
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Connect, create the schema and load the last write time"""
+        pass
+
+    @abstractmethod
+    async def upsert(self, articles: List[NewsArticle]) -> int:
+        """
+        Insert new articles and update changed ones
+
+        Args:
+            articles: Normalized articles
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        pass
+
+    @abstractmethod
+    async def query(
+        self,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[NewsArticle]:
+        """
+        Get the newest stored articles matching filters
+
+        Args:
+            filters: Resolved filters (see NewsAggregatorService.resolve_filters)
+            query: Words that must all appear in the headline or summary
+            since: Only articles published at or after this time
+            until: Only articles published before this time
+            limit: Maximum number of articles
+
+        Returns:
+            Articles, newest first
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        order: str = "relevance",
+        after: Optional[SearchKey] = None,
+        limit: int = 20
+    ) -> Tuple[List[NewsArticle], Optional[SearchKey]]:
+        """
+        Full-text search over headline and summary
+
+        Args:
+            text: Search text; every word must match (stemmed)
+            filters: Resolved filters (see NewsAggregatorService.resolve_filters)
+            since: Only articles published at or after this time
+            until: Only articles published before this time
+            order: "relevance" (full-text rank) or "recency" (newest first)
+            after: Key returned with the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (articles, key to pass as `after` for the next page or
+            None on the last page)
+        """
+        pass
+
+    @abstractmethod
+    async def changes(
+        self,
+        after_seq: int = 0,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Change], int, bool]:
+        """
+        Get articles added or changed after a point in the feed
+
+        Args:
+            after_seq: Last seq the caller has seen (0 for everything)
+            filters: Resolved filters (see NewsAggregatorService.resolve_filters)
+            limit: Maximum number of changes
+
+        Returns:
+            Tuple of (changes in seq order, seq to resume from, whether more
+            changes are pending)
+        """
+        pass
+
+    @abstractmethod
+    async def record_matches(self, matches: List[Tuple[str, NewsArticle]]) -> int:
+        """
+        Record which saved queries new articles matched (duplicates are ignored)
+
+        Args:
+            matches: (saved_query_id, article) pairs
+
+        Returns:
+            Number of new matches stored
+        """
+        pass
+
+    @abstractmethod
+    async def saved_query_matches(self, saved_query_id: str, limit: int = 20) -> List[NewsArticle]:
+        """
+        Get the articles a saved query matched, most recently matched first
+
+        Args:
+            saved_query_id: Saved query ID
+            limit: Maximum number of articles
+        """
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Number of stored articles"""
+        pass
+
+    async def close(self) -> None:
+        """Release connections"""
+
+    def track_sources(self, sources: Iterable[str]) -> None:
+        """
+        Expect ingestion polls from sources
+
+        A tracked source counts as stale until its first successful poll.
+        """
+        for source in sources:
+            self.source_polls.setdefault(source, None)
+
+    def mark_fresh(self, source: Optional[str] = None) -> None:
+        """
+        Record a successful ingestion poll
+
+        Polls that find nothing new write nothing, yet still show the
+        store is up to date with its sources.
+
+        Args:
+            source: Source that was polled
+        """
+        self.last_write = datetime.utcnow()
+        if source is not None:
+            self.source_polls[source] = self.last_write
+
+    @staticmethod
+    def _recent(timestamp: Optional[datetime], max_age_seconds: Optional[int]) -> bool:
+        if timestamp is None:
+            return False
+        max_age = max_age_seconds if max_age_seconds is not None else settings.ARTICLE_STORE_MAX_AGE
+        return (datetime.utcnow() - timestamp).total_seconds() <= max_age
+
+    def is_fresh(self, max_age_seconds: Optional[int] = None) -> bool:
+        """
+        Check whether ingestion has polled (or written) recently enough to serve reads
+
+        The store stays readable while any source is current; sources
+        that are not are reported by stale_sources.
+
+        Args:
+            max_age_seconds: Allowed age of the last write (defaults to
+                ARTICLE_STORE_MAX_AGE)
+        """
+        return self._recent(self.last_write, max_age_seconds)
+
+    def stale_sources(self, max_age_seconds: Optional[int] = None) -> List[str]:
+        """
+        Get the tracked sources whose last successful poll is too old (or missing)
+
+        Their newest articles may be missing from reads, so store-served
+        responses report them as failed.
+
+        Args:
+            max_age_seconds: Allowed age of a source's last poll (defaults
+                to ARTICLE_STORE_MAX_AGE)
+        """
+        return sorted(
+            source for source, polled in self.source_polls.items()
+            if not self._recent(polled, max_age_seconds)
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with backend, article count, last write time and stale sources
+        """
+        return {
+            "backend": self.__class__.__name__,
+            "articles": await self.count(),
+            "last_write": self.last_write.isoformat() if self.last_write else None,
+            "fresh": self.is_fresh(),
+            "stale_sources": self.stale_sources()
+        }
+
+
+class SQLiteArticleStore(ArticleStore):
+    """
+    Article store in a local SQLite file
+
+    sqlite3 is blocking, so every call runs in a worker thread via
+    asyncio.to_thread; a lock serializes access to the shared connection.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store (the database is opened on first use)
+
+        Args:
+            path: SQLite database path
+        """
+        super().__init__()
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        ).fetchone()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " id INTEGER PRIMARY KEY,"
+            " article_key TEXT NOT NULL UNIQUE,"
+            " seq INTEGER NOT NULL,"
+            " source TEXT NOT NULL,"
+            " headline TEXT NOT NULL,"
+            " summary TEXT,"
+            " url TEXT,"
+            " category TEXT NOT NULL,"
+            " country TEXT,"
+            " state TEXT,"
+            " tickers TEXT NOT NULL,"
+            " commodity_tags TEXT NOT NULL,"
+            " published_at TIMESTAMP NOT NULL,"
+            " ingested_at TIMESTAMP NOT NULL"
+            ");"
+            "CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at DESC);"
+            "CREATE INDEX IF NOT EXISTS idx_articles_seq ON articles (seq);"
+            "CREATE TABLE IF NOT EXISTS saved_query_matches ("
+            " saved_query_id TEXT NOT NULL,"
+            " article_key TEXT NOT NULL,"
+            " matched_at TIMESTAMP NOT NULL,"
+            " PRIMARY KEY (saved_query_id, article_key)"
+            ") WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS idx_saved_query_matches_time ON saved_query_matches (saved_query_id, matched_at DESC);"
+            # External-content FTS5 index over headline and summary, kept in
+            # sync by triggers so upserts need no extra statements
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            " headline, summary, content='articles', content_rowid='id', tokenize='porter unicode61'"
+            ");"
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN"
+            " INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN"
+            " INSERT INTO articles_fts (articles_fts, rowid, headline, summary)"
+            " VALUES ('delete', old.id, old.headline, old.summary);"
+            " END;"
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF headline, summary ON articles BEGIN"
+            " INSERT INTO articles_fts (articles_fts, rowid, headline, summary)"
+            " VALUES ('delete', old.id, old.headline, old.summary);"
+            " INSERT INTO articles_fts (rowid, headline, summary) VALUES (new.id, new.headline, new.summary);"
+            " END;"
+        )
+        if not has_fts:
+            # Index rows stored before the FTS table existed
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+            conn.commit()
+        self._seq, last_write = conn.execute("SELECT COALESCE(MAX(seq), 0), MAX(ingested_at) FROM articles").fetchone()
+        if last_write:
+            self.last_write = datetime.fromisoformat(last_write)
+        self._conn = conn
+        return conn
+
+    def _open(self) -> None:
+        with self._lock:
+            self._connect()
+
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open)
+
+    def _upsert(self, articles: List[NewsArticle]) -> int:
+        now = datetime.utcnow()
+        changed = " OR ".join(f"articles.{column} IS NOT excluded.{column}" for column in CONTENT_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS)
+
+        with self._lock:
+            conn = self._connect()
+            rows = []
+            for article in articles:
+                self._seq += 1
+                rows.append((article_key(article), self._seq, *_to_row(article), now))
+
+            # rowcount, unlike total_changes, leaves out the FTS trigger writes
+            cursor = conn.executemany(
+                f"INSERT INTO articles (article_key, seq, {', '.join(COLUMNS)}, ingested_at)"
+                f" VALUES ({', '.join('?' * (len(COLUMNS) + 3))})"
+                f" ON CONFLICT (article_key) DO UPDATE SET {updates}, seq = excluded.seq,"
+                f" ingested_at = excluded.ingested_at WHERE {changed}",
+                rows
+            )
+            conn.commit()
+            self.last_write = now
+            return cursor.rowcount
+
+    async def upsert(self, articles: List[NewsArticle]) -> int:
+        if not articles:
+            return 0
+        return await asyncio.to_thread(self._upsert, articles)
+
+    def _query(
+        self,
+        filters: Dict[str, Optional[str]],
+        query: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        limit: int
+    ) -> List[NewsArticle]:
+        conditions, params = _conditions(filters, query, since, until, "LIKE")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        articles: List[NewsArticle] = []
+
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT {', '.join(COLUMNS)} FROM articles{where} ORDER BY published_at DESC, seq DESC",
+                params
+            )
+            while len(articles) < limit:
+                rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    article = _from_row(row)
+                    if _matches(article, filters):
+                        articles.append(article)
+            cursor.close()
+
+        return articles[:limit]
+
+    async def query(
+        self,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[NewsArticle]:
+        return await asyncio.to_thread(self._query, filters or {}, query, since, until, limit)
+
+    def _search(
+        self,
+        text: str,
+        filters: Dict[str, Optional[str]],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        order: str,
+        after: Optional[SearchKey],
+        limit: int
+    ) -> Tuple[List[NewsArticle], Optional[SearchKey]]:
+        order_by, keyset = SEARCH_ORDERS[order]
+        conditions, params = _conditions(filters, None, since, until, "LIKE")
+        match = " ".join(f'"{term}"' for term in search_terms(text))
+        # Headline matches weigh twice as much as summary matches
+        inner = (
+            f"SELECT {', '.join(f'a.{column}' for column in COLUMNS)}, a.id AS id,"
+            " -bm25(articles_fts, 2.0, 1.0) AS score"
+            " FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+            f" WHERE {' AND '.join(['articles_fts MATCH ?', *conditions])}"
+        )
+        params = [match, *params]
+
+        where = ""
+        if after:
+            value = datetime.fromisoformat(after[0]) if order == "recency" else after[0]
+            where = f" WHERE {keyset}"
+            params.extend([value, value, after[1]])
+
+        return self._collect(
+            f"SELECT * FROM ({inner}){where} ORDER BY {order_by}", params, filters, order, limit
+        )
+
+    def _collect(
+        self,
+        sql: str,
+        params: List[Any],
+        filters: Dict[str, Optional[str]],
+        order: str,
+        limit: int
+    ) -> Tuple[List[NewsArticle], Optional[SearchKey]]:
+        """Read ranked rows until a page plus one match the filters exactly"""
+        articles: List[NewsArticle] = []
+        keys: List[SearchKey] = []
+
+        with self._lock:
+            cursor = self._connect().execute(sql, params)
+            while len(articles) <= limit:
+                rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    break
+                for row in rows:
+                    article = _from_row(row[:len(COLUMNS)])
+                    if _matches(article, filters):
+                        articles.append(article)
+                        keys.append([article.timestamp.isoformat() if order == "recency" else row[-1], row[-2]])
+            cursor.close()
+
+        if len(articles) > limit:
+            return articles[:limit], keys[limit - 1]
+        return articles, None
+
+    async def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        order: str = "relevance",
+        after: Optional[SearchKey] = None,
+        limit: int = 20
+    ) -> Tuple[List[NewsArticle], Optional[SearchKey]]:
+        return await asyncio.to_thread(self._search, text, filters or {}, since, until, order, after, limit)
+
+    def _changes(
+        self,
+        after_seq: int,
+        filters: Dict[str, Optional[str]],
+        limit: int
+    ) -> Tuple[List[Change], int, bool]:
+        conditions, params = _conditions(filters, None, None, None, "LIKE")
+        changes: List[Change] = []
+        last_seq = after_seq
+        has_more = False
+
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT article_key, seq, {', '.join(COLUMNS)} FROM articles"
+                f" WHERE {' AND '.join(['seq > ?', *conditions])} ORDER BY seq",
+                [after_seq, *params]
+            )
+            while not has_more:
+                rows = cursor.fetchmany(FETCH_BATCH)
+                if not rows:
+                    break
+                for key, seq, *row in rows:
+                    article = _from_row(row)
+                    if _matches(article, filters):
+                        if len(changes) == limit:
+                            has_more = True
+                            break
+                        changes.append((key, seq, article))
+                    # Rows that do not match are consumed too
+                    last_seq = seq
+            cursor.close()
+
+        return changes, last_seq, has_more
+
+    async def changes(
+        self,
+        after_seq: int = 0,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Change], int, bool]:
+        return await asyncio.to_thread(self._changes, after_seq, filters or {}, limit)
+
+
+    def _record_matches(self, matches: List[Tuple[str, NewsArticle]]) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO saved_query_matches (saved_query_id, article_key, matched_at) VALUES (?, ?, ?)",
+                [(query_id, article_key(article), now) for query_id, article in matches]
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    async def record_matches(self, matches: List[Tuple[str, NewsArticle]]) -> int:
+        if not matches:
+            return 0
+        return await asyncio.to_thread(self._record_matches, matches)
+
+    def _saved_query_matches(self, saved_query_id: str, limit: int) -> List[NewsArticle]:
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {', '.join(f'a.{column}' for column in COLUMNS)}"
+                " FROM saved_query_matches m JOIN articles a ON a.article_key = m.article_key"
+                " WHERE m.saved_query_id = ? ORDER BY m.matched_at DESC, a.published_at DESC LIMIT ?",
+                (saved_query_id, limit)
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    async def saved_query_matches(self, saved_query_id: str, limit: int = 20) -> List[NewsArticle]:
+        return await asyncio.to_thread(self._saved_query_matches, saved_query_id, limit)
+
+
+    def _count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    async def count(self) -> int:
+        return await asyncio.to_thread(self._count)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PostgresArticleStore(ArticleStore):
+    """
+    Article store in PostgreSQL (requires the optional asyncpg package)
+
+    seq comes from a database sequence, so several ingesting processes can
+    share one store.
+    """
+
+    # Full-text document; headline matches weigh more than summary matches
+    TSVECTOR = (
+        "(setweight(to_tsvector('english', headline), 'A')"
+        " || setweight(to_tsvector('english', COALESCE(summary, '')), 'B'))"
+    )
+
+    def __init__(self, dsn: str):
+        """
+        Initialize the store (the pool is created on first use)
+
+        Args:
+            dsn: PostgreSQL connection URL
+        """
+        super().__init__()
+        self.dsn = dsn
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        async with self._pool_lock:
+            if self._pool is None:
+                try:
+                    import asyncpg
+                except ImportError:
+                    raise RuntimeError("PostgreSQL article store requires asyncpg (pip install asyncpg)")
+
+                self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=5)
+                async with self._pool.acquire() as conn:
+                    await conn.execute(
+                        "CREATE SEQUENCE IF NOT EXISTS article_seq;"
+                        "CREATE TABLE IF NOT EXISTS articles ("
+                        " id BIGSERIAL PRIMARY KEY,"
+                        " article_key TEXT NOT NULL UNIQUE,"
+                        " seq BIGINT NOT NULL DEFAULT nextval('article_seq'),"
+                        " source TEXT NOT NULL,"
+                        " headline TEXT NOT NULL,"
+                        " summary TEXT,"
+                        " url TEXT,"
+                        " category TEXT NOT NULL,"
+                        " country TEXT,"
+                        " state TEXT,"
+                        " tickers TEXT NOT NULL,"
+                        " commodity_tags TEXT NOT NULL,"
+                        " published_at TIMESTAMP NOT NULL,"
+                        " ingested_at TIMESTAMP NOT NULL"
+                        ");"
+                        "CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at DESC);"
+                        "CREATE INDEX IF NOT EXISTS idx_articles_seq ON articles (seq);"
+                        # saved_queries itself comes from database/schema.sql
+                        "CREATE TABLE IF NOT EXISTS saved_query_matches ("
+                        " saved_query_id UUID NOT NULL,"
+                        " article_key TEXT NOT NULL,"
+                        " matched_at TIMESTAMP NOT NULL,"
+                        " PRIMARY KEY (saved_query_id, article_key)"
+                        ");"
+                        "CREATE INDEX IF NOT EXISTS idx_saved_query_matches_time"
+                        " ON saved_query_matches (saved_query_id, matched_at DESC);"
+                        f"CREATE INDEX IF NOT EXISTS idx_articles_fts ON articles USING GIN ({self.TSVECTOR});"
+                    )
+                    self.last_write = await conn.fetchval("SELECT MAX(ingested_at) FROM articles")
+        return self._pool
+
+    async def open(self) -> None:
+        await self._get_pool()
+
+    @staticmethod
+    def _numbered(sql: str) -> str:
+        """Turn "?" placeholders into asyncpg's $1, $2, ..."""
+        parts = sql.split("?")
+        return "".join(f"{part}${i}" for i, part in enumerate(parts[:-1], 1)) + parts[-1]
+
+    async def upsert(self, articles: List[NewsArticle]) -> int:
+        if not articles:
+            return 0
+
+        now = datetime.utcnow()
+        changed = " OR ".join(f"articles.{column} IS DISTINCT FROM excluded.{column}" for column in CONTENT_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS)
+        sql = self._numbered(
+            f"INSERT INTO articles (article_key, {', '.join(COLUMNS)}, ingested_at)"
+            f" VALUES ({', '.join('?' * (len(COLUMNS) + 2))})"
+            f" ON CONFLICT (article_key) DO UPDATE SET {updates}, seq = nextval('article_seq'),"
+            f" ingested_at = excluded.ingested_at WHERE {changed}"
+            " RETURNING 1"
+        )
+
+        pool = await self._get_pool()
+        written = 0
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # Writers take turns so seq values become visible in order and
+                # change feed readers never skip a row committed late
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('article_seq'))")
+                for article in articles:
+                    if await conn.fetchval(sql, article_key(article), *_to_row(article), now):
+                        written += 1
+
+        self.last_write = now
+        return written
+
+    async def query(
+        self,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20
+    ) -> List[NewsArticle]:
+        filters = filters or {}
+        conditions, params = _conditions(filters, query, since, until, "ILIKE")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = self._numbered(
+            f"SELECT {', '.join(COLUMNS)} FROM articles{where} ORDER BY published_at DESC, seq DESC"
+        )
+
+        pool = await self._get_pool()
+        articles: List[NewsArticle] = []
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for record in conn.cursor(sql, *params, prefetch=FETCH_BATCH):
+                    article = _from_row(tuple(record))
+                    if _matches(article, filters):
+                        articles.append(article)
+                        if len(articles) >= limit:
+                            break
+
+        return articles
+
+    async def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        order: str = "relevance",
+        after: Optional[SearchKey] = None,
+        limit: int = 20
+    ) -> Tuple[List[NewsArticle], Optional[SearchKey]]:
+        filters = filters or {}
+        order_by, keyset = SEARCH_ORDERS[order]
+        conditions, params = _conditions(filters, None, since, until, "ILIKE")
+        match = f"{self.TSVECTOR} @@ plainto_tsquery('english', ?)"
+        inner = (
+            f"SELECT {', '.join(COLUMNS)}, id,"
+            f" ts_rank({self.TSVECTOR}, plainto_tsquery('english', ?)) AS score"
+            f" FROM articles WHERE {' AND '.join([match, *conditions])}"
+        )
+        terms = " ".join(search_terms(text))
+        params = [terms, terms, *params]
+
+        where = ""
+        if after:
+            value = datetime.fromisoformat(after[0]) if order == "recency" else after[0]
+            where = f" WHERE {keyset}"
+            params.extend([value, value, after[1]])
+
+        sql = self._numbered(f"SELECT * FROM ({inner}) AS ranked{where} ORDER BY {order_by}")
+        pool = await self._get_pool()
+        articles: List[NewsArticle] = []
+        keys: List[SearchKey] = []
+
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for record in conn.cursor(sql, *params, prefetch=FETCH_BATCH):
+                    row = tuple(record)
+                    article = _from_row(row[:len(COLUMNS)])
+                    if _matches(article, filters):
+                        articles.append(article)
+                        keys.append([article.timestamp.isoformat() if order == "recency" else row[-1], row[-2]])
+                        if len(articles) > limit:
+                            break
+
+        if len(articles) > limit:
+            return articles[:limit], keys[limit - 1]
+        return articles, None
+
+    async def changes(
+        self,
+        after_seq: int = 0,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        limit: int = 100
+    ) -> Tuple[List[Change], int, bool]:
+        filters = filters or {}
+        conditions, params = _conditions(filters, None, None, None, "ILIKE")
+        sql = self._numbered(
+            f"SELECT article_key, seq, {', '.join(COLUMNS)} FROM articles"
+            f" WHERE {' AND '.join(['seq > ?', *conditions])} ORDER BY seq"
+        )
+
+        pool = await self._get_pool()
+        changes: List[Change] = []
+        last_seq = after_seq
+        has_more = False
+
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for record in conn.cursor(sql, after_seq, *params, prefetch=FETCH_BATCH):
+                    key, seq, *row = tuple(record)
+                    article = _from_row(tuple(row))
+                    if _matches(article, filters):
+                        if len(changes) == limit:
+                            has_more = True
+                            break
+                        changes.append((key, seq, article))
+                    last_seq = seq
+
+        return changes, last_seq, has_more
+
+    async def record_matches(self, matches: List[Tuple[str, NewsArticle]]) -> int:
+        if not matches:
+            return 0
+
+        now = datetime.utcnow()
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "INSERT INTO saved_query_matches (saved_query_id, article_key, matched_at)"
+                " SELECT * FROM unnest($1::uuid[], $2::text[], $3::timestamp[])"
+                " ON CONFLICT DO NOTHING RETURNING 1",
+                [query_id for query_id, _ in matches],
+                [article_key(article) for _, article in matches],
+                [now] * len(matches)
+            )
+        return len(rows)
+
+    async def saved_query_matches(self, saved_query_id: str, limit: int = 20) -> List[NewsArticle]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT {', '.join(f'a.{column}' for column in COLUMNS)}"
+                " FROM saved_query_matches m JOIN articles a ON a.article_key = m.article_key"
+                " WHERE m.saved_query_id = $1::uuid ORDER BY m.matched_at DESC, a.published_at DESC LIMIT $2",
+                saved_query_id,
+                limit
+            )
+        return [_from_row(tuple(row)) for row in rows]
+
+    async def count(self) -> int:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchval("SELECT COUNT(*) FROM articles")
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+def create_article_store(url: Optional[str] = None) -> ArticleStore:
+    """
+    Create the store for a URL
+
+    Args:
+        url: "sqlite:///path/to/file.db" or "postgresql://..." (defaults to
+            ARTICLE_STORE_URL)
+
+    Returns:
+        ArticleStore for the URL's backend
+    """
+    url = url or settings.ARTICLE_STORE_URL
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresArticleStore(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteArticleStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported ARTICLE_STORE_URL: {url}")
+
+
+# Global article store
+article_store = create_article_store()
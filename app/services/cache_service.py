@@ -24,6 +24,17 @@ class CacheService:
             "misses": 0,
             "sets": 0
         }
+        # Key prefix (text before the first "_") -> hits and misses
+        self._prefix_stats: Dict[str, Dict[str, int]] = {}
+    
+    def _count(self, key: str, result: str) -> None:
+        """Count a hit or miss overall and for the key's prefix (lock held)"""
+        self._stats[result] += 1
+        prefix = key.split("_", 1)[0]
+        counts = self._prefix_stats.get(prefix)
+        if counts is None:
+            counts = self._prefix_stats[prefix] = {"hits": 0, "misses": 0}
+        counts[result] += 1
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -37,7 +48,7 @@ class CacheService:
         """
         with self._lock:
             if key not in self._cache:
-                self._stats["misses"] += 1
+                self._count(key, "misses")
                 return None
             
             entry = self._cache[key]
@@ -45,10 +56,10 @@ class CacheService:
             # Check if expired
             if datetime.utcnow() > entry["expires_at"]:
                 del self._cache[key]
-                self._stats["misses"] += 1
+                self._count(key, "misses")
                 return None
             
-            self._stats["hits"] += 1
+            self._count(key, "hits")
             return entry["value"]
     
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
@@ -108,9 +119,26 @@ class CacheService:
                 "misses": self._stats["misses"],
                 "sets": self._stats["sets"],
                 "hit_rate": round(hit_rate, 2),
-                "cache_size": len(self._cache)
+                "cache_size": len(self._cache),
+                "prefixes": {
+                    prefix: {
+                        **counts,
+                        "hit_rate": round(counts["hits"] / (counts["hits"] + counts["misses"]) * 100, 2)
+                    }
+                    for prefix, counts in self._prefix_stats.items()
+                }
             }
     
+    def get_prefix_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get hits and misses per key prefix
+        
+        Returns:
+            Dictionary of prefix -> {"hits": ..., "misses": ...}
+        """
+        with self._lock:
+            return {prefix: dict(counts) for prefix, counts in self._prefix_stats.items()}
+    
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries
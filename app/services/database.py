@@ -0,0 +1,233 @@
+"""
+PostgreSQL data access for the account tables (users, api_keys, subscriptions)
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+import asyncio
+import logging
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Hot queries run on every authenticated request. They are module constants
+# so each pooled connection prepares them once and reuses the statement from
+# its cache (DATABASE_STATEMENT_CACHE_SIZE) on every later call.
+API_KEY_LOOKUP = (
+    "SELECT k.id AS key_id, k.user_id, k.is_active AND u.is_active AS is_active, k.expires_at,"
+    " s.plan_type, s.status AS subscription_status, s.end_date, s.max_api_calls, s.features"
+    " FROM api_keys k"
+    " JOIN users u ON u.id = k.user_id"
+    " LEFT JOIN LATERAL ("
+    "  SELECT plan_type, status, end_date, max_api_calls, features FROM subscriptions"
+    "  WHERE user_id = k.user_id AND status IN ('active', 'trial')"
+    "  AND (end_date IS NULL OR end_date > NOW())"
+    "  ORDER BY start_date DESC LIMIT 1"
+    " ) s ON TRUE"
+    " WHERE k.api_key = $1"
+)
+SUBSCRIPTION_LOOKUP = (
+    "SELECT plan_type, status, start_date, end_date, trial_ends_at, max_api_calls, max_data_sources, features"
+    " FROM subscriptions"
+    " WHERE user_id = $1::uuid AND status IN ('active', 'trial')"
+    " AND (end_date IS NULL OR end_date > NOW())"
+    " ORDER BY start_date DESC LIMIT 1"
+)
+USER_LOOKUP = (
+    "SELECT id, email, full_name, company, job_title, is_active, is_verified, created_at, last_login"
+    " FROM users WHERE id = $1::uuid"
+)
+
+
+class DatabaseUnavailableError(RuntimeError):
+    """Raised when DATABASE_URL is unset or the pool is not connected"""
+
+
+class _TimedAcquire:
+    """Times pool.acquire() for the pool statistics"""
+
+    def __init__(self, database: "Database"):
+        self.database = database
+        self.context = None
+
+    async def __aenter__(self):
+        database = self.database
+        if database._pool is None:
+            raise DatabaseUnavailableError("Database pool is not connected")
+
+        started = time.perf_counter()
+        self.context = database._pool.acquire(timeout=settings.DATABASE_ACQUIRE_TIMEOUT)
+        try:
+            connection = await self.context.__aenter__()
+        except asyncio.TimeoutError:
+            database._stats["acquire_timeouts"] += 1
+            raise
+        waited = time.perf_counter() - started
+        database._stats["acquired"] += 1
+        database._stats["wait_seconds"] += waited
+        database._stats["max_wait_seconds"] = max(database._stats["max_wait_seconds"], waited)
+        return connection
+
+    async def __aexit__(self, *exc_info):
+        return await self.context.__aexit__(*exc_info)
+
+
+class Database:
+    """
+    Pooled asyncpg access to the account tables in database/schema.sql
+
+    The pool is opened and closed with the application (see main.py) and
+    sized by DATABASE_POOL_MIN/MAX. Every acquire is timed, so get_stats()
+    reports pool occupancy alongside acquire counts and wait times.
+    """
+
+    def __init__(self, dsn: Optional[str] = None):
+        """
+        Initialize the data-access layer (connect() opens the pool)
+
+        Args:
+            dsn: PostgreSQL connection URL (defaults to DATABASE_URL; empty disables it)
+        """
+        self.dsn = dsn if dsn is not None else settings.DATABASE_URL
+        self._pool = None
+        self._stats = {"acquired": 0, "acquire_timeouts": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.dsn)
+
+    @property
+    def connected(self) -> bool:
+        return self._pool is not None
+
+    async def connect(self) -> None:
+        """
+        Open the connection pool
+
+        Raises:
+            DatabaseUnavailableError: If DATABASE_URL is unset or asyncpg is missing
+        """
+        if self._pool is not None:
+            return
+        if not self.enabled:
+            raise DatabaseUnavailableError("DATABASE_URL is not set")
+        try:
+            import asyncpg
+        except ImportError:
+            raise DatabaseUnavailableError("The database layer requires asyncpg (pip install asyncpg)")
+
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=settings.DATABASE_POOL_MIN,
+            max_size=settings.DATABASE_POOL_MAX,
+            command_timeout=settings.DATABASE_COMMAND_TIMEOUT,
+            statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE
+        )
+        logger.info(
+            f"Database pool open ({settings.DATABASE_POOL_MIN}-{settings.DATABASE_POOL_MAX} connections)"
+        )
+
+    async def close(self) -> None:
+        """Close the pool, waiting for connections in use to be released"""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    def acquire(self) -> _TimedAcquire:
+        """
+        Borrow a pooled connection: `async with database.acquire() as conn:`
+
+        Raises:
+            DatabaseUnavailableError: If the pool is not connected
+            asyncio.TimeoutError: If no connection frees up within DATABASE_ACQUIRE_TIMEOUT
+        """
+        return _TimedAcquire(self)
+
+    async def get_api_key(self, api_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an API key with its owner's current subscription
+
+        Args:
+            api_key: Key presented by the client
+
+        Returns:
+            Dictionary with key_id, user_id, is_active (key and user), expires_at
+            and the plan fields (None when there is no current subscription),
+            or None for an unknown key
+        """
+        async with self.acquire() as conn:
+            row = await conn.fetchrow(API_KEY_LOOKUP, api_key)
+        return dict(row) if row is not None else None
+
+    async def get_active_subscription(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's current (active or trial, not ended) subscription
+
+        Returns:
+            Subscription fields, or None without a current subscription
+        """
+        async with self.acquire() as conn:
+            row = await conn.fetchrow(SUBSCRIPTION_LOOKUP, user_id)
+        return dict(row) if row is not None else None
+
+    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a user's account fields (no password hash), or None"""
+        async with self.acquire() as conn:
+            row = await conn.fetchrow(USER_LOOKUP, user_id)
+        return dict(row) if row is not None else None
+
+    async def touch_api_keys(self, used: List[Tuple[str, int, datetime]]) -> int:
+        """
+        Add usage to a batch of API keys in one statement
+
+        Args:
+            used: (key_id, calls, last used at in naive UTC) tuples
+
+        Returns:
+            Number of keys updated
+        """
+        if not used:
+            return 0
+        async with self.acquire() as conn:
+            result = await conn.execute(
+                "UPDATE api_keys SET usage_count = usage_count + t.calls,"
+                " last_used_at = GREATEST(api_keys.last_used_at, t.used_at)"
+                " FROM unnest($1::uuid[], $2::bigint[], $3::timestamptz[]) AS t(id, calls, used_at)"
+                " WHERE api_keys.id = t.id",
+                [key_id for key_id, _, _ in used],
+                [calls for _, calls, _ in used],
+                [used_at.replace(tzinfo=timezone.utc) for _, _, used_at in used]
+            )
+        return int(result.split()[-1])
+
+    async def ping(self) -> bool:
+        """Check the database answers"""
+        async with self.acquire() as conn:
+            return await conn.fetchval("SELECT 1") == 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics
+
+        Returns:
+            Dictionary with pool size, idle connections, acquire counts and wait times
+        """
+        stats: Dict[str, Any] = {
+            "enabled": self.enabled,
+            "connected": self.connected,
+            **self._stats,
+            "avg_wait_ms": round(self._stats["wait_seconds"] / self._stats["acquired"] * 1000, 3)
+            if self._stats["acquired"] else 0.0
+        }
+        if self._pool is not None:
+            stats.update(
+                size=self._pool.get_size(),
+                idle=self._pool.get_idle_size(),
+                min_size=self._pool.get_min_size(),
+                max_size=self._pool.get_max_size()
+            )
+        return stats
+
+
+# Global data-access layer
+database = Database()
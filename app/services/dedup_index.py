@@ -0,0 +1,338 @@
+"""
+Persistent cross-request dedup index (Bloom filter + SQLite exact store)
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import threading
+from app.config import settings
+from app.models.schemas import NewsArticle
+from app.utils.normalizer import headline_tokens
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the click, not the content
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid",
+    "ocid", "ito", "source", "utm_id"
+}
+
+# Recently recorded keys kept in memory for I/O-free checks in connectors
+RECENT_KEYS = 50000
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """
+    Normalize a URL so syndicated/tracked links to the same page compare equal
+
+    Lowercases scheme and host, drops "www.", fragments, tracking parameters
+    and trailing slashes, and sorts the remaining query parameters.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        Canonical URL or None if empty
+    """
+    if not url:
+        return None
+
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit(((parts.scheme or "http").lower(), host, path, urlencode(query), ""))
+
+
+def content_fingerprint(headline: Optional[str]) -> str:
+    """
+    Fingerprint an article's content independent of case, punctuation and word order
+
+    Args:
+        headline: Article headline
+
+    Returns:
+        Hex digest of the normalized headline words
+    """
+    normalized = " ".join(sorted(headline_tokens(headline)))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def dedup_key(url: Optional[str], headline: Optional[str]) -> str:
+    """
+    Index key for an article: content fingerprint plus canonical URL
+
+    Both parts must match, so a reused URL with a new headline, or a
+    generic headline ("Market update") on a new page, is not taken for an
+    article already ingested.
+    """
+    return f"a:{content_fingerprint(headline)}|{canonicalize_url(url) or ''}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        """Add a key"""
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DedupIndex:
+    """
+    Remembers which articles have already been ingested, across requests and restarts
+
+    Every article is keyed by its content fingerprint and canonical URL
+    (see dedup_key), and is remembered for DEDUP_INDEX_TTL_DAYS. The Bloom
+    filter answers "definitely new" without touching disk; only possible
+    hits are confirmed against the SQLite exact store. sqlite3 is blocking,
+    so lookups and writes run in a worker thread via asyncio.to_thread; a
+    lock serializes access to the shared connection. Keys recorded lately
+    are also kept in memory, so connectors can skip articles seen by recent
+    polls without any I/O.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        error_rate: float = 0.01
+    ):
+        """
+        Initialize the index (the database is opened on first use)
+
+        Args:
+            path: SQLite database path (defaults to DEDUP_INDEX_PATH)
+            capacity: Initial Bloom filter capacity (defaults to DEDUP_BLOOM_CAPACITY)
+            error_rate: Bloom filter false positive rate
+        """
+        self.path = path or settings.DEDUP_INDEX_PATH
+        self.capacity = capacity or settings.DEDUP_BLOOM_CAPACITY
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+        # key -> first_seen of recently recorded keys, oldest first
+        self._recent: "OrderedDict[str, datetime]" = OrderedDict()
+
+        self._stats = {
+            "bloom_negatives": 0,
+            "exact_hits": 0,
+            "false_positives": 0,
+            "recent_hits": 0,
+            "added": 0,
+            "expired": 0
+        }
+
+    @staticmethod
+    def _cutoff() -> datetime:
+        """Keys first seen before this have expired"""
+        return datetime.utcnow() - timedelta(days=settings.DEDUP_INDEX_TTL_DAYS)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_items ("
+            " key TEXT PRIMARY KEY,"
+            " first_seen TIMESTAMP NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.commit()
+        self._conn = conn
+        self._rebuild(self.capacity)
+        return conn
+
+    def _rebuild(self, capacity: int) -> None:
+        """Drop expired keys (and keys of older formats), then reload the Bloom filter"""
+        conn = self._conn
+        expired = conn.execute(
+            "DELETE FROM seen_items WHERE first_seen < ? OR key NOT LIKE 'a:%'",
+            (self._cutoff(),)
+        ).rowcount
+        conn.commit()
+        self._stats["expired"] += expired
+
+        stored = conn.execute("SELECT COUNT(*) FROM seen_items").fetchone()[0]
+        self._bloom = BloomFilter(max(capacity, stored * 2), self.error_rate)
+        for (key,) in conn.execute("SELECT key FROM seen_items"):
+            self._bloom.add(key)
+        logger.info(f"Dedup index loaded {stored} keys from {self.path} ({expired} expired)")
+
+    def _contains(self, key: str, cutoff: datetime) -> bool:
+        """Check a key against the Bloom filter, then the exact store"""
+        if key not in self._bloom:
+            self._stats["bloom_negatives"] += 1
+            return False
+
+        row = self._conn.execute(
+            "SELECT 1 FROM seen_items WHERE key = ? AND first_seen >= ?",
+            (key, cutoff)
+        ).fetchone()
+
+        if row:
+            self._stats["exact_hits"] += 1
+            return True
+
+        self._stats["false_positives"] += 1
+        return False
+
+    def recently_seen(self, url: Optional[str], headline: Optional[str]) -> bool:
+        """
+        Check an article against the keys recorded lately, without I/O
+
+        False does not mean the article is new; filter_unseen has the
+        final say.
+
+        Args:
+            url: Article URL
+            headline: Article headline
+
+        Returns:
+            True if the article was recorded within DEDUP_INDEX_TTL_DAYS
+        """
+        first_seen = self._recent.get(dedup_key(url, headline))
+        if first_seen is None or first_seen < self._cutoff():
+            return False
+        self._stats["recent_hits"] += 1
+        return True
+
+    def _filter_unseen(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        cutoff = self._cutoff()
+        with self._lock:
+            self._connect()
+            return [
+                article for article in articles
+                if not self._contains(dedup_key(article.url, article.headline), cutoff)
+            ]
+
+    async def filter_unseen(self, articles: List[NewsArticle]) -> List[NewsArticle]:
+        """
+        Drop already-ingested articles
+
+        Args:
+            articles: Candidate articles
+
+        Returns:
+            Articles not yet in the index
+        """
+        if not articles:
+            return []
+        return await asyncio.to_thread(self._filter_unseen, articles)
+
+    def _add_many(self, keys: List[str]) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            conn = self._connect()
+            # Expired rows are taken over, so the key is remembered afresh
+            cursor = conn.executemany(
+                "INSERT INTO seen_items (key, first_seen) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET first_seen = excluded.first_seen"
+                " WHERE seen_items.first_seen < ?",
+                [(key, now, self._cutoff()) for key in keys]
+            )
+            conn.commit()
+            added = cursor.rowcount
+
+            for key in keys:
+                self._bloom.add(key)
+                self._recent[key] = now
+                self._recent.move_to_end(key)
+            while len(self._recent) > RECENT_KEYS:
+                self._recent.popitem(last=False)
+            self._stats["added"] += added
+
+            # Keep the false positive rate bounded as the index grows
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+
+        return added
+
+    async def add_many(self, items: Iterable[Tuple[Optional[str], Optional[str]]]) -> int:
+        """
+        Record articles as ingested in one transaction
+
+        Call only once the articles are stored, so a failed write leaves
+        them to be picked up by the next poll.
+
+        Args:
+            items: (url, headline) pairs
+
+        Returns:
+            Number of new keys stored
+        """
+        keys = list(dict.fromkeys(dedup_key(url, headline) for url, headline in items))
+        if not keys:
+            return 0
+        return await asyncio.to_thread(self._add_many, keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with lookup counters and Bloom filter sizing
+        """
+        with self._lock:
+            bloom = self._bloom
+            return {
+                **self._stats,
+                "recent_keys": len(self._recent),
+                "bloom_capacity": bloom.capacity if bloom else None,
+                "bloom_items": bloom.count if bloom else 0,
+                "bloom_bits": bloom.size if bloom else None,
+                "bloom_hashes": bloom.hash_count if bloom else None
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,233 @@
+"""
+In-process event bus for pushing new data to subscribed clients
+"""
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from collections import deque
+from datetime import datetime
+import asyncio
+import logging
+import secrets
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Event types published by the background pollers
+EVENT_TYPES = ("news", "weather_alert")
+
+
+class BusEvent:
+    """One published change"""
+
+    __slots__ = ("seq", "type", "products", "commodities", "data", "timestamp")
+
+    def __init__(self, seq: int, event_type: str, products: Set[str], commodities: Set[str], data: Dict[str, Any]):
+        self.seq = seq
+        self.type = event_type
+        self.products = products
+        self.commodities = commodities
+        self.data = data
+        self.timestamp = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "type": self.type,
+            "timestamp": self.timestamp.isoformat(),
+            "data": self.data
+        }
+
+
+class Interest:
+    """What a client wants to hear about; empty sets match everything"""
+
+    def __init__(
+        self,
+        types: Optional[Iterable[str]] = None,
+        products: Optional[Iterable[str]] = None,
+        commodities: Optional[Iterable[str]] = None
+    ):
+        self.types = {t.lower() for t in types or ()}
+        self.products = {p.lower() for p in products or ()}
+        self.commodities = {c.lower() for c in commodities or ()}
+
+    def matches(self, event: BusEvent) -> bool:
+        if self.types and event.type not in self.types:
+            return False
+        if not self.products and not self.commodities:
+            return True
+        # Products are free-form ("wheat"), so they match commodity tags too
+        return bool(
+            self.products & event.products
+            or self.commodities & event.commodities
+            or self.products & event.commodities
+        )
+
+
+class Subscriber:
+    """A waiting client: receives matching events into a bounded queue"""
+
+    def __init__(self, interest: Interest, max_pending: int = 1000):
+        self.interest = interest
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def offer(self, event: BusEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client fell behind; it must resync (e.g. via /news/changes)
+            self.overflowed = True
+
+
+class EventBus:
+    """
+    Fan-out of new data to subscribers, with a replay buffer
+
+    Events get increasing sequence numbers and are kept in a ring buffer,
+    so a long-polling client that reconnects with its last seq receives
+    what it missed. Subscribers are indexed by the event types they want;
+    a publish only visits subscribers for that type (plus those that want
+    every type), so publishing does not wake every connected client.
+    """
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        """
+        Initialize the bus
+
+        Args:
+            buffer_size: Events kept for replay (defaults to SUBSCRIBE_BUFFER_SIZE)
+        """
+        # Identifies this bus instance; cursors from another process or an
+        # earlier run are answered with a reset
+        self.bus_id = secrets.token_hex(4)
+        self._buffer: deque = deque(maxlen=buffer_size or settings.SUBSCRIBE_BUFFER_SIZE)
+        self._seq = 0
+        self._by_type: Dict[str, Set[Subscriber]] = {}
+        self._all_types: Set[Subscriber] = set()
+        self._published = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(
+        self,
+        event_type: str,
+        data: Dict[str, Any],
+        products: Optional[Iterable[str]] = None,
+        commodities: Optional[Iterable[str]] = None
+    ) -> BusEvent:
+        """
+        Publish an event to matching subscribers
+
+        Args:
+            event_type: Event type (see EVENT_TYPES)
+            data: JSON-serializable payload
+            products: Products/tickers the event concerns
+            commodities: Commodity tags the event concerns
+
+        Returns:
+            The published event
+        """
+        self._seq += 1
+        event = BusEvent(
+            self._seq,
+            event_type,
+            {p.lower() for p in products or ()},
+            {c.lower() for c in commodities or ()},
+            data
+        )
+        self._buffer.append(event)
+        self._published += 1
+
+        for subscriber in self._all_types | self._by_type.get(event_type, set()):
+            if subscriber.interest.matches(event):
+                subscriber.offer(event)
+
+        return event
+
+    def subscribe(self, interest: Interest) -> Subscriber:
+        """Register a subscriber; call unsubscribe when the client leaves"""
+        subscriber = Subscriber(interest)
+        if interest.types:
+            for event_type in interest.types:
+                self._by_type.setdefault(event_type, set()).add(subscriber)
+        else:
+            self._all_types.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._all_types.discard(subscriber)
+        for event_type in subscriber.interest.types:
+            subscribers = self._by_type.get(event_type)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._by_type[event_type]
+
+    def replay(self, after_seq: int, interest: Interest) -> Tuple[List[BusEvent], bool]:
+        """
+        Get buffered events after a sequence number
+
+        Returns:
+            Tuple of (matching events, complete); complete is False when
+            events after after_seq have already left the buffer
+        """
+        complete = not self._buffer or self._buffer[0].seq <= after_seq + 1
+        return [e for e in self._buffer if e.seq > after_seq and interest.matches(e)], complete
+
+    async def wait(
+        self,
+        after_seq: int,
+        interest: Interest,
+        timeout: float
+    ) -> Tuple[List[BusEvent], bool]:
+        """
+        Long-poll: return events after a sequence number, waiting for one if needed
+
+        Args:
+            after_seq: Last sequence number the client has seen
+            interest: What the client subscribed to
+            timeout: Seconds to wait when nothing is pending
+
+        Returns:
+            Tuple of (matching events, complete) as in replay
+        """
+        # Register before replaying so nothing published in between is lost
+        subscriber = self.subscribe(interest)
+        try:
+            events, complete = self.replay(after_seq, interest)
+            if events or not complete:
+                return events, complete
+
+            try:
+                first = await asyncio.wait_for(subscriber.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return [], True
+
+            # Let events published in the same burst ride along
+            events = [first]
+            while not subscriber.queue.empty():
+                events.append(subscriber.queue.get_nowait())
+            return events, not subscriber.overflowed
+        finally:
+            self.unsubscribe(subscriber)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get bus statistics
+
+        Returns:
+            Dictionary with sequence, buffer and subscriber counts
+        """
+        return {
+            "bus_id": self.bus_id,
+            "last_seq": self._seq,
+            "published": self._published,
+            "buffered": len(self._buffer),
+            "subscribers": len(self._all_types | set().union(*self._by_type.values()))
+        }
+
+
+# Global event bus
+event_bus = EventBus()
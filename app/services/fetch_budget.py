@@ -0,0 +1,174 @@
+"""
+Adaptive per-source fetch budgets based on observed yield
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import math
+import threading
+from app.config import settings
+
+# Weight of the newest observation in the yield moving average
+YIELD_ALPHA = 0.3
+# Yield assumed for a source that has not been observed yet
+PRIOR_YIELD = 0.5
+# Largest change the feedback loop may apply to a correction per request
+MAX_STEP = 2.0
+# Bounds of the correction applied to the target result count
+MIN_CORRECTION = 0.5
+MAX_CORRECTION = 4.0
+
+Key = Tuple[str, str, str]
+
+
+class FetchBudgetTracker:
+    """
+    Sizes each connector's request from the share of its articles that survive
+
+    Yield (articles kept after filtering and dedup / articles requested) is
+    tracked per source, category and product as an exponentially weighted
+    moving average, falling back to coarser keys when a combination is new.
+    Budgets go to the highest-yield sources first until the expected number
+    of kept articles covers the target. A per-query correction, adjusted by
+    at most MAX_STEP per request, compensates when the plan systematically
+    over- or undershoots.
+    """
+
+    def __init__(
+        self,
+        min_budget: Optional[int] = None,
+        max_budget: Optional[int] = None
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            min_budget: Smallest per-source request (defaults to FETCH_BUDGET_MIN);
+                keeps low-yield sources observed
+            max_budget: Largest per-source request (defaults to FETCH_BUDGET_MAX)
+        """
+        self.min_budget = min_budget if min_budget is not None else settings.FETCH_BUDGET_MIN
+        self.max_budget = max_budget if max_budget is not None else settings.FETCH_BUDGET_MAX
+        self._yields: Dict[Key, float] = {}
+        self._corrections: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(source: str, category: Optional[str], product: Optional[str]) -> List[Key]:
+        """Keys from most to least specific"""
+        category = category or "overview"
+        product = (product or "*").lower()
+        return [(source, category, product), (source, category, "*"), (source, "*", "*")]
+
+    def expected_yield(self, source: str, category: Optional[str] = None, product: Optional[str] = None) -> float:
+        """
+        Get the estimated yield of a source
+
+        Returns:
+            Share of requested articles expected to be kept (0-1)
+        """
+        with self._lock:
+            for key in self._keys(source, category, product):
+                if key in self._yields:
+                    return self._yields[key]
+        return PRIOR_YIELD
+
+    def plan(
+        self,
+        sources: List[str],
+        target: int,
+        category: Optional[str] = None,
+        product: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Size per-source requests to reach a target result count
+
+        Args:
+            sources: Source names to plan for
+            target: Number of articles the caller needs
+            category: Requested category
+            product: Requested product/commodity
+
+        Returns:
+            Dictionary of source -> number of articles to request
+        """
+        with self._lock:
+            correction = self._corrections.get((category or "overview", (product or "*").lower()), 1.0)
+
+        yields = {source: self.expected_yield(source, category, product) for source in sources}
+        need = target * correction
+        budgets = {}
+
+        for source in sorted(sources, key=lambda s: yields[s], reverse=True):
+            expected = max(yields[source], 0.01)
+            budget = math.ceil(need / expected) if need > 0 else 0
+            budget = min(max(budget, self.min_budget), self.max_budget)
+            budgets[source] = budget
+            need -= budget * expected
+
+        return budgets
+
+    def record(
+        self,
+        source: str,
+        requested: int,
+        kept: int,
+        category: Optional[str] = None,
+        product: Optional[str] = None
+    ) -> None:
+        """
+        Record how many of a source's requested articles were kept
+
+        Args:
+            source: Source name
+            requested: Articles requested from the source
+            kept: Articles that survived filtering and dedup
+        """
+        if requested <= 0:
+            return
+
+        observed = min(kept / requested, 1.0)
+        with self._lock:
+            for key in self._keys(source, category, product):
+                previous = self._yields.get(key, observed)
+                self._yields[key] = (1 - YIELD_ALPHA) * previous + YIELD_ALPHA * observed
+
+    def record_outcome(
+        self,
+        target: int,
+        delivered: int,
+        category: Optional[str] = None,
+        product: Optional[str] = None
+    ) -> None:
+        """
+        Adjust the correction for a query after a request
+
+        Args:
+            target: Articles the caller needed
+            delivered: Articles actually available after filtering and dedup
+        """
+        if target <= 0:
+            return
+
+        ratio = target / max(delivered, 1)
+        step = min(max(ratio, 1 / MAX_STEP), MAX_STEP)
+        key = (category or "overview", (product or "*").lower())
+
+        with self._lock:
+            correction = self._corrections.get(key, 1.0) * step
+            self._corrections[key] = min(max(correction, MIN_CORRECTION), MAX_CORRECTION)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get tracked yields and corrections
+
+        Returns:
+            Dictionary with per-key yields and corrections
+        """
+        with self._lock:
+            return {
+                "yields": {"/".join(key): round(value, 3) for key, value in self._yields.items()},
+                "corrections": {"/".join(key): round(value, 3) for key, value in self._corrections.items()}
+            }
+
+
+# Global fetch budget tracker
+fetch_budget = FetchBudgetTracker()
@@ -0,0 +1,325 @@
+"""
+Background ingestion: scheduled workers polling connectors into the article store
+"""
+from typing import Dict, Any, List, Optional, Set
+from datetime import datetime
+import asyncio
+import logging
+import random
+from app.config import settings
+from app.models.schemas import NewsArticle, SourceType
+from app.services.aggregator import NewsAggregatorService
+from app.services.account_store import AccountStore, account_store
+from app.services.alert_engine import SEVERITY_LEVELS, AlertEngine, alert_engine
+from app.services.article_store import ArticleStore, article_key, article_store
+from app.services.dedup_index import DedupIndex
+from app.services.event_bus import EventBus, event_bus
+from app.services.percolator import Percolator, percolator
+from app.services.price_service import PriceService
+from app.services.weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between polls of a failing source
+MAX_BACKOFF_SECONDS = 3600
+
+
+class IngestionService:
+    """
+    Runs one polling loop per connector and upserts what it finds
+
+    Each loop polls its source for every configured query, stores the new
+    articles, then sleeps for the poll interval (with jitter, so sources do
+    not fire in lockstep). A source that fails every query backs off
+    exponentially up to MAX_BACKOFF_SECONDS. New articles, and weather
+    alerts from a separate loop, are published on the event bus, and new
+    articles are matched against users' saved queries by the percolator.
+    Weather alerts and commodity prices also feed the user alert engine.
+    """
+
+    def __init__(
+        self,
+        store: ArticleStore,
+        accounts: Optional[AccountStore] = None,
+        aggregator: Optional[NewsAggregatorService] = None,
+        bus: Optional[EventBus] = None,
+        matcher: Optional[Percolator] = None,
+        alerts: Optional[AlertEngine] = None,
+        queries: Optional[List[str]] = None,
+        interval_seconds: Optional[int] = None,
+        limit_per_poll: Optional[int] = None
+    ):
+        """
+        Initialize the service
+
+        Args:
+            store: Store the articles are written to
+            accounts: Store the saved queries and alerts are read from (defaults
+                to the global account store)
+            aggregator: Aggregator in ingestion mode (defaults to one with
+                a DedupIndex, so each poll only returns unseen articles)
+            bus: Event bus new data is published on
+            matcher: Percolator new articles are matched with
+            alerts: Alert engine fed with price and weather ticks
+            queries: Search queries polled on every source (defaults to INGEST_QUERIES)
+            interval_seconds: Seconds between polls of a source (defaults to INGEST_INTERVAL)
+            limit_per_poll: Articles requested per source and query (defaults to INGEST_LIMIT)
+        """
+        self.store = store
+        self.accounts = accounts if accounts is not None else account_store
+        self._aggregator = aggregator
+        self.bus = bus
+        self.percolator = matcher
+        self.alerts = alerts
+        self.weather_service = WeatherService()
+        self.price_service = PriceService()
+        self._active_alerts: Set[str] = set()
+        self.queries = queries if queries is not None else settings.INGEST_QUERIES
+        self.interval = interval_seconds or settings.INGEST_INTERVAL
+        self.limit = limit_per_poll or settings.INGEST_LIMIT
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def aggregator(self) -> NewsAggregatorService:
+        # Created lazily so the dedup index is only opened when ingesting
+        if self._aggregator is None:
+            self._aggregator = NewsAggregatorService(dedup_index=DedupIndex())
+        return self._aggregator
+
+    async def poll(self, source: SourceType) -> int:
+        """
+        Poll one source for every query and store the results
+
+        Args:
+            source: Source to poll
+
+        Returns:
+            Number of rows inserted or changed
+
+        Raises:
+            RuntimeError: If every query failed
+        """
+        stats = self._stats.setdefault(source.value, {"polls": 0, "stored": 0, "errors": 0})
+        stored = 0
+        errors = []
+
+        for query in self.queries or [None]:
+            articles, error = await self.aggregator.fetch_from_source(
+                source=source,
+                query=query,
+                limit=self.limit
+            )
+            if error:
+                errors.append(error)
+                continue
+            stored += await self.store.upsert(articles)
+            # Only stored articles count as ingested; a failed write is retried next poll
+            await self.aggregator.record_ingested(articles)
+            self.store.mark_fresh(source.value)
+            self._publish_articles(articles)
+            await self._percolate(articles)
+
+        stats["polls"] += 1
+        stats["stored"] += stored
+        stats["last_poll"] = datetime.utcnow().isoformat()
+
+        if errors and len(errors) == len(self.queries or [None]):
+            stats["errors"] += 1
+            stats["last_error"] = errors[-1]
+            raise RuntimeError(errors[-1])
+
+        return stored
+
+    def _publish_articles(self, articles: List[NewsArticle]) -> None:
+        """Announce newly ingested articles to subscribers"""
+        if self.bus is None:
+            return
+        for article in articles:
+            self.bus.publish(
+                "news",
+                {"key": article_key(article), "article": article.model_dump(mode="json")},
+                products=article.tickers,
+                commodities=article.commodity_tags
+            )
+
+    async def _percolate(self, articles: List[NewsArticle]) -> None:
+        """Record which saved queries the new articles match"""
+        if self.percolator is None or not articles:
+            return
+        try:
+            if self.percolator.is_stale():
+                self.percolator.load(await self.accounts.load_saved_queries())
+            await self.store.record_matches(self.percolator.match_many(articles))
+        except Exception as e:
+            # Matching is best effort; it must not fail the poll
+            logger.error(f"Saved query matching failed: {str(e)}")
+
+    async def poll_weather_alerts(self) -> int:
+        """
+        Fetch active weather alerts and publish the ones not seen before
+
+        Returns:
+            Number of new alerts
+        """
+        alerts = await self.weather_service.get_weather_alerts()
+        commodities = {
+            region["commodity"].lower() for region in self.weather_service.agricultural_regions.values()
+        }
+        if self.alerts is not None:
+            await self._refresh_alerts()
+            commodities.update(self.alerts.commodities("weather_alert"))
+        severities = dict.fromkeys(commodities, 0.0)
+        active = set()
+        new = 0
+
+        for alert in alerts:
+            alert_id = alert.get("id") or f"{alert.get('region')}|{alert.get('threat')}|{alert.get('start_time')}"
+            active.add(alert_id)
+            description = alert.get("description", "").lower()
+            mentioned = [commodity for commodity in commodities if commodity in description]
+            severity = SEVERITY_LEVELS.get(alert.get("severity"), 0.0)
+            for commodity in mentioned:
+                severities[commodity] = max(severities[commodity], severity)
+            if alert_id in self._active_alerts or self.bus is None:
+                continue
+            self.bus.publish("weather_alert", alert, commodities=mentioned)
+            new += 1
+
+        # Only alerts still active are remembered, so the set stays small
+        self._active_alerts = active
+
+        if self.alerts is not None:
+            # NOAA only covers the United States
+            for commodity, severity in severities.items():
+                self.alerts.tick("weather_alert", commodity, severity, country="United States")
+            try:
+                await self.alerts.flush(self.accounts)
+            except Exception as e:
+                logger.error(f"Writing triggered alerts failed: {str(e)}")
+        return new
+
+    async def _refresh_alerts(self) -> None:
+        """Reload active user alerts when the engine's copy is stale"""
+        if not self.alerts.is_stale():
+            return
+        try:
+            self.alerts.load(await self.accounts.load_alerts())
+        except Exception as e:
+            # Keep evaluating the alerts loaded last time
+            logger.error(f"Loading user alerts failed: {str(e)}")
+
+    async def poll_prices(self) -> int:
+        """
+        Fetch prices for commodities with price_change alerts and evaluate them
+
+        Returns:
+            Number of alerts fired
+        """
+        await self._refresh_alerts()
+        commodities = self.alerts.commodities("price_change")
+        if not commodities:
+            return 0
+
+        # PriceService symbols are keyed by capitalized names ("Wheat")
+        prices = await self.price_service.get_commodity_prices([c.capitalize() for c in commodities])
+        fired = 0
+        for name, quote in prices.items():
+            try:
+                change = abs(float(quote.get("change_percent", 0)))
+            except (TypeError, ValueError):
+                continue
+            fired += len(self.alerts.tick("price_change", name, change))
+        await self.alerts.flush(self.accounts)
+        return fired
+
+    async def _run_prices(self) -> None:
+        """Poll prices for alert evaluation forever"""
+        interval = settings.PRICE_UPDATE_INTERVAL
+        while True:
+            try:
+                fired = await self.poll_prices()
+                logger.info(f"Price alerts fired: {fired}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Price alert polling failed: {str(e)}")
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+    async def _run_weather_alerts(self) -> None:
+        """Poll weather alerts forever"""
+        interval = settings.WEATHER_UPDATE_INTERVAL
+        while True:
+            try:
+                new = await self.poll_weather_alerts()
+                logger.info(f"Published {new} new weather alerts")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Weather alert polling failed: {str(e)}")
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+    async def _run(self, source: SourceType) -> None:
+        """Poll a source forever"""
+        failures = 0
+        # Spread the first polls out as well
+        await asyncio.sleep(random.uniform(0, min(self.interval, 10)))
+
+        while True:
+            try:
+                stored = await self.poll(source)
+                failures = 0
+                logger.info(f"Ingested {stored} articles from {source.value}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                logger.error(f"Ingestion from {source.value} failed: {str(e)}")
+
+            delay = min(self.interval * 2 ** failures, MAX_BACKOFF_SECONDS)
+            await asyncio.sleep(delay * random.uniform(0.9, 1.1))
+
+    def start(self) -> None:
+        """Start one worker per connector plus the weather alert and price pollers (no-op if already running)"""
+        self.store.track_sources(source.value for source in self.aggregator.connectors)
+        for source in self.aggregator.connectors:
+            task = self._tasks.get(source.value)
+            if task is None or task.done():
+                self._tasks[source.value] = asyncio.create_task(self._run(source))
+        if self.bus is not None or self.alerts is not None:
+            task = self._tasks.get("weather_alerts")
+            if task is None or task.done():
+                self._tasks["weather_alerts"] = asyncio.create_task(self._run_weather_alerts())
+        if self.alerts is not None:
+            task = self._tasks.get("prices")
+            if task is None or task.done():
+                self._tasks["prices"] = asyncio.create_task(self._run_prices())
+        logger.info(f"Ingestion started for {len(self._tasks)} sources every {self.interval}s")
+
+    async def stop(self) -> None:
+        """Cancel all workers and wait for them to finish"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion statistics
+
+        Returns:
+            Dictionary with worker state and per-source poll counters
+        """
+        return {
+            "running": any(not task.done() for task in self._tasks.values()),
+            "interval_seconds": self.interval,
+            "queries": self.queries,
+            "sources": self._stats,
+            "percolator": self.percolator.get_stats() if self.percolator else None,
+            "alerts": self.alerts.get_stats() if self.alerts else None
+        }
+
+
+# Global ingestion service
+ingestion = IngestionService(article_store, account_store, bus=event_bus, matcher=percolator, alerts=alert_engine)
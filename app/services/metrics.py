@@ -0,0 +1,233 @@
+"""
+Request and upstream metrics in the Prometheus text exposition format
+"""
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+import logging
+import time
+import httpx
+from app.config import settings
+from app.services.admission import admission
+from app.services.cache_service import cache
+from app.services.tracing import KIND_CLIENT, span
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[str, ...]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: observe() is a bisect and two additions
+
+    Counts are kept per bucket and made cumulative only when rendered.
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # One count per bound plus the +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f"{name}=\"{_escape(str(value))}\"" for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """
+    Collects HTTP and upstream metrics and renders them for Prometheus
+
+    Recording touches plain dictionaries, counters and pre-bucketed
+    histograms without locks: every update happens on the event-loop
+    thread, between awaits. Gauges that other services already track
+    (admission in-flight and waiting requests, loop lag, cache hit
+    ratios) are read from them when /metrics is scraped.
+    """
+
+    def __init__(self):
+        # (method, route) -> latency histogram
+        self.requests: Dict[Labels, Histogram] = {}
+        # (method, route, status) -> responses
+        self.responses: Dict[Labels, int] = {}
+        self.inflight = 0
+        # (upstream, host) -> latency histogram; (upstream, host, reason) -> errors
+        self.upstream: Dict[Labels, Histogram] = {}
+        self.upstream_errors: Dict[Labels, int] = {}
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        """Record a served request by route template"""
+        histogram = self.requests.get((method, route))
+        if histogram is None:
+            histogram = self.requests[(method, route)] = Histogram(REQUEST_BUCKETS)
+        histogram.observe(seconds)
+        key = (method, route, str(status))
+        self.responses[key] = self.responses.get(key, 0) + 1
+
+    def observe_upstream(self, upstream: str, host: str, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Record a call to an upstream API
+
+        Args:
+            upstream: Connector or service making the call
+            host: Host called
+            seconds: Time to the response (or the failure)
+            error: Failure reason (exception name or http_<status>), None on success
+        """
+        histogram = self.upstream.get((upstream, host))
+        if histogram is None:
+            histogram = self.upstream[(upstream, host)] = Histogram(UPSTREAM_BUCKETS)
+        histogram.observe(seconds)
+        if error is not None:
+            key = (upstream, host, error)
+            self.upstream_errors[key] = self.upstream_errors.get(key, 0) + 1
+
+    @staticmethod
+    def _family(lines: List[str], name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    @staticmethod
+    def _samples(lines: List[str], name: str, names: Sequence[str], samples: Dict[Labels, float]) -> None:
+        for values, value in sorted(samples.items()):
+            lines.append(f"{name}{_labels(names, values)} {_number(value)}")
+
+    @staticmethod
+    def _histograms(lines: List[str], name: str, names: Sequence[str], histograms: Dict[Labels, Histogram]) -> None:
+        for values, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(list(histogram.bounds) + [float("inf")], histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(list(names) + ['le'], list(values) + [_number(bound)])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, values)} {_number(histogram.sum)}")
+            lines.append(f"{name}_count{_labels(names, values)} {cumulative}")
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format (version 0.0.4)
+
+        Returns:
+            Exposition text, ending with a newline
+        """
+        lines: List[str] = []
+
+        self._family(lines, "http_request_duration_seconds", "histogram", "Request latency by route template.")
+        self._histograms(lines, "http_request_duration_seconds", ("method", "route"), self.requests)
+        self._family(lines, "http_responses_total", "counter", "Responses by route template and status code.")
+        self._samples(lines, "http_responses_total", ("method", "route", "status"), self.responses)
+        self._family(lines, "http_requests_in_flight", "gauge", "Requests being served.")
+        lines.append(f"http_requests_in_flight {self.inflight}")
+
+        self._family(lines, "upstream_request_duration_seconds", "histogram", "Upstream API latency to response headers.")
+        self._histograms(lines, "upstream_request_duration_seconds", ("upstream", "host"), self.upstream)
+        self._family(lines, "upstream_errors_total", "counter", "Failed upstream API calls by reason.")
+        self._samples(lines, "upstream_errors_total", ("upstream", "host", "reason"), self.upstream_errors)
+
+        admission_stats = admission.get_stats()
+        self._family(lines, "event_loop_lag_seconds", "gauge", "Smoothed event-loop lag.")
+        lines.append(f"event_loop_lag_seconds {_number(admission.lag_ms / 1000)}")
+        self._family(lines, "admission_in_flight", "gauge", "Admitted requests running, by priority class.")
+        self._samples(lines, "admission_in_flight", ("class",), {(k,): v for k, v in admission_stats["inflight"].items()})
+        self._family(lines, "admission_waiting", "gauge", "Requests queued for admission.")
+        lines.append(f"admission_waiting {admission_stats['waiting']}")
+        for outcome in ("admitted", "queued", "shed"):
+            name = f"admission_{outcome}_total"
+            self._family(lines, name, "counter", f"Requests {outcome} by admission control, by priority class.")
+            self._samples(lines, name, ("class",), {(k,): v for k, v in admission_stats[outcome].items()})
+
+        prefixes = cache.get_prefix_stats()
+        self._family(lines, "cache_requests_total", "counter", "Response cache lookups by key prefix and result.")
+        self._samples(lines, "cache_requests_total", ("prefix", "result"), {
+            (prefix, result): count
+            for prefix, counts in prefixes.items()
+            for result, count in (("hit", counts["hits"]), ("miss", counts["misses"]))
+        })
+        self._family(lines, "cache_hit_ratio", "gauge", "Response cache hit ratio by key prefix.")
+        self._samples(lines, "cache_hit_ratio", ("prefix",), {
+            (prefix,): counts["hits"] / (counts["hits"] + counts["misses"])
+            for prefix, counts in prefixes.items()
+            if counts["hits"] + counts["misses"]
+        })
+        self._family(lines, "cache_entries", "gauge", "Entries in the response cache.")
+        lines.append(f"cache_entries {cache.get_stats()['cache_size']}")
+
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that records each call's latency and failures per
+    upstream and host, and traces it as a client span
+    """
+
+    def __init__(self, upstream: str, **kwargs):
+        """
+        Args:
+            upstream: Connector or service name the calls are recorded under
+            **kwargs: Passed to httpx.AsyncHTTPTransport
+        """
+        self.upstream = upstream
+        self._transport = httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        started = time.perf_counter()
+        with span(
+            f"http.{self.upstream}", KIND_CLIENT,
+            **{"http.request.method": request.method, "server.address": host}
+        ) as client_span:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except Exception as e:
+                metrics.observe_upstream(self.upstream, host, time.perf_counter() - started, type(e).__name__)
+                raise
+            if client_span is not None:
+                client_span.attributes["http.response.status_code"] = response.status_code
+        error = f"http_{response.status_code}" if response.status_code >= 400 else None
+        metrics.observe_upstream(self.upstream, host, time.perf_counter() - started, error)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http_client(upstream: str, **kwargs) -> httpx.AsyncClient:
+    """
+    httpx.AsyncClient whose calls are recorded under an upstream name
+
+    Args:
+        upstream: Connector or service name ('perplexity', 'weather', ...)
+        **kwargs: Passed to httpx.AsyncClient
+
+    Returns:
+        Client to use as `async with http_client("weather", timeout=10.0) as client:`
+    """
+    if not settings.METRICS_ENABLED:
+        return httpx.AsyncClient(**kwargs)
+    return httpx.AsyncClient(transport=InstrumentedTransport(upstream), **kwargs)
+
+
+# Global metrics registry
+metrics = Metrics()
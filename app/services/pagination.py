@@ -0,0 +1,332 @@
+"""
+Cursor-based pagination over the merged news stream
+"""
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import base64
+import hashlib
+import heapq
+import json
+import logging
+import math
+import secrets
+import time
+from app.config import settings
+from app.models.schemas import NewsArticle
+from app.services.aggregator import NewsAggregatorService
+from app.utils.normalizer import ArticleDeduplicator
+
+logger = logging.getLogger(__name__)
+
+# (timestamp, tie-breaker): total newest-first order of the merged stream
+OrderKey = Tuple[datetime, str]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the request"""
+
+
+class CursorExpiredError(Exception):
+    """Raised when a cursor's snapshot is gone; paging must restart from the first page"""
+
+
+def _order_key(article: NewsArticle) -> OrderKey:
+    """Sort key giving articles with equal timestamps a stable order"""
+    tiebreak = hashlib.blake2b(
+        f"{article.source}|{article.url or ''}|{article.headline}".encode("utf-8"),
+        digest_size=8
+    ).hexdigest()
+    return article.timestamp, tiebreak
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """Encode cursor state as an opaque URL-safe token"""
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def query_fingerprint(**params: Any) -> str:
+    """Identify the query parameters a cursor belongs to"""
+    raw = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def decode_token(cursor: str) -> Dict[str, Any]:
+    """
+    Decode any token produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the token is not an encoded JSON object
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("cursor must encode an object")
+        return data
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a news stream cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the token is malformed
+    """
+    data = decode_token(cursor)
+    try:
+        if not isinstance(data["s"], str):
+            raise ValueError("snapshot id must be a string")
+        if not isinstance(data["p"], list) or not all(isinstance(p, int) and p >= 0 for p in data["p"]):
+            raise ValueError("positions must be a list of offsets")
+        return data
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+
+
+def decode_search_cursor(cursor: str, order: str) -> Dict[str, Any]:
+    """
+    Decode a search cursor, whose "k" is the (sort value, row id) key of
+    the last result: an ISO timestamp for recency order, a score for relevance
+
+    Raises:
+        InvalidCursorError: If the token or its key is malformed
+    """
+    data = decode_token(cursor)
+    try:
+        key = data["k"]
+        if not isinstance(key, list) or len(key) != 2:
+            raise ValueError("key must be a (value, id) pair")
+        value, row_id = key
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            raise ValueError("key id must be an integer")
+        if order == "recency":
+            datetime.fromisoformat(value)
+        elif not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+            raise ValueError("key score must be a number")
+        return data
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+
+
+def _walk(source: int, stream: List[NewsArticle], start: int) -> Iterator[Tuple[OrderKey, int, int, NewsArticle]]:
+    for position in range(start, len(stream)):
+        article = stream[position]
+        yield _order_key(article), source, position, article
+
+
+def _merge(streams: List[List[NewsArticle]], positions: List[int]) -> Iterator[Tuple[OrderKey, int, int, NewsArticle]]:
+    """Merge per-source streams from the given positions, newest first"""
+    return heapq.merge(
+        *(_walk(source, stream, start) for source, (stream, start) in enumerate(zip(streams, positions))),
+        key=lambda entry: entry[0],
+        reverse=True
+    )
+
+
+class SnapshotCache:
+    """
+    Merged snapshots by id: an LRU bounded by size, with a TTL per entry
+
+    Kept apart from the response cache so paging through many queries
+    cannot grow it without bound or push other entries out.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        """
+        Args:
+            max_entries: Snapshots kept; the least recently used go first
+            ttl_seconds: Snapshot lifetime
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        # snapshot id -> (snapshot, monotonic expiry)
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def get(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Get a live snapshot, marking it recently used"""
+        entry = self._entries.get(snapshot_id)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[snapshot_id]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(snapshot_id)
+        self._stats["hits"] += 1
+        return entry[0]
+
+    def put(self, snapshot_id: str, snapshot: Dict[str, Any]) -> None:
+        """Store a snapshot, evicting expired ones and then the least recently used"""
+        now = time.monotonic()
+        self._entries[snapshot_id] = (snapshot, now + self.ttl)
+        self._entries.move_to_end(snapshot_id)
+        # Entries share one TTL, so the oldest are also the first to expire
+        while self._entries and next(iter(self._entries.values()))[1] <= now:
+            self._entries.popitem(last=False)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evicted"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get snapshot cache statistics
+
+        Returns:
+            Dictionary with entry count, limits and hit/miss/eviction counters
+        """
+        return {**self._stats, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class NewsPaginator:
+    """
+    Serves the merged multi-source stream page by page
+
+    The first page fans out to all connectors and keeps the per-source
+    result lists as a snapshot. A cursor records the snapshot and how far
+    each source list has been consumed, so later pages resume the merge
+    without another fan-out. Once the snapshot has expired or been evicted
+    the cursor cannot be resumed reliably (sources re-fetched later return
+    a different set), so paging must restart from the first page.
+    """
+
+    def __init__(
+        self,
+        aggregator: NewsAggregatorService,
+        snapshots: Optional[SnapshotCache] = None
+    ):
+        """
+        Initialize the paginator
+
+        Args:
+            aggregator: Aggregator used for fan-outs
+            snapshots: Snapshot store (defaults to one sized by
+                NEWS_SNAPSHOT_MAX_ENTRIES with a NEWS_SNAPSHOT_TTL lifetime)
+        """
+        self.aggregator = aggregator
+        if snapshots is None:
+            snapshots = SnapshotCache(settings.NEWS_SNAPSHOT_MAX_ENTRIES, settings.NEWS_SNAPSHOT_TTL)
+        self.snapshots = snapshots
+
+    async def _snapshot(
+        self,
+        fingerprint: str,
+        query: Optional[str],
+        country: Optional[str],
+        commodity: Optional[str],
+        limit_per_source: int,
+        deduplicate: bool,
+        filters: Optional[Dict[str, Optional[str]]]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Fan out to all sources and cache the filtered, ordered per-source lists"""
+        streams, successful_sources, failed_sources = await self.aggregator.fetch_streams(
+            query=query,
+            country=country,
+            commodity=commodity,
+            limit_per_source=limit_per_source,
+            filters=filters
+        )
+        streams = [sorted(stream, key=_order_key, reverse=True) for stream in streams]
+
+        if deduplicate:
+            # Drop later near-duplicates so every page of the snapshot is unique
+            deduplicator = ArticleDeduplicator()
+            kept: List[List[NewsArticle]] = [[] for _ in streams]
+            for _, source, _, article in _merge(streams, [0] * len(streams)):
+                if deduplicator.add(article):
+                    kept[source].append(article)
+            streams = kept
+
+        snapshot_id = secrets.token_urlsafe(9)
+        snapshot = {
+            "fingerprint": fingerprint,
+            "streams": streams,
+            "sources_used": successful_sources,
+            "failed_sources": failed_sources
+        }
+        self.snapshots.put(snapshot_id, snapshot)
+
+        return snapshot_id, snapshot
+
+    async def page(
+        self,
+        page_size: int,
+        cursor: Optional[str] = None,
+        query: Optional[str] = None,
+        country: Optional[str] = None,
+        commodity: Optional[str] = None,
+        limit_per_source: int = 10,
+        deduplicate: bool = True,
+        filters: Optional[Dict[str, Optional[str]]] = None
+    ) -> Tuple[List[NewsArticle], Optional[str], List[str], List[str]]:
+        """
+        Get one page of the merged stream
+
+        Args:
+            page_size: Articles per page
+            cursor: Cursor from the previous page (None for the first page)
+            query: Search query
+            country: Country passed to connectors
+            commodity: Commodity passed to connectors
+            limit_per_source: Articles fetched per source for the snapshot
+            deduplicate: Drop near-duplicate headlines
+            filters: Keyword arguments for filter_articles
+
+        Returns:
+            Tuple of (articles, next_cursor, successful_sources, failed_sources);
+            next_cursor is None on the last page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for
+                different query parameters
+            CursorExpiredError: If the cursor's snapshot has expired
+        """
+        fingerprint = query_fingerprint(
+            query=query,
+            country=country,
+            commodity=commodity,
+            limit_per_source=limit_per_source,
+            deduplicate=deduplicate,
+            filters=filters
+        )
+
+        if cursor:
+            state = decode_cursor(cursor)
+            if state.get("f") != fingerprint:
+                raise InvalidCursorError("Cursor does not match the query parameters")
+
+            snapshot_id = state["s"]
+            snapshot = self.snapshots.get(snapshot_id)
+            if snapshot is None:
+                raise CursorExpiredError("Cursor has expired; request the first page again")
+            if len(state["p"]) != len(snapshot["streams"]):
+                raise InvalidCursorError("Invalid cursor: malformed positions")
+            positions = state["p"]
+        else:
+            snapshot_id, snapshot = await self._snapshot(
+                fingerprint, query, country, commodity, limit_per_source, deduplicate, filters
+            )
+            positions = [0] * len(snapshot["streams"])
+
+        positions = list(positions)
+        articles: List[NewsArticle] = []
+        has_more = False
+
+        for _, source, position, article in _merge(snapshot["streams"], positions):
+            if len(articles) >= page_size:
+                has_more = True
+                break
+            positions[source] = position + 1
+            articles.append(article)
+
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor({"s": snapshot_id, "p": positions, "f": fingerprint})
+
+        return articles, next_cursor, snapshot["sources_used"], snapshot["failed_sources"]
@@ -0,0 +1,174 @@
+"""
+Saved-query percolator: matches new articles against users' stored queries
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from datetime import datetime
+import logging
+from app.config import settings
+from app.models.schemas import NewsArticle
+from app.services.aggregator import NewsAggregatorService
+from app.services.article_index import SUBSTRING_FIELDS, field_values, article_matches
+from app.services.article_store import search_terms
+
+logger = logging.getLogger(__name__)
+
+# Predicates a saved query is indexed under, most selective first
+ANCHOR_FIELDS = ("ticker", "commodity", "country", "category")
+
+# (saved_query_id, article) pair produced by matching
+Match = Tuple[str, NewsArticle]
+
+
+class SavedQuery:
+    """A saved query compiled into resolved filters and search terms"""
+
+    __slots__ = ("id", "user_id", "filters", "terms")
+
+    def __init__(self, query_id: str, user_id: Optional[str], params: Dict[str, Any]):
+        self.id = query_id
+        self.user_id = user_id
+        ticker = params.get("ticker") or (params["product"].upper() if params.get("product") else None)
+        self.filters = {
+            field: value
+            for field, value in NewsAggregatorService.resolve_filters(
+                country=params.get("country"),
+                state=params.get("state"),
+                commodity=params.get("commodity"),
+                ticker=ticker,
+                category=params.get("category")
+            ).items()
+            if value is not None
+        }
+        self.terms = search_terms(params.get("query") or "")
+
+    def matches(self, article: NewsArticle, text: Optional[str] = None) -> bool:
+        """Check every predicate of the query against an article"""
+        if not article_matches(article, **self.filters):
+            return False
+        if self.terms:
+            text = text if text is not None else f"{article.headline} {article.summary or ''}".lower()
+            return all(term in text for term in self.terms)
+        return True
+
+
+class Percolator:
+    """
+    Reverse index from query predicates to saved queries
+
+    Each saved query is filed under one anchor predicate (the most selective
+    of ticker, commodity, country and category it has). An article looks up
+    only the queries anchored on its own values and verifies those, instead
+    of evaluating every saved query. Substring fields (commodity, country)
+    scan the small vocabulary of anchor values.
+    Queries without any anchor predicate are checked against every article.
+    """
+
+    def __init__(self):
+        self._anchors: Dict[str, Dict[str, List[SavedQuery]]] = {field: {} for field in ANCHOR_FIELDS}
+        self._unanchored: List[SavedQuery] = []
+        self._count = 0
+        self.loaded_at: Optional[datetime] = None
+        self._stats = {"articles": 0, "candidates": 0, "matches": 0}
+
+    def load(self, rows: Iterable[Tuple[str, Optional[str], Dict[str, Any]]]) -> int:
+        """
+        Replace the index with a new set of saved queries
+
+        Args:
+            rows: (id, user_id, query_params) tuples
+
+        Returns:
+            Number of queries indexed
+        """
+        anchors: Dict[str, Dict[str, List[SavedQuery]]] = {field: {} for field in ANCHOR_FIELDS}
+        unanchored: List[SavedQuery] = []
+        count = 0
+
+        for query_id, user_id, params in rows:
+            try:
+                saved = SavedQuery(str(query_id), user_id and str(user_id), params or {})
+            except Exception as e:
+                logger.warning(f"Skipping saved query {query_id}: {str(e)}")
+                continue
+
+            count += 1
+            field = next((f for f in ANCHOR_FIELDS if f in saved.filters), None)
+            if field is None:
+                unanchored.append(saved)
+            else:
+                anchors[field].setdefault(saved.filters[field].lower(), []).append(saved)
+
+        self._anchors, self._unanchored, self._count = anchors, unanchored, count
+        self.loaded_at = datetime.utcnow()
+        return count
+
+    def is_stale(self) -> bool:
+        """Whether saved queries should be reloaded (PERCOLATOR_REFRESH_SECONDS)"""
+        if self.loaded_at is None:
+            return True
+        return (datetime.utcnow() - self.loaded_at).total_seconds() > settings.PERCOLATOR_REFRESH_SECONDS
+
+    def _candidates(self, article: NewsArticle) -> Dict[str, SavedQuery]:
+        """Saved queries anchored on one of the article's values"""
+        candidates: Dict[str, SavedQuery] = {}
+        for field, value in field_values(article):
+            postings = self._anchors.get(field)
+            if not postings:
+                continue
+            if field in SUBSTRING_FIELDS:
+                hits = [queries for key, queries in postings.items() if key in value]
+            else:
+                hits = [postings.get(value, ())]
+            for queries in hits:
+                for saved in queries:
+                    candidates[saved.id] = saved
+        for saved in self._unanchored:
+            candidates[saved.id] = saved
+        return candidates
+
+    def match(self, article: NewsArticle) -> List[SavedQuery]:
+        """
+        Find the saved queries an article satisfies
+
+        Args:
+            article: Newly ingested article
+
+        Returns:
+            Matching saved queries
+        """
+        candidates = self._candidates(article)
+        text = f"{article.headline} {article.summary or ''}".lower()
+        matched = [saved for saved in candidates.values() if saved.matches(article, text)]
+
+        self._stats["articles"] += 1
+        self._stats["candidates"] += len(candidates)
+        self._stats["matches"] += len(matched)
+        return matched
+
+    def match_many(self, articles: Iterable[NewsArticle]) -> List[Match]:
+        """
+        Match a batch of articles
+
+        Returns:
+            (saved_query_id, article) pairs
+        """
+        return [(saved.id, article) for article in articles for saved in self.match(article)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get percolator statistics
+
+        Returns:
+            Dictionary with indexed query counts and match counters
+        """
+        return {
+            **self._stats,
+            "queries": self._count,
+            "unanchored": len(self._unanchored),
+            "anchors": {field: len(postings) for field, postings in self._anchors.items()},
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None
+        }
+
+
+# Global percolator
+percolator = Percolator()
@@ -1,17 +1,86 @@
-import httpx
 import asyncio
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
 import logging
+import time
+from app.config import settings
 from .config_service import config
+from .metrics import http_client
 
 logger = logging.getLogger(__name__)
 
+# Commodities Alpha Vantage is asked for; the rest only come from Yahoo Finance
+ALPHA_VANTAGE_SYMBOLS = {
+    'Wheat': 'WHEAT',
+    'Corn': 'CORN',
+    'Rice': 'RICE',
+    'Soybean': 'SOYBEAN'
+}
+
+
+class AlphaVantageBudget:
+    """
+    Keeps Alpha Vantage within its daily call quota, shared by every PriceService
+
+    Quotes are cached for long enough that polling every symbol around the
+    clock spends at most ALPHA_VANTAGE_DAILY_LIMIT calls a day; calls are
+    also counted per UTC day, and a rate-limit answer stops calls until
+    the next day. Without a call, PriceService falls back to Yahoo Finance.
+    """
+
+    def __init__(self, daily_limit: Optional[int] = None):
+        """
+        Initialize the budget
+
+        Args:
+            daily_limit: Calls allowed per UTC day (defaults to ALPHA_VANTAGE_DAILY_LIMIT)
+        """
+        self.daily_limit = daily_limit if daily_limit is not None else settings.ALPHA_VANTAGE_DAILY_LIMIT
+        # symbol -> (quote, monotonic time fetched)
+        self._quotes: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._day: Optional[date] = None
+        self._calls = 0
+
+    @property
+    def quote_ttl(self) -> float:
+        """Seconds a quote is reused, so every symbol fits the daily quota"""
+        return 86400 * len(ALPHA_VANTAGE_SYMBOLS) / max(self.daily_limit, 1)
+
+    def cached(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get a quote fetched within quote_ttl"""
+        entry = self._quotes.get(symbol)
+        if entry is not None and time.monotonic() - entry[1] < self.quote_ttl:
+            return entry[0]
+        return None
+
+    def store(self, symbol: str, quote: Dict[str, Any]) -> None:
+        self._quotes[symbol] = (quote, time.monotonic())
+
+    def take(self) -> bool:
+        """Spend one of today's calls; False when none are left"""
+        today = datetime.utcnow().date()
+        if today != self._day:
+            self._day, self._calls = today, 0
+        if self._calls >= self.daily_limit:
+            return False
+        self._calls += 1
+        return True
+
+    def exhaust(self) -> None:
+        """Stop calling until the next UTC day (Alpha Vantage said the quota is used up)"""
+        self._day, self._calls = datetime.utcnow().date(), self.daily_limit
+
+
+# Global Alpha Vantage budget
+alpha_vantage_budget = AlphaVantageBudget()
+
+
 class PriceService:
-    def __init__(self):
+    def __init__(self, budget: Optional[AlphaVantageBudget] = None):
         self.alpha_vantage_base_url = "https://www.alphavantage.co/query"
         self.fred_base_url = "https://api.stlouisfed.org/fred"
         self.yahoo_base_url = "https://query1.finance.yahoo.com/v8/finance/chart"
+        self.alpha_vantage_budget = budget or alpha_vantage_budget
     
     async def get_commodity_prices(self, commodities: List[str]) -> Dict[str, Any]:
         """Get commodity prices from multiple sources - FREE"""
@@ -35,32 +104,31 @@ class PriceService:
             return {}
     
     async def _get_alpha_vantage_price(self, commodity: str) -> Dict[str, Any]:
-        """Get price from Alpha Vantage - FREE (25 calls/day)"""
+        """Get price from Alpha Vantage - FREE (25 calls/day, see AlphaVantageBudget)"""
         try:
             # Skip if no API key
             if not config.is_service_enabled('alpha_vantage'):
                 logger.info(f"Alpha Vantage API key not configured, skipping {commodity}")
                 return {}
             
-            # Map commodities to Alpha Vantage symbols
-            symbol_map = {
-                'Wheat': 'WHEAT',
-                'Corn': 'CORN', 
-                'Rice': 'RICE',
-                'Soybean': 'SOYBEAN'
-            }
-            
-            symbol = symbol_map.get(commodity)
+            symbol = ALPHA_VANTAGE_SYMBOLS.get(commodity)
             if not symbol:
                 return {}
             
+            budget = self.alpha_vantage_budget
+            cached = budget.cached(symbol)
+            if cached is not None:
+                return cached
+            if not budget.take():
+                return {}
+            
             params = {
                 'function': 'GLOBAL_QUOTE',
                 'symbol': f"{symbol}=F",  # Futures symbol
                 'apikey': config.get_api_key('alpha_vantage')
             }
             
-            async with httpx.AsyncClient() as client:
+            async with http_client("price") as client:
                 response = await client.get(self.alpha_vantage_base_url, params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -68,7 +136,7 @@ class PriceService:
                     if 'Global Quote' in data:
                         quote = data['Global Quote']
                         
-                        return {
+                        price = {
                             'symbol': symbol,
                             'price': float(quote.get('05. price', 0)),
                             'change': float(quote.get('09. change', 0)),
@@ -77,6 +145,13 @@ class PriceService:
                             'timestamp': quote.get('07. latest trading day', ''),
                             'source': 'alpha_vantage'
                         }
+                        budget.store(symbol, price)
+                        return price
+                    
+                    # Rate-limited requests still get a 200, with a Note or Information message
+                    if 'Note' in data or 'Information' in data:
+                        logger.warning(f"Alpha Vantage quota used up until tomorrow: {data.get('Note') or data.get('Information')}")
+                        budget.exhaust()
                 return {}
         except Exception as e:
             logger.error(f"Error fetching Alpha Vantage price for {commodity}: {e}")
@@ -107,7 +182,7 @@ class PriceService:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("price", timeout=10.0) as client:
                 response = await client.get(f"{self.yahoo_base_url}/{symbol}", headers=headers)
                 if response.status_code == 200:
                     data = response.json()
@@ -174,7 +249,7 @@ class PriceService:
                 'sort_order': 'desc'
             }
             
-            async with httpx.AsyncClient() as client:
+            async with http_client("price") as client:
                 response = await client.get(f"{self.fred_base_url}/series/observations", params=params)
                 if response.status_code == 200:
                     data = response.json()
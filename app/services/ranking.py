@@ -0,0 +1,229 @@
+"""
+Relevance ranking for aggregated news
+"""
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import math
+import re
+import numpy as np
+from app.config import settings
+from app.models.schemas import NewsArticle
+from app.utils.normalizer import SOURCE_PRIORITY
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words that carry no relevance signal in a query
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "is",
+    "of", "on", "or", "the", "to", "with", "news", "latest"
+})
+
+
+# Byte table turning ASCII punctuation and newlines into spaces; the NUL
+# placed between documents becomes the only newline
+_SEPARATORS = bytes(
+    10 if byte == 0 else byte if byte >= 128 or chr(byte).isalnum() else 32
+    for byte in range(256)
+)
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _utc_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch, treating naive timestamps as UTC"""
+    if timestamp.tzinfo is None:
+        return (timestamp - _EPOCH).total_seconds()
+    return timestamp.timestamp()
+
+
+class RankingEngine:
+    """
+    Scores candidate articles against a query in one vectorized pass
+
+    The score is a weighted blend of:
+    - BM25 over headline and summary (candidates form the corpus),
+    - exponential recency decay,
+    - source weight (SOURCE_PRIORITY scaled to 0-1),
+    - share of query terms found in the article's tags, tickers, country
+      and category.
+    Each component is scaled to 0-1 before blending so the weights in
+    settings are comparable.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        weights: Optional[Dict[str, float]] = None,
+        half_life_hours: Optional[float] = None
+    ):
+        """
+        Initialize the engine
+
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+            weights: Component weights (bm25, recency, source, tags);
+                defaults to the RANKING_WEIGHT_* settings
+            half_life_hours: Recency half-life (defaults to RANKING_RECENCY_HALF_LIFE_HOURS)
+        """
+        self.k1 = k1
+        self.b = b
+        self.weights = weights or {
+            "bm25": settings.RANKING_WEIGHT_BM25,
+            "recency": settings.RANKING_WEIGHT_RECENCY,
+            "source": settings.RANKING_WEIGHT_SOURCE,
+            "tags": settings.RANKING_WEIGHT_TAGS
+        }
+        self.half_life_hours = half_life_hours or settings.RANKING_RECENCY_HALF_LIFE_HOURS
+
+        top = max(SOURCE_PRIORITY.values()) or 1
+        self._source_weights = {source: rank / top for source, rank in SOURCE_PRIORITY.items()}
+
+    @staticmethod
+    def query_terms(query: Optional[str]) -> List[str]:
+        """Unique, lowercased query terms without stopwords"""
+        if not query:
+            return []
+        terms = _WORD_RE.findall(query.lower())
+        return list(dict.fromkeys(term for term in terms if term not in STOPWORDS))
+
+    def _term_counts(self, texts: List[str], terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count query terms per text
+
+        All texts are packed into one buffer so that normalization, word
+        counting and term search run in C or NumPy rather than per text.
+
+        Args:
+            texts: Article texts
+            terms: Lowercased query terms
+
+        Returns:
+            Tuple of (term frequencies (n_texts, n_terms), text lengths in words)
+        """
+        n = len(texts)
+        buffer = b" " + " \0 ".join(texts).lower().encode("utf-8").translate(_SEPARATORS) + b" "
+
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        breaks = np.flatnonzero(data == 10)
+        in_word = (data != 32) & (data != 10)
+        word_starts = np.flatnonzero(in_word[1:] & ~in_word[:-1]) + 1
+        lengths = np.bincount(np.searchsorted(breaks, word_starts), minlength=n).astype(np.float64)
+        lengths = np.maximum(lengths, 1.0)
+
+        tf = np.zeros((n, len(terms)), dtype=np.float64)
+        for column, term in enumerate(terms):
+            needle = f" {term} ".encode("utf-8")
+            positions = []
+            position = buffer.find(needle)
+            while position != -1:
+                positions.append(position)
+                # The trailing space may start the next occurrence
+                position = buffer.find(needle, position + len(needle) - 1)
+            if positions:
+                tf[:, column] = np.bincount(np.searchsorted(breaks, positions), minlength=n)
+
+        return tf, lengths
+
+    def _bm25(self, texts: List[str], terms: List[str]) -> np.ndarray:
+        """BM25 score of every text for the query terms"""
+        if not terms:
+            return np.zeros(len(texts))
+
+        tf, lengths = self._term_counts(texts, terms)
+        n = len(texts)
+        df = (tf > 0).sum(axis=0)
+        idf = np.log((n - df + 0.5) / (df + 0.5) + 1.0)
+
+        norm = self.k1 * (1 - self.b + self.b * lengths / lengths.mean())
+        saturated = tf * (self.k1 + 1) / (tf + norm[:, None])
+        return saturated @ idf
+
+    def score(
+        self,
+        articles: List[NewsArticle],
+        query: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Score articles for a query
+
+        Args:
+            articles: Candidate articles
+            query: Search query (only recency, source and tags count without one)
+            now: Reference time for recency (defaults to now)
+
+        Returns:
+            Array of scores, one per article (higher is better)
+        """
+        if not articles:
+            return np.zeros(0)
+
+        terms = self.query_terms(query)
+        now = now or datetime.utcnow()
+        n = len(articles)
+
+        # One pass over the models; everything after this is vectorized
+        lowered = set(terms)
+        uppered = {term.upper() for term in terms}
+        source_weights = self._source_weights
+        texts = []
+        seconds = []
+        sources = []
+        hits = []
+        for a in articles:
+            texts.append(f"{a.headline} {a.summary or ''}")
+            seconds.append(_utc_seconds(a.timestamp))
+            sources.append(source_weights.get(a.source, 0.0))
+            if terms:
+                # NewsCategory is a str enum, so it matches its value in a set
+                hits.append(
+                    len(lowered.intersection(a.commodity_tags))
+                    + len(uppered.intersection(a.tickers))
+                    + (a.category in lowered)
+                    + (a.country is not None and a.country.lower() in lowered)
+                )
+
+        bm25 = self._bm25(texts, terms)
+        if bm25.max() > 0:
+            bm25 = bm25 / bm25.max()
+
+        age_hours = np.maximum(_utc_seconds(now) - np.array(seconds), 0) / 3600
+        recency = np.exp(-math.log(2) * age_hours / self.half_life_hours)
+
+        source = np.array(sources, dtype=np.float64)
+        tags = np.array(hits, dtype=np.float64) / len(terms) if terms else np.zeros(n)
+
+        return (
+            self.weights["bm25"] * bm25
+            + self.weights["recency"] * recency
+            + self.weights["source"] * source
+            + self.weights["tags"] * tags
+        )
+
+    def rank(
+        self,
+        articles: List[NewsArticle],
+        query: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> List[NewsArticle]:
+        """
+        Order articles by relevance to a query
+
+        Args:
+            articles: Candidate articles
+            query: Search query
+            now: Reference time for recency
+
+        Returns:
+            Articles, most relevant first (ties keep their input order)
+        """
+        scores = self.score(articles, query, now)
+        order = np.argsort(-scores, kind="stable")
+        return [articles[i] for i in order]
+
+
+# Global ranking engine
+ranking = RankingEngine()
@@ -0,0 +1,290 @@
+"""
+Lightweight request tracing: nested spans in a context variable, OTLP-shaped
+"""
+from typing import Dict, Any, Callable, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import inspect
+import os
+import re
+import time
+from fastapi.routing import APIRoute
+from app.config import settings
+
+# W3C trace context: version-trace_id-parent_id-flags
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP status codes
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+# OTLP span kinds
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+
+
+class Trace:
+    """Spans of one request, bounded by TRACING_MAX_SPANS"""
+
+    __slots__ = ("trace_id", "spans", "dropped")
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.spans = 0
+        self.dropped = 0
+
+
+class Span:
+    """A timed operation; children are the spans started while it was current"""
+
+    __slots__ = (
+        "name", "trace", "span_id", "parent_id", "kind", "attributes", "status",
+        "children", "start_ns", "end_ns", "_started"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace: Trace,
+        parent_id: Optional[str] = None,
+        kind: int = KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = STATUS_UNSET
+        self.children: List["Span"] = []
+        # Wall-clock start for export, monotonic clock for the duration
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        trace.spans += 1
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + time.perf_counter_ns() - self._started
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def add_child(self, name: str, start_ns: int, end_ns: int, **attributes) -> Optional["Span"]:
+        """Record an already finished operation as a child span"""
+        if self.trace.spans >= settings.TRACING_MAX_SPANS:
+            self.trace.dropped += 1
+            return None
+        child = Span(name, self.trace, self.span_id, attributes=attributes)
+        child.start_ns, child.end_ns = start_ns, end_ns
+        self.children.append(child)
+        return child
+
+    def walk(self) -> Iterator["Span"]:
+        """This span and all its descendants, depth first"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Span of the running operation, or None outside a traced request"""
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a child of the current span
+
+    Outside a traced request (or past TRACING_MAX_SPANS) this costs one
+    context-variable lookup and yields None. Spans started in tasks
+    created inside the block (asyncio.gather, create_task) nest under it,
+    since tasks copy the context they are created in.
+
+    Args:
+        name: Span name; spans with one name are summed in Server-Timing
+        kind: KIND_INTERNAL or KIND_CLIENT (upstream calls)
+        **attributes: Span attributes (OpenTelemetry semantic names where one exists)
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    trace = parent.trace
+    if trace.spans >= settings.TRACING_MAX_SPANS:
+        trace.dropped += 1
+        yield None
+        return
+
+    child = Span(name, trace, parent.span_id, kind, attributes)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.status = STATUS_ERROR
+        child.attributes["exception.type"] = type(e).__name__
+        raise
+    finally:
+        child.end()
+        _current.reset(token)
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, **attributes) -> Iterator[Span]:
+    """
+    Open the root span of a request
+
+    Args:
+        name: Root span name (renamed to the route template once known)
+        traceparent: Incoming W3C traceparent header; the trace joins it
+        **attributes: Root span attributes
+    """
+    trace_id = parent_id = None
+    match = TRACEPARENT.match(traceparent or "")
+    if match:
+        trace_id, parent_id = match.group(1), match.group(2)
+    root = Span(name, Trace(trace_id), parent_id, KIND_SERVER, attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    finally:
+        root.end()
+        _current.reset(token)
+
+
+def traceparent(root: Span) -> str:
+    """W3C traceparent header naming a span (sampled)"""
+    return f"00-{root.trace.trace_id}-{root.span_id}-01"
+
+
+def server_timing(root: Span) -> str:
+    """
+    Summarize a trace as a Server-Timing header value
+
+    Finished spans are summed per name in order of first start, after the
+    root's own "total"; concurrent spans (connectors) each keep their own
+    name, so the slowest source stands out.
+    """
+    durations: Dict[str, float] = {}
+    for item in root.walk():
+        if item is not root and item.end_ns is not None:
+            durations[item.name] = durations.get(item.name, 0.0) + item.duration_ms
+    entries = [f"total;dur={root.duration_ms or 0.0:.1f}"]
+    entries.extend(f"{name};dur={duration:.1f}" for name, duration in durations.items())
+    return ", ".join(entries)
+
+
+def span_tree(root: Span) -> Dict[str, Any]:
+    """
+    Nested view of a trace for debugging
+
+    Returns:
+        Dictionary with trace_id, dropped_spans and the root span, each span
+        with its name, ids, start, duration, attributes, status and children
+    """
+    def node(item: Span) -> Dict[str, Any]:
+        return {
+            "name": item.name,
+            "span_id": item.span_id,
+            "start_unix_nano": item.start_ns,
+            "duration_ms": round(item.duration_ms, 3) if item.end_ns is not None else None,
+            "attributes": item.attributes,
+            "status": ("unset", "ok", "error")[item.status],
+            "children": [node(child) for child in item.children]
+        }
+
+    return {"trace_id": root.trace.trace_id, "dropped_spans": root.trace.dropped, "root": node(root)}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(root: Span) -> Dict[str, Any]:
+    """
+    Encode a trace as an OTLP/JSON ExportTraceServiceRequest
+
+    The result can be POSTed as-is to an OpenTelemetry collector's
+    /v1/traces endpoint (OTLP over HTTP with JSON encoding).
+    """
+    spans = []
+    for item in root.walk():
+        if item.end_ns is None:
+            continue
+        encoded = {
+            "traceId": item.trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": item.kind,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()],
+            "status": {"code": item.status}
+        }
+        if item.parent_id:
+            encoded["parentSpanId"] = item.parent_id
+        spans.append(encoded)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.APP_NAME}},
+                {"key": "service.version", "value": {"stringValue": settings.APP_VERSION}}
+            ]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}]
+        }]
+    }
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute that traces the endpoint and, separately, response encoding
+
+    The endpoint runs in an "endpoint" span. Everything between its return
+    and the finished Response (response_model validation, jsonable_encoder,
+    JSON rendering) is recorded as an "encode" span.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # include_router re-creates routes from already wrapped endpoints
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "_traced", False):
+            endpoint = self._traced(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _traced(endpoint: Callable) -> Callable:
+        # functools.wraps keeps the signature FastAPI reads parameters from
+        @functools.wraps(endpoint)
+        async def traced_endpoint(*args, **kwargs):
+            with span("endpoint"):
+                return await endpoint(*args, **kwargs)
+        traced_endpoint._traced = True
+        return traced_endpoint
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            parent = _current.get()
+            if parent is not None:
+                endpoint = next(
+                    (child for child in reversed(parent.children) if child.name == "endpoint"), None
+                )
+                if endpoint is not None and endpoint.end_ns is not None:
+                    now = parent.start_ns + time.perf_counter_ns() - parent._started
+                    parent.add_child("encode", endpoint.end_ns, now)
+            return response
+
+        return traced_handler
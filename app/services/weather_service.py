@@ -1,9 +1,9 @@
-import httpx
 import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
 from .config_service import config
+from .metrics import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ class WeatherService:
                 'User-Agent': 'AnantaAPI/1.0 (contact@ananta.com)'
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("weather", timeout=10.0) as client:
                 response = await client.get(f"{self.noaa_base_url}/alerts/active", headers=headers)
                 if response.status_code == 200:
                     data = response.json()
@@ -93,7 +93,7 @@ class WeatherService:
                 'forecast_days': 7
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("weather", timeout=10.0) as client:
                 response = await client.get(f"{self.open_meteo_base_url}/forecast", params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -129,7 +129,7 @@ class WeatherService:
                 'units': 'metric'
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("weather", timeout=10.0) as client:
                 response = await client.get(f"{self.openweather_base_url}/weather", params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -157,7 +157,7 @@ class WeatherService:
             }
             
             # Step 1: Get grid metadata
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("weather", timeout=10.0) as client:
                 points_response = await client.get(
                     f"{self.noaa_base_url}/points/{lat:.4f},{lon:.4f}",
                     headers=headers
@@ -216,7 +216,7 @@ class WeatherService:
                 'forecast_days': 7
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with http_client("weather", timeout=10.0) as client:
                 response = await client.get(f"{self.open_meteo_base_url}/forecast", params=params)
                 if response.status_code == 200:
                     data = response.json()
@@ -1,7 +1,7 @@
 """
 Category classifier for news articles
 """
-from typing import Optional
+from typing import List, Optional, Tuple
 from app.models.schemas import NewsCategory
 
 
@@ -143,6 +143,18 @@ class CategoryClassifier:
             combined_text += " " + summary
         
         return self.classify(combined_text)
+    
+    def classify_articles(self, items: List[Tuple[str, Optional[str]]]) -> List[NewsCategory]:
+        """
+        Classify a batch of articles
+        
+        Args:
+            items: (headline, summary) pairs
+            
+        Returns:
+            NewsCategory for each item
+        """
+        return [self.classify_article(headline, summary) for headline, summary in items]
 
 
 # Global classifier instance
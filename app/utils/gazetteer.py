@@ -0,0 +1,231 @@
+"""
+Gazetteer for extracting country and state/region from article text
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import re
+import unicodedata
+
+from app.utils.gazetteer_data import COUNTRIES, SUBDIVISIONS, REGIONS
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
+# Trie key holding the entries that end at a node (never a valid token)
+_END = ""
+
+
+class Place(NamedTuple):
+    """A gazetteer entry: kind is 'country', 'state' or 'region'"""
+    kind: str
+    country: Optional[str]
+    state: Optional[str] = None
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into accent-folded word tokens (original case)"""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _TOKEN_RE.findall(folded)
+
+
+class Gazetteer:
+    """
+    Multi-pattern place-name matcher
+
+    All aliases are compiled into a token trie so a text is scanned once,
+    taking the longest match at each position. Cost is proportional to the
+    number of tokens in the text, not to the number of known place names.
+    """
+
+    def __init__(self):
+        """Initialize an empty gazetteer"""
+        self._trie: Dict[str, dict] = {}
+        self._countries: Dict[str, str] = {}
+        self._states: Dict[str, List[Place]] = {}
+        self.size = 0
+
+    @classmethod
+    def from_data(cls) -> "Gazetteer":
+        """Build a gazetteer from the bundled country/subdivision/region tables"""
+        gazetteer = cls()
+
+        # Regions are added first and shadow same-named subdivisions,
+        # e.g. "Washington" means the US government, not the state
+        for name, country in REGIONS.items():
+            gazetteer.add(name, Place("region", country))
+
+        for country, aliases in COUNTRIES.items():
+            for name in [country] + aliases:
+                gazetteer.add(name, Place("country", country))
+
+        for country, states in SUBDIVISIONS.items():
+            for state, aliases in states.items():
+                for name in [state] + aliases:
+                    if name not in REGIONS:
+                        gazetteer.add(name, Place("state", country, state))
+
+        return gazetteer
+
+    def add(self, name: str, place: Place) -> None:
+        """
+        Register a place name
+
+        Args:
+            name: Surface form to match
+            place: Place the name refers to
+        """
+        tokens = _tokenize(name)
+        if not tokens:
+            return
+
+        # All-caps abbreviations ("US", "UP", "NSW") only match as written
+        case_sensitive = name.upper() == name
+
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        node.setdefault(_END, []).append((tuple(tokens) if case_sensitive else None, place))
+        self.size += 1
+
+        key = " ".join(tokens).lower()
+        if place.kind == "country":
+            self._countries.setdefault(key, place.country)
+        elif place.kind == "state":
+            self._states.setdefault(key, []).append(place)
+
+    def find(self, text: str) -> List[List[Place]]:
+        """
+        Find all place mentions in text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of candidate groups, one per matched span in text order.
+            A group holds more than one place when the name is ambiguous.
+        """
+        if not text:
+            return []
+
+        tokens = _tokenize(text)
+        lowered = [token.lower() for token in tokens]
+        matches = []
+        i = 0
+
+        while i < len(tokens):
+            node = self._trie
+            best: Optional[List[Place]] = None
+            best_end = i
+            j = i
+
+            while j < len(tokens) and lowered[j] in node:
+                node = node[lowered[j]]
+                j += 1
+                if _END in node:
+                    span = tuple(tokens[i:j])
+                    places = [
+                        place for exact, place in node[_END]
+                        if exact is None or exact == span
+                    ]
+                    if places:
+                        best, best_end = places, j
+
+            if best:
+                matches.append(best)
+                i = best_end
+            else:
+                i += 1
+
+        return matches
+
+    def extract(self, text: str, country: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract the most likely country and state from text
+
+        Args:
+            text: Article text (headline and summary)
+            country: Country already known for the article (e.g. request filter);
+                takes precedence over countries mentioned in the text
+
+        Returns:
+            Tuple of (country, state); either may be None
+        """
+        groups = self.find(text)
+
+        votes: Dict[str, int] = {}
+        ambiguous = []
+        for group in groups:
+            countries = {place.country for place in group if place.country}
+            if len(countries) == 1:
+                name = countries.pop()
+                votes[name] = votes.get(name, 0) + 1
+            elif countries:
+                ambiguous.append(group)
+
+        # A name that is both a country and a state ("Georgia") counts as
+        # the country unless the state's country is mentioned elsewhere
+        for group in ambiguous:
+            if any(place.country in votes for place in group if place.kind == "state"):
+                continue
+            for place in group:
+                if place.kind == "country":
+                    votes[place.country] = votes.get(place.country, 0) + 1
+
+        if country:
+            resolved = self.canonical_country(country) or country
+        elif votes:
+            # Most mentioned wins; dict order breaks ties by first mention
+            resolved = max(votes, key=votes.get)
+        else:
+            resolved = None
+
+        state = None
+        for group in groups:
+            states = [place for place in group if place.kind == "state"]
+            if not states:
+                continue
+            if resolved:
+                matching = [place for place in states if place.country == resolved]
+                if matching:
+                    state = matching[0].state
+                    break
+            elif len({place.country for place in states}) == 1:
+                resolved, state = states[0].country, states[0].state
+                break
+
+        return resolved, state
+
+    def canonical_country(self, name: Optional[str]) -> Optional[str]:
+        """
+        Resolve a country name or alias to its canonical name
+
+        Args:
+            name: Country name, alias or abbreviation (e.g. "USA")
+
+        Returns:
+            Canonical country name or None if unknown
+        """
+        if not name:
+            return None
+        return self._countries.get(" ".join(_tokenize(name)).lower())
+
+    def canonical_state(self, name: Optional[str], country: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a state/region name or alias to its canonical name
+
+        Args:
+            name: State name or alias (e.g. "UP", "Mumbai")
+            country: Optional country used to disambiguate
+
+        Returns:
+            Canonical state name or None if unknown
+        """
+        if not name:
+            return None
+        places = self._states.get(" ".join(_tokenize(name)).lower(), [])
+        if country:
+            country = self.canonical_country(country) or country
+            places = [place for place in places if place.country == country] or places
+        return places[0].state if places else None
+
+
+# Global gazetteer instance
+gazetteer = Gazetteer.from_data()
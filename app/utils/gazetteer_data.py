@@ -0,0 +1,611 @@
+"""
+Gazetteer data: countries, first-level subdivisions, aliases and regions
+
+Each canonical name maps to a list of aliases (alternate spellings,
+demonyms, abbreviations and major commodity hubs). Short all-caps
+aliases such as "US" or "UP" are matched case-sensitively by the
+gazetteer so they do not fire on ordinary words.
+"""
+from typing import Dict, List, Optional
+
+
+# Canonical country name -> aliases
+COUNTRIES: Dict[str, List[str]] = {
+    "Afghanistan": ["Afghan"],
+    "Albania": ["Albanian"],
+    "Algeria": ["Algerian"],
+    "Andorra": [],
+    "Angola": ["Angolan"],
+    "Antigua and Barbuda": [],
+    "Argentina": ["Argentine", "Argentinian", "Argentinean"],
+    "Armenia": ["Armenian"],
+    "Australia": ["Australian", "Aussie"],
+    "Austria": ["Austrian"],
+    "Azerbaijan": ["Azerbaijani", "Azeri"],
+    "Bahamas": ["Bahamian", "The Bahamas"],
+    "Bahrain": ["Bahraini"],
+    "Bangladesh": ["Bangladeshi"],
+    "Barbados": ["Barbadian"],
+    "Belarus": ["Belarusian", "Byelorussia"],
+    "Belgium": ["Belgian"],
+    "Belize": ["Belizean"],
+    "Benin": ["Beninese"],
+    "Bhutan": ["Bhutanese"],
+    "Bolivia": ["Bolivian"],
+    "Bosnia and Herzegovina": ["Bosnia", "Bosnian"],
+    "Botswana": ["Motswana"],
+    "Brazil": ["Brazilian", "Brasil"],
+    "Brunei": ["Bruneian", "Brunei Darussalam"],
+    "Bulgaria": ["Bulgarian"],
+    "Burkina Faso": ["Burkinabe"],
+    "Burundi": ["Burundian"],
+    "Cabo Verde": ["Cape Verde", "Cape Verdean"],
+    "Cambodia": ["Cambodian", "Kampuchea"],
+    "Cameroon": ["Cameroonian"],
+    "Canada": ["Canadian"],
+    "Central African Republic": [],
+    "Chad": ["Chadian"],
+    "Chile": ["Chilean"],
+    "China": ["Chinese", "PRC", "People's Republic of China", "Mainland China"],
+    "Colombia": ["Colombian"],
+    "Comoros": ["Comorian"],
+    "Democratic Republic of the Congo": ["DRC", "DR Congo", "Congo-Kinshasa", "Congolese"],
+    "Republic of the Congo": ["Congo", "Congo-Brazzaville", "Congo Republic"],
+    "Costa Rica": ["Costa Rican"],
+    "Cote d'Ivoire": ["Ivory Coast", "Ivorian"],
+    "Croatia": ["Croatian", "Croat"],
+    "Cuba": ["Cuban"],
+    "Cyprus": ["Cypriot"],
+    "Czech Republic": ["Czechia", "Czech"],
+    "Denmark": ["Danish", "Dane"],
+    "Djibouti": ["Djiboutian"],
+    "Dominica": [],
+    "Dominican Republic": ["Dominican"],
+    "Ecuador": ["Ecuadorian", "Ecuadorean"],
+    "Egypt": ["Egyptian"],
+    "El Salvador": ["Salvadoran", "Salvadorean"],
+    "Equatorial Guinea": ["Equatoguinean"],
+    "Eritrea": ["Eritrean"],
+    "Estonia": ["Estonian"],
+    "Eswatini": ["Swaziland", "Swazi"],
+    "Ethiopia": ["Ethiopian"],
+    "Fiji": ["Fijian"],
+    "Finland": ["Finnish"],
+    "France": ["French"],
+    "Gabon": ["Gabonese"],
+    "Gambia": ["Gambian", "The Gambia"],
+    "Georgia": ["Georgian"],
+    "Germany": ["German", "Deutschland"],
+    "Ghana": ["Ghanaian"],
+    "Greece": ["Greek", "Hellenic"],
+    "Grenada": ["Grenadian"],
+    "Guatemala": ["Guatemalan"],
+    "Guinea": ["Guinean"],
+    "Guinea-Bissau": ["Bissau-Guinean"],
+    "Guyana": ["Guyanese"],
+    "Haiti": ["Haitian"],
+    "Honduras": ["Honduran"],
+    "Hungary": ["Hungarian"],
+    "Iceland": ["Icelandic"],
+    "India": ["Indian", "Bharat"],
+    "Indonesia": ["Indonesian"],
+    "Iran": ["Iranian", "Persia"],
+    "Iraq": ["Iraqi"],
+    "Ireland": ["Irish", "Eire"],
+    "Israel": ["Israeli"],
+    "Italy": ["Italian"],
+    "Jamaica": ["Jamaican"],
+    "Japan": ["Japanese"],
+    "Jordan": ["Jordanian"],
+    "Kazakhstan": ["Kazakh", "Kazakhstani"],
+    "Kenya": ["Kenyan"],
+    "Kiribati": [],
+    "Kosovo": ["Kosovar"],
+    "Kuwait": ["Kuwaiti"],
+    "Kyrgyzstan": ["Kyrgyz"],
+    "Laos": ["Lao", "Laotian"],
+    "Latvia": ["Latvian"],
+    "Lebanon": ["Lebanese"],
+    "Lesotho": ["Basotho"],
+    "Liberia": ["Liberian"],
+    "Libya": ["Libyan"],
+    "Liechtenstein": [],
+    "Lithuania": ["Lithuanian"],
+    "Luxembourg": ["Luxembourgish"],
+    "Madagascar": ["Malagasy"],
+    "Malawi": ["Malawian"],
+    "Malaysia": ["Malaysian"],
+    "Maldives": ["Maldivian"],
+    "Mali": ["Malian"],
+    "Malta": ["Maltese"],
+    "Marshall Islands": ["Marshallese"],
+    "Mauritania": ["Mauritanian"],
+    "Mauritius": ["Mauritian"],
+    "Mexico": ["Mexican"],
+    "Micronesia": ["Micronesian"],
+    "Moldova": ["Moldovan"],
+    "Monaco": ["Monegasque"],
+    "Mongolia": ["Mongolian"],
+    "Montenegro": ["Montenegrin"],
+    "Morocco": ["Moroccan"],
+    "Mozambique": ["Mozambican"],
+    "Myanmar": ["Burma", "Burmese"],
+    "Namibia": ["Namibian"],
+    "Nauru": ["Nauruan"],
+    "Nepal": ["Nepalese", "Nepali"],
+    "Netherlands": ["Dutch", "Holland", "The Netherlands"],
+    "New Zealand": ["NZ"],
+    "Nicaragua": ["Nicaraguan"],
+    "Niger": ["Nigerien"],
+    "Nigeria": ["Nigerian"],
+    "North Korea": ["DPRK", "North Korean"],
+    "North Macedonia": ["Macedonia", "Macedonian"],
+    "Norway": ["Norwegian"],
+    "Oman": ["Omani"],
+    "Pakistan": ["Pakistani"],
+    "Palau": ["Palauan"],
+    "Palestine": ["Palestinian", "West Bank", "Gaza"],
+    "Panama": ["Panamanian"],
+    "Papua New Guinea": [],
+    "Paraguay": ["Paraguayan"],
+    "Peru": ["Peruvian"],
+    "Philippines": ["Filipino", "Philippine"],
+    "Poland": ["Polish"],
+    "Portugal": ["Portuguese"],
+    "Qatar": ["Qatari"],
+    "Romania": ["Romanian"],
+    "Russia": ["Russian", "Russian Federation"],
+    "Rwanda": ["Rwandan"],
+    "Saint Kitts and Nevis": ["St Kitts and Nevis"],
+    "Saint Lucia": ["St Lucia"],
+    "Saint Vincent and the Grenadines": ["St Vincent and the Grenadines"],
+    "Samoa": ["Samoan"],
+    "San Marino": [],
+    "Sao Tome and Principe": [],
+    "Saudi Arabia": ["Saudi", "KSA"],
+    "Senegal": ["Senegalese"],
+    "Serbia": ["Serbian"],
+    "Seychelles": ["Seychellois"],
+    "Sierra Leone": ["Sierra Leonean"],
+    "Singapore": ["Singaporean"],
+    "Slovakia": ["Slovak"],
+    "Slovenia": ["Slovenian", "Slovene"],
+    "Solomon Islands": [],
+    "Somalia": ["Somali"],
+    "South Africa": ["South African"],
+    "South Korea": ["Korea", "Korean", "South Korean", "Republic of Korea"],
+    "South Sudan": ["South Sudanese"],
+    "Spain": ["Spanish"],
+    "Sri Lanka": ["Sri Lankan", "Ceylon"],
+    "Sudan": ["Sudanese"],
+    "Suriname": ["Surinamese"],
+    "Sweden": ["Swedish"],
+    "Switzerland": ["Swiss"],
+    "Syria": ["Syrian"],
+    "Taiwan": ["Taiwanese"],
+    "Tajikistan": ["Tajik"],
+    "Tanzania": ["Tanzanian"],
+    "Thailand": ["Thai"],
+    "Timor-Leste": ["East Timor", "Timorese"],
+    "Togo": ["Togolese"],
+    "Tonga": ["Tongan"],
+    "Trinidad and Tobago": ["Trinidad", "Trinidadian"],
+    "Tunisia": ["Tunisian"],
+    "Turkey": ["Turkish", "Turkiye"],
+    "Turkmenistan": ["Turkmen"],
+    "Tuvalu": [],
+    "Uganda": ["Ugandan"],
+    "Ukraine": ["Ukrainian"],
+    "United Arab Emirates": ["UAE", "Emirati", "Emirates"],
+    "United Kingdom": ["UK", "U.K.", "Britain", "British", "Great Britain"],
+    "United States": [
+        "US", "U.S.", "USA", "U.S.A.", "United States of America",
+        "America", "American",
+    ],
+    "Uruguay": ["Uruguayan"],
+    "Uzbekistan": ["Uzbek"],
+    "Vanuatu": [],
+    "Vatican City": ["Holy See", "Vatican"],
+    "Venezuela": ["Venezuelan"],
+    "Vietnam": ["Viet Nam", "Vietnamese"],
+    "Yemen": ["Yemeni"],
+    "Zambia": ["Zambian"],
+    "Zimbabwe": ["Zimbabwean"],
+    # Territories that show up in trade news as their own markets
+    "Hong Kong": ["HK"],
+    "Macau": ["Macao"],
+    "Puerto Rico": ["Puerto Rican"],
+    "Greenland": [],
+    "New Caledonia": [],
+    "French Guiana": [],
+}
+
+
+# Canonical country name -> {canonical subdivision name -> aliases}
+SUBDIVISIONS: Dict[str, Dict[str, List[str]]] = {
+    "India": {
+        "Andhra Pradesh": ["Visakhapatnam", "Vijayawada", "Guntur"],
+        "Arunachal Pradesh": [],
+        "Assam": ["Guwahati"],
+        "Bihar": ["Patna"],
+        "Chhattisgarh": ["Raipur"],
+        "Goa": [],
+        "Gujarat": ["Ahmedabad", "Rajkot", "Surat", "Vadodara", "Kandla", "Mundra"],
+        "Haryana": ["Gurugram", "Gurgaon", "Karnal"],
+        "Himachal Pradesh": ["Shimla"],
+        "Jharkhand": ["Ranchi"],
+        "Karnataka": ["Bengaluru", "Bangalore", "Mysuru", "Mysore"],
+        "Kerala": ["Kochi", "Cochin", "Thiruvananthapuram"],
+        "Madhya Pradesh": ["Indore", "Bhopal"],
+        "Maharashtra": ["Mumbai", "Bombay", "Pune", "Nagpur", "Nashik", "Vidarbha", "Marathwada"],
+        "Manipur": [],
+        "Meghalaya": [],
+        "Mizoram": [],
+        "Nagaland": [],
+        "Odisha": ["Orissa", "Bhubaneswar"],
+        "Punjab": ["Ludhiana", "Amritsar"],
+        "Rajasthan": ["Jaipur", "Jodhpur", "Kota"],
+        "Sikkim": [],
+        "Tamil Nadu": ["Chennai", "Madras", "Coimbatore", "Madurai", "Tuticorin"],
+        "Telangana": ["Hyderabad", "Warangal"],
+        "Tripura": [],
+        "Uttar Pradesh": ["UP", "Lucknow", "Kanpur", "Agra", "Varanasi"],
+        "Uttarakhand": ["Uttaranchal", "Dehradun"],
+        "West Bengal": ["Kolkata", "Calcutta"],
+        "Andaman and Nicobar Islands": ["Andaman"],
+        "Chandigarh": [],
+        "Dadra and Nagar Haveli and Daman and Diu": [],
+        "Delhi": ["NCT of Delhi"],
+        "Jammu and Kashmir": ["Kashmir", "Srinagar"],
+        "Ladakh": [],
+        "Lakshadweep": [],
+        "Puducherry": ["Pondicherry"],
+    },
+    "United States": {
+        "Alabama": [], "Alaska": [], "Arizona": [], "Arkansas": [],
+        "California": ["Central Valley", "Los Angeles", "San Francisco"],
+        "Colorado": [], "Connecticut": [], "Delaware": [],
+        "Florida": [], "Georgia": [], "Hawaii": [], "Idaho": [],
+        "Illinois": ["Chicago"], "Indiana": [], "Iowa": ["Des Moines"],
+        "Kansas": [], "Kentucky": [], "Louisiana": ["New Orleans"],
+        "Maine": [], "Maryland": [], "Massachusetts": ["Boston"],
+        "Michigan": ["Detroit"], "Minnesota": ["Minneapolis"],
+        "Mississippi": [], "Missouri": ["Kansas City", "St. Louis", "St Louis"],
+        "Montana": [], "Nebraska": ["Omaha"], "Nevada": [],
+        "New Hampshire": [], "New Jersey": [], "New Mexico": [],
+        "New York": ["NYC"], "North Carolina": [], "North Dakota": [],
+        "Ohio": [], "Oklahoma": [], "Oregon": [], "Pennsylvania": [],
+        "Rhode Island": [], "South Carolina": [], "South Dakota": [],
+        "Tennessee": ["Memphis"], "Texas": ["Houston", "Dallas", "Galveston"],
+        "Utah": [], "Vermont": [], "Virginia": [],
+        "Washington": ["Washington State", "Seattle"],
+        "West Virginia": [], "Wisconsin": [], "Wyoming": [],
+        "District of Columbia": ["Washington DC", "Washington D.C."],
+    },
+    "China": {
+        "Anhui": [], "Fujian": [], "Gansu": [], "Guangdong": ["Guangzhou", "Shenzhen", "Canton"],
+        "Guangxi": [], "Guizhou": [], "Hainan": [], "Hebei": [],
+        "Heilongjiang": ["Harbin"], "Henan": ["Zhengzhou"], "Hubei": ["Wuhan"],
+        "Hunan": [], "Inner Mongolia": [], "Jiangsu": ["Nanjing"],
+        "Jiangxi": [], "Jilin": [], "Liaoning": ["Dalian"], "Ningxia": [],
+        "Qinghai": [], "Shaanxi": ["Xi'an"], "Shandong": ["Qingdao"],
+        "Shanxi": [], "Sichuan": ["Chengdu"], "Tibet": ["Xizang"],
+        "Xinjiang": [], "Yunnan": [], "Zhejiang": ["Hangzhou", "Ningbo"],
+        "Shanghai": [], "Tianjin": [], "Chongqing": [],
+    },
+    "Brazil": {
+        "Acre State": [], "Alagoas": [], "Amapa": [], "Amazonas": ["Manaus"],
+        "Bahia": [], "Ceara": [], "Distrito Federal": [], "Espirito Santo": [],
+        "Goias": [], "Maranhao": [], "Mato Grosso": [], "Mato Grosso do Sul": [],
+        "Minas Gerais": [], "Para State": [], "Paraiba": [], "Parana": ["Paranagua", "Curitiba"],
+        "Pernambuco": ["Recife"], "Piaui": [], "Rio de Janeiro": [],
+        "Rio Grande do Norte": [], "Rio Grande do Sul": ["Porto Alegre"],
+        "Rondonia": [], "Roraima": [], "Santa Catarina": [],
+        "Sao Paulo": ["Santos"], "Sergipe": [], "Tocantins": [],
+    },
+    "Argentina": {
+        "Buenos Aires": [], "Catamarca": [], "Chaco": [], "Chubut": [],
+        "Cordoba": [], "Corrientes": [], "Entre Rios": [], "Formosa": [],
+        "Jujuy": [], "La Pampa": [], "La Rioja": [], "Mendoza": [],
+        "Misiones": [], "Neuquen": [], "Rio Negro": [], "Salta": [],
+        "San Juan": [], "San Luis": [], "Santa Cruz": [], "Santa Fe": ["Rosario"],
+        "Santiago del Estero": [], "Tierra del Fuego": [], "Tucuman": [],
+    },
+    "Australia": {
+        "New South Wales": ["NSW", "Sydney"],
+        "Victoria": ["Melbourne"],
+        "Queensland": ["Brisbane"],
+        "Western Australia": ["Perth"],
+        "South Australia": ["Adelaide"],
+        "Tasmania": ["Hobart"],
+        "Northern Territory": [],
+        "Australian Capital Territory": [],
+    },
+    "Canada": {
+        "Alberta": ["Calgary", "Edmonton"],
+        "British Columbia": ["Vancouver"],
+        "Manitoba": ["Winnipeg"],
+        "New Brunswick": [],
+        "Newfoundland and Labrador": ["Newfoundland"],
+        "Nova Scotia": ["Halifax"],
+        "Ontario": ["Toronto"],
+        "Prince Edward Island": ["PEI"],
+        "Quebec": ["Montreal"],
+        "Saskatchewan": ["Saskatoon"],
+        "Northwest Territories": [],
+        "Nunavut": [],
+        "Yukon": [],
+    },
+    "Russia": {
+        "Adygea": [], "Altai Krai": ["Altai"], "Amur Oblast": ["Amur"],
+        "Arkhangelsk Oblast": ["Arkhangelsk"], "Astrakhan Oblast": ["Astrakhan"],
+        "Bashkortostan": [], "Belgorod Oblast": ["Belgorod"], "Bryansk Oblast": ["Bryansk"],
+        "Buryatia": [], "Chechnya": [], "Chelyabinsk Oblast": ["Chelyabinsk"],
+        "Chukotka": [], "Chuvashia": [], "Dagestan": [],
+        "Ingushetia": [], "Irkutsk Oblast": ["Irkutsk"], "Ivanovo Oblast": ["Ivanovo"],
+        "Kabardino-Balkaria": [], "Kaliningrad Oblast": ["Kaliningrad"],
+        "Kalmykia": [], "Kaluga Oblast": ["Kaluga"], "Kamchatka Krai": ["Kamchatka"],
+        "Karachay-Cherkessia": [], "Karelia": [], "Kemerovo Oblast": ["Kemerovo", "Kuzbass"],
+        "Khabarovsk Krai": ["Khabarovsk"], "Khakassia": [],
+        "Khanty-Mansi": [], "Kirov Oblast": [], "Komi": [],
+        "Kostroma Oblast": ["Kostroma"], "Krasnodar Krai": ["Krasnodar", "Kuban", "Novorossiysk"],
+        "Krasnoyarsk Krai": ["Krasnoyarsk"], "Kurgan Oblast": ["Kurgan"],
+        "Kursk Oblast": ["Kursk"], "Leningrad Oblast": [], "Lipetsk Oblast": ["Lipetsk"],
+        "Magadan Oblast": ["Magadan"], "Mari El": [], "Mordovia": [],
+        "Moscow Oblast": [], "Murmansk Oblast": ["Murmansk"],
+        "Nizhny Novgorod Oblast": ["Nizhny Novgorod"], "North Ossetia": [],
+        "Novgorod Oblast": [], "Novosibirsk Oblast": ["Novosibirsk"],
+        "Omsk Oblast": ["Omsk"], "Orenburg Oblast": ["Orenburg"], "Oryol Oblast": ["Oryol", "Orel"],
+        "Penza Oblast": ["Penza"], "Perm Krai": ["Perm"], "Primorsky Krai": ["Primorye", "Vladivostok"],
+        "Pskov Oblast": ["Pskov"], "Rostov Oblast": ["Rostov", "Rostov-on-Don"],
+        "Ryazan Oblast": ["Ryazan"], "Sakha": ["Yakutia"], "Sakhalin Oblast": ["Sakhalin"],
+        "Samara Oblast": ["Samara"], "Saratov Oblast": ["Saratov"],
+        "Smolensk Oblast": ["Smolensk"], "Stavropol Krai": ["Stavropol"],
+        "Sverdlovsk Oblast": ["Sverdlovsk", "Yekaterinburg"], "Tambov Oblast": ["Tambov"],
+        "Tatarstan": ["Kazan"], "Tomsk Oblast": ["Tomsk"], "Tula Oblast": ["Tula"],
+        "Tuva": [], "Tver Oblast": ["Tver"], "Tyumen Oblast": ["Tyumen"],
+        "Udmurtia": [], "Ulyanovsk Oblast": ["Ulyanovsk"], "Vladimir Oblast": [],
+        "Volgograd Oblast": ["Volgograd"], "Vologda Oblast": ["Vologda"],
+        "Voronezh Oblast": ["Voronezh"], "Yamalo-Nenets": ["Yamal"],
+        "Yaroslavl Oblast": ["Yaroslavl"], "Zabaykalsky Krai": ["Zabaykalsky"],
+    },
+    "Ukraine": {
+        "Cherkasy Oblast": ["Cherkasy"], "Chernihiv Oblast": ["Chernihiv"],
+        "Chernivtsi Oblast": ["Chernivtsi"], "Crimea": [],
+        "Dnipropetrovsk Oblast": ["Dnipropetrovsk", "Dnipro"],
+        "Donetsk Oblast": ["Donetsk", "Donbas"], "Ivano-Frankivsk Oblast": ["Ivano-Frankivsk"],
+        "Kharkiv Oblast": ["Kharkiv", "Kharkov"], "Kherson Oblast": ["Kherson"],
+        "Khmelnytskyi Oblast": ["Khmelnytskyi"], "Kirovohrad Oblast": ["Kirovohrad", "Kropyvnytskyi"],
+        "Kyiv Oblast": [], "Luhansk Oblast": ["Luhansk"], "Lviv Oblast": ["Lviv"],
+        "Mykolaiv Oblast": ["Mykolaiv"], "Odesa Oblast": ["Odesa", "Odessa", "Chornomorsk", "Pivdennyi"],
+        "Poltava Oblast": ["Poltava"], "Rivne Oblast": ["Rivne"], "Sumy Oblast": ["Sumy"],
+        "Ternopil Oblast": ["Ternopil"], "Vinnytsia Oblast": ["Vinnytsia"],
+        "Volyn Oblast": ["Volyn"], "Zakarpattia Oblast": ["Zakarpattia", "Transcarpathia"],
+        "Zaporizhzhia Oblast": ["Zaporizhzhia"], "Zhytomyr Oblast": ["Zhytomyr"],
+        "Sevastopol": [],
+    },
+    "Mexico": {
+        "Aguascalientes": [], "Baja California": [], "Baja California Sur": [],
+        "Campeche": [], "Chiapas": [], "Chihuahua": [], "Coahuila": [],
+        "Colima": [], "Durango": [], "Guanajuato": [], "Guerrero": [],
+        "Hidalgo": [], "Jalisco": ["Guadalajara"], "Michoacan": [], "Morelos": [],
+        "Nayarit": [], "Nuevo Leon": ["Monterrey"], "Oaxaca": [], "Puebla": [],
+        "Queretaro": [], "Quintana Roo": [], "San Luis Potosi": [], "Sinaloa": [],
+        "Sonora": [], "Tabasco": [], "Tamaulipas": [], "Tlaxcala": [],
+        "Veracruz": [], "Yucatan": [], "Zacatecas": [],
+        "Mexico City": ["Ciudad de Mexico", "CDMX"],
+        "State of Mexico": ["Estado de Mexico", "Edomex"],
+    },
+    "Pakistan": {
+        "Punjab": ["Lahore", "Faisalabad", "Multan"],
+        "Sindh": ["Karachi", "Hyderabad"],
+        "Khyber Pakhtunkhwa": ["Peshawar"],
+        "Balochistan": ["Baluchistan", "Quetta", "Gwadar"],
+        "Gilgit-Baltistan": [],
+        "Azad Kashmir": [],
+        "Islamabad Capital Territory": [],
+    },
+    "Indonesia": {
+        "Aceh": [], "North Sumatra": ["Medan"], "West Sumatra": [], "Riau": [],
+        "Riau Islands": [], "Jambi": [], "South Sumatra": [], "Bangka Belitung": [],
+        "Bengkulu": [], "Lampung": [], "Jakarta": [], "West Java": ["Bandung"],
+        "Banten": [], "Central Java": ["Semarang"], "Yogyakarta": [],
+        "East Java": ["Surabaya"], "Bali": [], "West Nusa Tenggara": [],
+        "East Nusa Tenggara": [], "West Kalimantan": [], "Central Kalimantan": [],
+        "South Kalimantan": [], "East Kalimantan": [], "North Kalimantan": [],
+        "North Sulawesi": [], "Gorontalo": [], "Central Sulawesi": [],
+        "West Sulawesi": [], "South Sulawesi": ["Makassar"], "Southeast Sulawesi": [],
+        "Maluku": [], "North Maluku": [], "Papua": [], "West Papua": [],
+    },
+    "Malaysia": {
+        "Johor": [], "Kedah": [], "Kelantan": [], "Malacca": ["Melaka"],
+        "Negeri Sembilan": [], "Pahang": [], "Penang": [], "Perak": [],
+        "Perlis": [], "Sabah": [], "Sarawak": [], "Selangor": ["Port Klang"],
+        "Terengganu": [], "Kuala Lumpur": [], "Labuan": [], "Putrajaya": [],
+    },
+    "Nigeria": {
+        "Abia": [], "Adamawa": [], "Akwa Ibom": [], "Anambra": [], "Bauchi": [],
+        "Bayelsa": [], "Benue": [], "Borno": [], "Cross River": [],
+        "Delta State": [], "Ebonyi": [], "Edo State": [], "Ekiti": [], "Enugu": [],
+        "Gombe": [], "Imo State": [], "Jigawa": [], "Kaduna": [], "Kano": [],
+        "Katsina": [], "Kebbi": [], "Kogi": [], "Kwara": [], "Lagos": [],
+        "Nasarawa": [], "Niger State": [], "Ogun": [], "Ondo": [], "Osun": [],
+        "Oyo": [], "Plateau State": [], "Rivers State": ["Port Harcourt"],
+        "Sokoto": [], "Taraba": [], "Yobe": [], "Zamfara": [],
+        "Federal Capital Territory": ["FCT"],
+    },
+    "Germany": {
+        "Baden-Wurttemberg": ["Stuttgart"], "Bavaria": ["Bayern", "Munich"],
+        "Berlin": [], "Brandenburg": [], "Bremen": [], "Hamburg": [],
+        "Hesse": ["Hessen", "Frankfurt"], "Lower Saxony": ["Niedersachsen"],
+        "Mecklenburg-Vorpommern": [], "North Rhine-Westphalia": ["NRW", "Cologne", "Dusseldorf"],
+        "Rhineland-Palatinate": [], "Saarland": [], "Saxony": ["Sachsen"],
+        "Saxony-Anhalt": [], "Schleswig-Holstein": [], "Thuringia": [],
+    },
+    "France": {
+        "Auvergne-Rhone-Alpes": ["Lyon"], "Bourgogne-Franche-Comte": ["Burgundy"],
+        "Brittany": ["Bretagne"], "Centre-Val de Loire": [], "Corsica": [],
+        "Grand Est": ["Alsace", "Strasbourg"], "Hauts-de-France": [],
+        "Ile-de-France": [], "Normandy": ["Normandie", "Rouen"],
+        "Nouvelle-Aquitaine": ["Bordeaux"], "Occitanie": ["Toulouse"],
+        "Pays de la Loire": ["Nantes"], "Provence-Alpes-Cote d'Azur": ["Provence", "Marseille"],
+    },
+    "Italy": {
+        "Abruzzo": [], "Aosta Valley": [], "Apulia": ["Puglia"], "Basilicata": [],
+        "Calabria": [], "Campania": ["Naples"], "Emilia-Romagna": ["Bologna"],
+        "Friuli-Venezia Giulia": [], "Lazio": [], "Liguria": ["Genoa"],
+        "Lombardy": ["Lombardia", "Milan"], "Marche": [], "Molise": [],
+        "Piedmont": ["Piemonte", "Turin"], "Sardinia": [], "Sicily": ["Sicilia"],
+        "Trentino-Alto Adige": [], "Tuscany": ["Toscana", "Florence"],
+        "Umbria": [], "Veneto": ["Venice"],
+    },
+    "Spain": {
+        "Andalusia": ["Andalucia", "Seville"], "Aragon": [], "Asturias": [],
+        "Balearic Islands": [], "Basque Country": [], "Canary Islands": [],
+        "Cantabria": [], "Castile and Leon": ["Castilla y Leon"],
+        "Castilla-La Mancha": [], "Catalonia": ["Catalunya", "Barcelona"],
+        "Extremadura": [], "Galicia": [], "La Rioja": [],
+        "Community of Madrid": [], "Murcia": [], "Navarre": ["Navarra"],
+        "Valencian Community": ["Valencia"],
+    },
+    "Kazakhstan": {
+        "Abai Region": [], "Akmola Region": ["Akmola"], "Aktobe Region": ["Aktobe"],
+        "Almaty Region": ["Almaty"], "Atyrau Region": ["Atyrau"],
+        "East Kazakhstan Region": ["East Kazakhstan"], "Jambyl Region": ["Jambyl"],
+        "Jetisu Region": [], "Karaganda Region": ["Karaganda"],
+        "Kostanay Region": ["Kostanay"], "Kyzylorda Region": ["Kyzylorda"],
+        "Mangystau Region": ["Mangystau"], "North Kazakhstan Region": ["North Kazakhstan"],
+        "Pavlodar Region": ["Pavlodar"], "Turkistan Region": ["Turkistan"],
+        "Ulytau Region": [], "West Kazakhstan Region": ["West Kazakhstan"],
+    },
+    "South Africa": {
+        "Eastern Cape": [], "Free State": [], "Gauteng": ["Johannesburg", "Pretoria"],
+        "KwaZulu-Natal": ["Durban"], "Limpopo": [], "Mpumalanga": [],
+        "North West Province": [], "Northern Cape": [], "Western Cape": ["Cape Town"],
+    },
+    "Ethiopia": {
+        "Addis Ababa": [], "Afar": [], "Amhara": [], "Benishangul-Gumuz": [],
+        "Dire Dawa": [], "Gambela": [], "Harari": [], "Oromia": [],
+        "Sidama": [], "Somali Region": [], "Tigray": [],
+    },
+    "United Kingdom": {
+        "England": ["London"], "Scotland": ["Scottish"], "Wales": ["Welsh"],
+        "Northern Ireland": ["Belfast"],
+    },
+    "Japan": {
+        "Hokkaido": [], "Aomori": [], "Iwate": [], "Miyagi": [], "Akita": [],
+        "Yamagata": [], "Fukushima": [], "Ibaraki": [], "Tochigi": [], "Gunma": [],
+        "Saitama": [], "Chiba": [], "Kanagawa": ["Yokohama"], "Niigata": [],
+        "Toyama": [], "Ishikawa": [], "Fukui": [], "Yamanashi": [], "Nagano": [],
+        "Gifu": [], "Shizuoka": [], "Aichi": ["Nagoya"], "Mie": [], "Shiga": [],
+        "Kyoto": [], "Osaka": [], "Hyogo": ["Kobe"], "Nara": [], "Wakayama": [],
+        "Tottori": [], "Shimane": [], "Okayama": [], "Hiroshima": [],
+        "Yamaguchi": [], "Tokushima": [], "Kagawa": [], "Ehime": [], "Kochi": [],
+        "Fukuoka": [], "Saga Prefecture": [], "Nagasaki": [], "Kumamoto": [], "Oita": [],
+        "Miyazaki": [], "Kagoshima": [], "Okinawa": [],
+    },
+    "Bangladesh": {
+        "Barisal Division": ["Barisal", "Barishal"], "Chittagong Division": ["Chittagong", "Chattogram"],
+        "Dhaka Division": ["Dhaka"], "Khulna Division": ["Khulna"],
+        "Mymensingh Division": ["Mymensingh"], "Rajshahi Division": ["Rajshahi"],
+        "Rangpur Division": ["Rangpur"], "Sylhet Division": ["Sylhet"],
+    },
+    "Poland": {
+        "Greater Poland": ["Wielkopolska"], "Kuyavian-Pomeranian": [], "Lesser Poland": ["Krakow"],
+        "Lodz Voivodeship": ["Lodz"], "Lower Silesia": ["Wroclaw"], "Lublin Voivodeship": ["Lublin"],
+        "Lubusz": [], "Masovia": ["Masovian", "Mazowsze"], "Opole Voivodeship": ["Opole"],
+        "Podlaskie": [], "Pomerania": ["Pomeranian", "Gdansk"], "Silesia": ["Silesian", "Katowice"],
+        "Subcarpathia": ["Subcarpathian", "Rzeszow"], "Swietokrzyskie": [],
+        "Warmia-Masuria": ["Warmian-Masurian"], "West Pomerania": ["West Pomeranian", "Szczecin"],
+    },
+    "Vietnam": {
+        "An Giang": [], "Can Tho": [], "Dak Lak": ["Daklak"], "Dong Thap": [],
+        "Gia Lai": [], "Kien Giang": [], "Lam Dong": [], "Long An": [],
+        "Soc Trang": [], "Tien Giang": [], "Ho Chi Minh City": ["Saigon", "HCMC"],
+        "Hanoi": [], "Hai Phong": ["Haiphong"], "Da Nang": ["Danang"],
+    },
+    "Thailand": {
+        "Bangkok": [], "Chiang Mai": [], "Chiang Rai": [], "Khon Kaen": [],
+        "Nakhon Ratchasima": ["Korat"], "Ubon Ratchathani": [], "Udon Thani": [],
+        "Surat Thani": [], "Songkhla": [], "Chonburi": ["Laem Chabang"],
+        "Suphan Buri": [], "Nakhon Sawan": [], "Phitsanulok": [], "Buriram": [],
+    },
+    "Philippines": {
+        "Metro Manila": ["Manila"], "Central Luzon": [], "Cagayan Valley": [],
+        "Ilocos Region": ["Ilocos"], "Calabarzon": [], "Bicol Region": ["Bicol"],
+        "Western Visayas": [], "Central Visayas": ["Cebu"], "Eastern Visayas": [],
+        "Davao Region": ["Davao"], "Northern Mindanao": [], "Soccsksargen": [],
+    },
+}
+
+
+# Phrases that name a country without a subdivision (capitals used as
+# metonyms, agricultural belts) or a multi-country region (mapped to None).
+# Matching these also stops shorter, misleading aliases from firing, e.g.
+# "South American" must not be read as "American".
+REGIONS: Dict[str, Optional[str]] = {
+    "Washington": "United States",
+    "White House": "United States",
+    "Midwest": "United States",
+    "US Midwest": "United States",
+    "Corn Belt": "United States",
+    "Great Plains": "United States",
+    "Beijing": "China",
+    "Moscow": "Russia",
+    "Kremlin": "Russia",
+    "Kyiv": "Ukraine",
+    "Kiev": "Ukraine",
+    "New Delhi": "India",
+    "Tokyo": "Japan",
+    "Brasilia": "Brazil",
+    "Ottawa": "Canada",
+    "Canberra": "Australia",
+    "Islamabad": "Pakistan",
+    "Ankara": "Turkey",
+    "Istanbul": "Turkey",
+    "Tehran": "Iran",
+    "Riyadh": "Saudi Arabia",
+    "Cairo": "Egypt",
+    "Dubai": "United Arab Emirates",
+    "Abu Dhabi": "United Arab Emirates",
+    "Abuja": "Nigeria",
+    "Nairobi": "Kenya",
+    "Mekong Delta": "Vietnam",
+    "Sumatra": "Indonesia",
+    "Java": "Indonesia",
+    "Kalimantan": "Indonesia",
+    "Sulawesi": "Indonesia",
+    "Borneo": None,
+    "Black Sea": None,
+    "Southeast Asia": None,
+    "South Asia": None,
+    "East Asia": None,
+    "Central Asia": None,
+    "Asia Pacific": None,
+    "Middle East": None,
+    "Latin America": None,
+    "Latin American": None,
+    "South America": None,
+    "South American": None,
+    "North America": None,
+    "North American": None,
+    "Central America": None,
+    "Central American": None,
+    "Sub-Saharan Africa": None,
+    "West Africa": None,
+    "West African": None,
+    "East Africa": None,
+    "East African": None,
+    "North Africa": None,
+    "Southern Africa": None,
+    "European Union": None,
+    "EU": None,
+    "Western Europe": None,
+    "Eastern Europe": None,
+    "Persian Gulf": None,
+    "Gulf of Mexico": None,
+    "Indian Ocean": None,
+    "New Guinea": None,
+    "Native American": None,
+    "Korean Peninsula": None,
+}
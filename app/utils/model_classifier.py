@@ -0,0 +1,260 @@
+"""
+Statistical category classifier (multinomial naive Bayes over hashed features)
+"""
+from typing import Iterable, List, Optional, Tuple
+import logging
+import os
+import re
+import zlib
+import numpy as np
+from app.models.schemas import NewsCategory
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class NaiveBayesCategoryClassifier:
+    """
+    Classifies news articles with a naive Bayes model trained offline
+
+    Text is turned into unigram and bigram features hashed into a fixed
+    number of buckets, so no vocabulary has to be stored. A batch of
+    articles becomes one sparse (row, feature, count) matrix and is scored
+    against the log-probability table with a single vectorized pass.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, alpha: float = 0.5):
+        """
+        Initialize an untrained classifier
+
+        Args:
+            n_features: Number of hash buckets (power of two)
+            alpha: Additive (Laplace/Lidstone) smoothing
+        """
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+
+        self.n_features = n_features
+        self.alpha = alpha
+        self.categories: List[NewsCategory] = []
+        self.class_log_prior: Optional[np.ndarray] = None
+        # (n_features, n_classes) so a feature lookup is one contiguous row
+        self.feature_log_prob: Optional[np.ndarray] = None
+
+    def _features(self, text: str) -> List[int]:
+        """Hash unigram and bigram tokens of text into feature indices"""
+        tokens = _WORD_RE.findall(text.lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        mask = self.n_features - 1
+        return [zlib.crc32(gram.encode("utf-8")) & mask for gram in grams]
+
+    def transform(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Vectorize texts into a sparse count matrix in COO form
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            Tuple of (rows, cols, counts, n_rows)
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        n_rows = 0
+
+        for n_rows, text in enumerate(texts, start=1):
+            features = self._features(text or "")
+            cols.extend(features)
+            rows.extend([n_rows - 1] * len(features))
+
+        if not cols:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32), n_rows
+
+        # Collapse repeated (row, feature) pairs into counts
+        keys = np.asarray(rows, dtype=np.int64) * self.n_features + np.asarray(cols, dtype=np.int64)
+        unique, counts = np.unique(keys, return_counts=True)
+        return (
+            unique // self.n_features,
+            unique % self.n_features,
+            counts.astype(np.float32),
+            n_rows
+        )
+
+    def fit(self, texts: List[str], labels: List[NewsCategory]) -> "NaiveBayesCategoryClassifier":
+        """
+        Train the model from labelled texts
+
+        Args:
+            texts: Article texts (headline and summary)
+            labels: Category for each text
+
+        Returns:
+            self
+        """
+        if len(texts) != len(labels) or not texts:
+            raise ValueError("texts and labels must be non-empty and of equal length")
+
+        self.categories = sorted(set(labels), key=lambda c: list(NewsCategory).index(c))
+        class_index = {category: i for i, category in enumerate(self.categories)}
+        y = np.array([class_index[label] for label in labels], dtype=np.int64)
+        n_classes = len(self.categories)
+
+        rows, cols, counts, _ = self.transform(texts)
+
+        feature_counts = np.zeros((self.n_features, n_classes), dtype=np.float64)
+        np.add.at(feature_counts, (cols, y[rows]), counts)
+        feature_counts += self.alpha
+
+        self.feature_log_prob = (
+            np.log(feature_counts) - np.log(feature_counts.sum(axis=0, keepdims=True))
+        ).astype(np.float32)
+
+        class_counts = np.bincount(y, minlength=n_classes).astype(np.float64)
+        self.class_log_prior = np.log(class_counts / class_counts.sum()).astype(np.float32)
+
+        return self
+
+    def predict_batch(self, texts: List[str]) -> List[NewsCategory]:
+        """
+        Classify a batch of texts
+
+        Args:
+            texts: Combined headline and summary texts
+
+        Returns:
+            NewsCategory for each text; OVERVIEW for texts without features
+        """
+        if self.feature_log_prob is None:
+            raise RuntimeError("Classifier has not been trained or loaded")
+
+        rows, cols, counts, n_rows = self.transform(texts)
+        if n_rows == 0:
+            return []
+
+        # Sparse (n_rows x n_features) @ dense (n_features x n_classes):
+        # gather the rows of the weight table and sum them per document
+        contributions = self.feature_log_prob[cols] * counts[:, None]
+        scores = np.tile(self.class_log_prior, (n_rows, 1))
+        for c in range(len(self.categories)):
+            scores[:, c] += np.bincount(rows, weights=contributions[:, c], minlength=n_rows)
+
+        has_features = np.bincount(rows, minlength=n_rows) > 0
+        best = scores.argmax(axis=1)
+
+        return [
+            self.categories[i] if has_features[row] else NewsCategory.OVERVIEW
+            for row, i in enumerate(best)
+        ]
+
+    def classify(self, text: str) -> NewsCategory:
+        """
+        Classify text into a news category
+
+        Args:
+            text: Combined headline and summary text
+
+        Returns:
+            NewsCategory enum value
+        """
+        if not text:
+            return NewsCategory.OVERVIEW
+        return self.predict_batch([text])[0]
+
+    def classify_article(self, headline: str, summary: Optional[str] = None) -> NewsCategory:
+        """
+        Classify a news article based on headline and summary
+
+        Args:
+            headline: Article headline
+            summary: Article summary (optional)
+
+        Returns:
+            NewsCategory enum value
+        """
+        combined_text = headline
+        if summary:
+            combined_text += " " + summary
+
+        return self.classify(combined_text)
+
+    def classify_articles(self, items: List[Tuple[str, Optional[str]]]) -> List[NewsCategory]:
+        """
+        Classify a batch of articles in one vectorized pass
+
+        Args:
+            items: (headline, summary) pairs
+
+        Returns:
+            NewsCategory for each item
+        """
+        return self.predict_batch([f"{headline} {summary}" if summary else headline for headline, summary in items])
+
+    def save(self, path: str) -> None:
+        """
+        Save model weights to a .npz file
+
+        Args:
+            path: Output file path
+        """
+        if self.feature_log_prob is None:
+            raise RuntimeError("Classifier has not been trained")
+
+        np.savez_compressed(
+            path,
+            n_features=np.array(self.n_features),
+            alpha=np.array(self.alpha),
+            categories=np.array([c.value for c in self.categories]),
+            class_log_prior=self.class_log_prior,
+            feature_log_prob=self.feature_log_prob
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesCategoryClassifier":
+        """
+        Load model weights saved with save()
+
+        Args:
+            path: Model file path
+
+        Returns:
+            Trained classifier
+        """
+        with np.load(path) as data:
+            model = cls(n_features=int(data["n_features"]), alpha=float(data["alpha"]))
+            model.categories = [NewsCategory(value) for value in data["categories"]]
+            model.class_log_prior = data["class_log_prior"]
+            model.feature_log_prob = data["feature_log_prob"]
+        return model
+
+
+def load_model_classifier(path: str) -> Optional[NaiveBayesCategoryClassifier]:
+    """
+    Load the configured model, falling back to None (keyword engine)
+
+    Args:
+        path: Model file path; empty disables the model
+
+    Returns:
+        Loaded classifier or None
+    """
+    if not path:
+        return None
+
+    if not os.path.exists(path):
+        logger.warning(f"Category model {path} not found, using keyword classifier")
+        return None
+
+    try:
+        model = NaiveBayesCategoryClassifier.load(path)
+        logger.info(f"Loaded category model from {path}")
+        return model
+    except Exception as e:
+        logger.error(f"Failed to load category model {path}: {str(e)}")
+        return None
+
+
+# Global model classifier instance (None when no model is configured)
+model_classifier = load_model_classifier(settings.CATEGORY_MODEL_PATH)
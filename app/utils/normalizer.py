@@ -1,9 +1,39 @@
 """
 Data normalization utilities
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+import re
+import zlib
+import numpy as np
 from app.models.schemas import NewsArticle
+from app.config import settings
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Which copy of a syndicated story to keep: publishers' own feeds first,
+# then search results, then aggregated/LLM summaries
+SOURCE_PRIORITY = {
+    "zee_business": 4,
+    "agro_portals": 3,
+    "google_search": 2,
+    "baidu_news": 1,
+    "perplexity": 0
+}
+
+# Price-movement words: headlines that differ in direction ("Wheat prices
+# rise ..." / "Wheat prices fall ...") are different stories, however many
+# other words they share
+MOVEMENT_DIRECTION = {
+    **{word: 1 for word in (
+        "rise", "rises", "rising", "rose", "up", "higher", "gain", "gains", "climb", "climbs",
+        "surge", "surges", "jump", "jumps", "rally", "rallies", "soar", "soars", "increase", "bullish"
+    )},
+    **{word: -1 for word in (
+        "fall", "falls", "falling", "fell", "down", "lower", "loss", "losses", "drop", "drops",
+        "plunge", "plunges", "slump", "slumps", "slide", "slides", "decline", "declines", "decrease", "bearish"
+    )}
+}
 
 
 def normalize_timestamp(timestamp: Any) -> datetime:
@@ -28,28 +58,199 @@ def normalize_timestamp(timestamp: Any) -> datetime:
     return datetime.utcnow()
 
 
-def deduplicate_articles(articles: List[NewsArticle]) -> List[NewsArticle]:
+# MinHash signature length; banded into (bands x rows) for LSH
+MINHASH_PERMUTATIONS = 32
+_MINHASH_SEEDS = np.array(
+    [(0x9E3779B97F4A7C15 * (i + 1)) & 0xFFFFFFFFFFFFFFFF for i in range(MINHASH_PERMUTATIONS)],
+    dtype=np.uint64
+)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: a cheap, well-spread 64-bit hash"""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def headline_tokens(text: Optional[str]) -> frozenset:
+    """Lowercased word set used to compare headlines"""
+    return frozenset(_WORD_RE.findall((text or "").lower())) or frozenset([""])
+
+
+def minhash_signatures(token_sets: List[frozenset]) -> np.ndarray:
     """
-    Remove duplicate articles based on headline similarity
+    Compute MinHash signatures for a batch of token sets
+    
+    Every token is hashed once, then all permutations of all tokens are
+    evaluated and min-reduced per set in vectorized passes.
     
     Args:
-        articles: List of articles
+        token_sets: One token set per document
         
     Returns:
-        Deduplicated list
+        Array of shape (len(token_sets), MINHASH_PERMUTATIONS)
+    """
+    if not token_sets:
+        return np.zeros((0, MINHASH_PERMUTATIONS), dtype=np.uint64)
+    
+    counts = np.array([len(tokens) for tokens in token_sets], dtype=np.int64)
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode("utf-8")) for tokens in token_sets for token in tokens),
+        dtype=np.uint64,
+        count=int(counts.sum())
+    )
+    permuted = _mix64(hashes[:, None] ^ _MINHASH_SEEDS[None, :])
+    offsets = np.cumsum(counts) - counts
+    return np.minimum.reduceat(permuted, offsets, axis=0)
+
+
+def _lsh_shape(threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) so candidate pairs start around the threshold
+    
+    Pairs with Jaccard similarity s become candidates with probability
+    1 - (1 - s^rows)^bands, an S-curve whose knee is near (1/bands)^(1/rows).
+    """
+    best = (MINHASH_PERMUTATIONS, 1)
+    rows = 1
+    while rows <= MINHASH_PERMUTATIONS:
+        bands = MINHASH_PERMUTATIONS // rows
+        if (1 / bands) ** (1 / rows) <= threshold - 0.05:
+            best = (bands, rows)
+        rows *= 2
+    return best
+
+
+def _opposite_moves(tokens: frozenset, other: frozenset) -> bool:
+    """Whether the words only one of two headlines has move prices in opposite directions"""
+    ours = {MOVEMENT_DIRECTION[word] for word in tokens - other if word in MOVEMENT_DIRECTION}
+    theirs = {MOVEMENT_DIRECTION[word] for word in other - tokens if word in MOVEMENT_DIRECTION}
+    return bool(ours) and bool(theirs) and ours.isdisjoint(theirs)
+
+
+def _source_rank(article: NewsArticle) -> Tuple[bool, int, int]:
+    """Sort key for the best-sourced copy of a story (higher is better)"""
+    return (
+        bool(article.url),
+        SOURCE_PRIORITY.get(article.source, 0),
+        len(article.summary or "")
+    )
+
+
+class ArticleDeduplicator:
+    """
+    Incremental near-duplicate filter based on MinHash-LSH
+    
+    Headline word sets are reduced to MinHash signatures that are split
+    into bands; only articles sharing a band bucket are compared, so the
+    cost grows with the number of similar articles rather than with every
+    pair. Candidates are confirmed by exact Jaccard similarity, unless
+    their headlines move prices in opposite directions.
     """
-    seen_headlines = set()
-    unique_articles = []
     
-    for article in articles:
-        # Simple deduplication based on headline
-        headline_key = article.headline.lower().strip()
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Initialize the deduplicator
+        
+        Args:
+            threshold: Min Jaccard similarity of headline words for two
+                articles to count as duplicates (defaults to
+                DEDUP_SIMILARITY_THRESHOLD; 1.0 = same words only)
+        """
+        if threshold is None:
+            threshold = settings.DEDUP_SIMILARITY_THRESHOLD
+        self.threshold = threshold
+        
+        self._bands, self._rows = _lsh_shape(threshold)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self._bands)]
+        self._token_sets: List[frozenset] = []
+        self.articles: List[NewsArticle] = []
+    
+    def __len__(self) -> int:
+        return len(self.articles)
+    
+    def add(
+        self,
+        article: NewsArticle,
+        tokens: Optional[frozenset] = None,
+        signature: Optional[np.ndarray] = None
+    ) -> bool:
+        """
+        Add an article unless it near-duplicates one already kept
+        
+        When it does, the better-sourced of the two copies is kept in the
+        original position.
+        
+        Args:
+            article: Article to add
+            tokens: Precomputed headline tokens (computed if omitted)
+            signature: Precomputed MinHash signature (computed if omitted)
+            
+        Returns:
+            True if the article was new, False if it was a duplicate
+        """
+        if tokens is None:
+            tokens = headline_tokens(article.headline)
+        if signature is None:
+            signature = minhash_signatures([tokens])[0]
+        
+        keys = [
+            signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            for band in range(self._bands)
+        ]
+        
+        for band, key in enumerate(keys):
+            for index in self._buckets[band].get(key, ()):
+                kept = self._token_sets[index]
+                if len(tokens & kept) >= self.threshold * len(tokens | kept) and not _opposite_moves(tokens, kept):
+                    if _source_rank(article) > _source_rank(self.articles[index]):
+                        # Later copies are compared with the headline now kept;
+                        # the replaced one's buckets still lead here too
+                        self.articles[index] = article
+                        self._token_sets[index] = tokens
+                        self._index(index, keys)
+                    return False
+        
+        index = len(self.articles)
+        self.articles.append(article)
+        self._token_sets.append(tokens)
+        self._index(index, keys)
         
-        if headline_key not in seen_headlines:
-            seen_headlines.add(headline_key)
-            unique_articles.append(article)
+        return True
+    
+    def _index(self, index: int, keys: List[bytes]) -> None:
+        """Add a kept article to the bucket of each of its band keys"""
+        for band, key in enumerate(keys):
+            bucket = self._buckets[band].setdefault(key, [])
+            if index not in bucket:
+                bucket.append(index)
+
+
+def deduplicate_articles(
+    articles: List[NewsArticle],
+    threshold: Optional[float] = None
+) -> List[NewsArticle]:
+    """
+    Remove duplicate and near-duplicate articles based on headline similarity
+    
+    Args:
+        articles: List of articles
+        threshold: Min Jaccard similarity of headline words to count as a
+            duplicate (defaults to DEDUP_SIMILARITY_THRESHOLD)
+        
+    Returns:
+        Deduplicated list, keeping the best-sourced copy of each story
+    """
+    deduplicator = ArticleDeduplicator(threshold)
+    token_sets = [headline_tokens(article.headline) for article in articles]
+    signatures = minhash_signatures(token_sets)
+    
+    for article, tokens, signature in zip(articles, token_sets, signatures):
+        deduplicator.add(article, tokens, signature)
     
-    return unique_articles
+    return deduplicator.articles
 
 
 def merge_tags(tags1: List[str], tags2: List[str]) -> List[str]:
@@ -0,0 +1,69 @@
+"""
+Compare the keyword classifier with the naive Bayes model
+
+Reports accuracy and throughput of both engines on a labelled JSON Lines
+file (same format as train_classifier.py). Without --model, the file is
+split into train/test portions and a model is trained on the fly.
+
+Usage:
+    python benchmark_classifier.py labelled.jsonl
+    python benchmark_classifier.py labelled.jsonl --model models/category_nb.npz
+"""
+import argparse
+import random
+import time
+
+from app.utils.category_classifier import CategoryClassifier
+from app.utils.model_classifier import NaiveBayesCategoryClassifier
+from train_classifier import load_labelled
+
+
+def accuracy(predicted, expected) -> float:
+    """Share of predictions matching the labels"""
+    return sum(p == e for p, e in zip(predicted, expected)) / len(expected) if expected else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="Labelled articles (.jsonl)")
+    parser.add_argument("--model", help="Trained model (.npz); trains on a split when omitted")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Held-out share when training")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args()
+
+    texts, labels = load_labelled(args.data)
+
+    if args.model:
+        model = NaiveBayesCategoryClassifier.load(args.model)
+        test_texts, test_labels = texts, labels
+    else:
+        pairs = list(zip(texts, labels))
+        random.Random(42).shuffle(pairs)
+        split = int(len(pairs) * (1 - args.test_size))
+        train, test = pairs[:split], pairs[split:]
+        model = NaiveBayesCategoryClassifier().fit([t for t, _ in train], [l for _, l in train])
+        test_texts, test_labels = [t for t, _ in test], [l for _, l in test]
+
+    keyword = CategoryClassifier()
+
+    results = {}
+    for name, run in (
+        ("keyword", lambda: [keyword.classify(t) for t in test_texts]),
+        ("naive_bayes (per article)", lambda: [model.classify(t) for t in test_texts]),
+        ("naive_bayes (batch)", lambda: model.predict_batch(test_texts)),
+    ):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            predicted = run()
+            best = min(best, time.perf_counter() - start)
+        results[name] = (accuracy(predicted, test_labels), len(test_texts) / best if best else 0.0)
+
+    print(f"Evaluated on {len(test_texts)} articles")
+    print(f"{'engine':<28}{'accuracy':>10}{'articles/s':>14}")
+    for name, (acc, rate) in results.items():
+        print(f"{name:<28}{acc:>10.3f}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
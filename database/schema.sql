@@ -60,6 +60,7 @@ CREATE TABLE api_keys (
     api_key VARCHAR(255) UNIQUE NOT NULL,
     is_active BOOLEAN DEFAULT TRUE,
     last_used_at TIMESTAMP WITH TIME ZONE,
+    usage_count BIGINT NOT NULL DEFAULT 0, -- Calls made with this key (flushed periodically)
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     expires_at TIMESTAMP WITH TIME ZONE
 );
@@ -79,16 +80,46 @@ CREATE TABLE demo_requests (
     notes TEXT
 );
 
--- User activity logs
+-- User activity logs, range-partitioned by created_at. The application
+-- creates upcoming partitions (activity_logs_pYYYYMM or _pYYYYMMDD) and
+-- drops the ones past ACTIVITY_LOG_RETENTION_DAYS; see ACTIVITY_LOG_* settings.
 CREATE TABLE activity_logs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(id) ON DELETE SET NULL,
     action VARCHAR(100) NOT NULL, -- 'login', 'logout', 'api_call', 'export_data', etc.
     resource VARCHAR(255), -- What resource was accessed
     ip_address INET,
     user_agent TEXT,
     metadata JSONB DEFAULT '{}', -- Additional context
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows outside every managed partition
+CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT;
+
+-- Hourly activity rollups for usage charts, written with each activity batch.
+-- Anonymous activity is counted under the nil UUID.
+CREATE TABLE activity_hourly (
+    hour TIMESTAMP WITH TIME ZONE NOT NULL,
+    user_id UUID NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    calls BIGINT NOT NULL DEFAULT 0,
+    last_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (hour, user_id, action)
+);
+
+-- Per-user dashboard counters, maintained incrementally: saved query and
+-- alert triggers below, api_call batches by the application's activity
+-- writer. Periodically reconciled against the base tables (api calls from
+-- activity_hourly, which outlives raw activity_logs partitions).
+CREATE TABLE user_dashboard_counters (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    saved_queries_count INTEGER NOT NULL DEFAULT 0,
+    active_alerts_count INTEGER NOT NULL DEFAULT 0,
+    total_api_calls BIGINT NOT NULL DEFAULT 0,
+    last_activity TIMESTAMP WITH TIME ZONE,
+    reconciled_at TIMESTAMP WITH TIME ZONE
 );
 
 -- User saved searches/queries
@@ -102,6 +133,14 @@ CREATE TABLE saved_queries (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Articles matched by saved queries (written by ingestion)
+CREATE TABLE saved_query_matches (
+    saved_query_id UUID NOT NULL REFERENCES saved_queries(id) ON DELETE CASCADE,
+    article_key TEXT NOT NULL,
+    matched_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (saved_query_id, article_key)
+);
+
 -- User alerts/notifications
 CREATE TABLE user_alerts (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -146,10 +185,13 @@ CREATE INDEX idx_api_keys_user_id ON api_keys(user_id);
 CREATE INDEX idx_api_keys_api_key ON api_keys(api_key);
 CREATE INDEX idx_activity_logs_user_id ON activity_logs(user_id);
 CREATE INDEX idx_activity_logs_created_at ON activity_logs(created_at);
+CREATE INDEX idx_activity_hourly_user ON activity_hourly(user_id, hour);
 CREATE INDEX idx_demo_requests_status ON demo_requests(status);
 CREATE INDEX idx_demo_requests_created_at ON demo_requests(created_at);
 CREATE INDEX idx_saved_queries_user_id ON saved_queries(user_id);
+CREATE INDEX idx_saved_query_matches_time ON saved_query_matches(saved_query_id, matched_at DESC);
 CREATE INDEX idx_user_alerts_user_id ON user_alerts(user_id);
+CREATE INDEX idx_user_alerts_active ON user_alerts(alert_type, commodity) WHERE is_active;
 CREATE INDEX idx_verification_tokens_token ON verification_tokens(token);
 
 -- Function to update updated_at timestamp
@@ -183,6 +225,58 @@ CREATE TRIGGER update_user_alerts_updated_at BEFORE UPDATE ON user_alerts
 --     ('demo@ananta.ai', 'hashed_password_here', 'Demo User', 'Ananta AI', 'Product Manager'),
 --     ('test@example.com', 'hashed_password_here', 'Test User', 'Test Corp', 'Analyst');
 
+-- Dashboard counter maintenance. Users being deleted are skipped: deleting
+-- a user cascades to their saved queries and alerts, whose triggers must not
+-- re-create the counter row the same cascade removes.
+CREATE OR REPLACE FUNCTION bump_dashboard_counters(
+    p_user_id UUID, p_saved_queries INTEGER, p_active_alerts INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_user_id IS NULL OR (p_saved_queries = 0 AND p_active_alerts = 0) THEN
+        RETURN;
+    END IF;
+    INSERT INTO user_dashboard_counters (user_id, saved_queries_count, active_alerts_count)
+    SELECT p_user_id, p_saved_queries, p_active_alerts
+    WHERE EXISTS (SELECT 1 FROM users WHERE id = p_user_id)
+    ON CONFLICT (user_id) DO UPDATE SET
+        saved_queries_count = user_dashboard_counters.saved_queries_count + EXCLUDED.saved_queries_count,
+        active_alerts_count = user_dashboard_counters.active_alerts_count + EXCLUDED.active_alerts_count;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION count_saved_queries()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_dashboard_counters(OLD.user_id, -1, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_dashboard_counters(NEW.user_id, 1, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE FUNCTION count_active_alerts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+        PERFORM bump_dashboard_counters(OLD.user_id, 0, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+        PERFORM bump_dashboard_counters(NEW.user_id, 0, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER count_saved_queries AFTER INSERT OR DELETE OR UPDATE OF user_id ON saved_queries
+    FOR EACH ROW EXECUTE FUNCTION count_saved_queries();
+
+CREATE TRIGGER count_active_alerts AFTER INSERT OR DELETE OR UPDATE OF user_id, is_active ON user_alerts
+    FOR EACH ROW EXECUTE FUNCTION count_active_alerts();
+
 -- Views for common queries
 CREATE VIEW active_subscriptions AS
 SELECT 
@@ -197,16 +291,14 @@ FROM users u
 JOIN subscriptions s ON u.id = s.user_id
 WHERE s.status = 'active';
 
+-- Reads one counter row per user instead of aggregating activity_logs
 CREATE VIEW user_dashboard_stats AS
 SELECT 
     u.id as user_id,
     u.email,
-    COUNT(DISTINCT sq.id) as saved_queries_count,
-    COUNT(DISTINCT ua.id) as active_alerts_count,
-    COUNT(DISTINCT al.id) as total_api_calls,
-    MAX(al.created_at) as last_activity
+    COALESCE(c.saved_queries_count, 0) as saved_queries_count,
+    COALESCE(c.active_alerts_count, 0) as active_alerts_count,
+    COALESCE(c.total_api_calls, 0) as total_api_calls,
+    c.last_activity
 FROM users u
-LEFT JOIN saved_queries sq ON u.id = sq.user_id
-LEFT JOIN user_alerts ua ON u.id = ua.user_id AND ua.is_active = TRUE
-LEFT JOIN activity_logs al ON u.id = al.user_id AND al.action = 'api_call'
-GROUP BY u.id, u.email;
+LEFT JOIN user_dashboard_counters c ON u.id = c.user_id;
@@ -0,0 +1,12 @@
+"""
+Test configuration: point every on-disk store at a temporary directory
+"""
+import os
+import tempfile
+
+# Settings are read when app.config is first imported, so this runs first
+_data_dir = tempfile.mkdtemp(prefix="ananta-tests-")
+os.environ.setdefault("ARTICLE_STORE_URL", f"sqlite:///{_data_dir}/articles.db")
+os.environ.setdefault("DEDUP_INDEX_PATH", f"{_data_dir}/dedup_index.db")
+os.environ.setdefault("INGEST_ENABLED", "False")
+os.environ.setdefault("DATABASE_URL", "")
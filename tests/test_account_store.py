@@ -0,0 +1,207 @@
+"""
+Tests for the account store backends
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.services import account_store as accounts
+from app.services.account_store import PostgresAccountStore, SQLiteAccountStore
+from app.services.database import Database, DatabaseUnavailableError
+
+
+def test_backends_implement_every_store_method():
+    for backend in (SQLiteAccountStore, PostgresAccountStore):
+        assert not backend.__abstractmethods__, f"{backend.__name__} does not implement {set(backend.__abstractmethods__)}"
+
+
+def test_activity_feeds_rollups_and_dashboard_counters(tmp_path):
+    async def main():
+        store = SQLiteAccountStore(str(tmp_path / "accounts.db"))
+        at = datetime(2024, 5, 1, 10, 15)
+        written = await store.insert_activity([
+            ("user-1", "api_call", "/api/v1/news", "127.0.0.1", "pytest", {"status": 200}, at),
+            ("user-1", "api_call", "/api/v1/news", "127.0.0.1", "pytest", {"status": 200}, at.replace(minute=45)),
+            (None, "api_call", "/api/v1/news", None, None, {}, at),
+            ("user-1", "login", None, None, None, {}, at)
+        ])
+        assert written == 4
+
+        stats = await store.dashboard_stats("user-1")
+        assert stats["total_api_calls"] == 2
+        assert stats["last_activity"] == at.replace(minute=45)
+
+        usage = await store.activity_usage(since=datetime(2024, 5, 1), until=datetime(2024, 5, 2), action="api_call")
+        assert usage == [{"hour": datetime(2024, 5, 1, 10), "action": "api_call", "calls": 3}]
+        await store.close()
+
+    asyncio.run(main())
+
+
+def test_alerts_round_trip_and_counters_reconcile(tmp_path):
+    async def main():
+        store = SQLiteAccountStore(str(tmp_path / "accounts.db"))
+        conn = store._connect()
+        conn.execute(
+            "INSERT INTO user_alerts (id, user_id, alert_type, commodity, threshold_value) VALUES (?, ?, ?, ?, ?)",
+            ("alert-1", "user-1", "price_change", "wheat", 3.0)
+        )
+        conn.execute("INSERT INTO user_alerts (id, user_id, alert_type, is_active) VALUES ('alert-2', 'user-1', 'price_change', 0)")
+        conn.execute(
+            "INSERT INTO saved_queries (id, user_id, name, query_params) VALUES (?, ?, ?, ?)",
+            ("q-1", "user-1", "Wheat", '{"commodity": "wheat"}')
+        )
+        conn.commit()
+
+        assert await store.load_alerts() == [("alert-1", "user-1", "price_change", "wheat", None, 3.0)]
+        assert await store.load_saved_queries() == [("q-1", "user-1", {"commodity": "wheat"})]
+        assert await store.mark_alerts_triggered([("alert-1", datetime(2024, 5, 1))]) == 1
+
+        # Drift the trigger-maintained counters, then reconcile them away
+        conn.execute("UPDATE user_dashboard_counters SET active_alerts_count = 7, saved_queries_count = 0")
+        conn.commit()
+        assert await store.reconcile_dashboard_counters() == 1
+        stats = await store.dashboard_stats("user-1")
+        assert (stats["saved_queries_count"], stats["active_alerts_count"]) == (1, 1)
+        await store.close()
+
+    asyncio.run(main())
+
+
+def test_postgres_accounts_use_the_database_layer(monkeypatch):
+    monkeypatch.setattr(accounts.settings, "ARTICLE_STORE_URL", "postgresql://localhost/articles")
+    store = accounts.create_account_store()
+    assert isinstance(store, PostgresAccountStore)
+    assert store.database is accounts.database
+
+    monkeypatch.setattr(accounts.settings, "ARTICLE_STORE_URL", "sqlite:///data/articles.db")
+    assert isinstance(accounts.create_account_store(), SQLiteAccountStore)
+
+
+def test_postgres_accounts_need_database_url():
+    with pytest.raises(DatabaseUnavailableError):
+        asyncio.run(PostgresAccountStore(Database(dsn="")).open())
+
+
+class RecordingConnection:
+    """asyncpg connection stand-in that knows one user and records writes"""
+
+    def __init__(self, users):
+        self.users = users
+        self.copied = []
+        self.statements = []
+
+    def transaction(self):
+        return _AsyncNull()
+
+    async def fetch(self, sql, user_ids):
+        assert "FOR KEY SHARE" in sql
+        return [{"id": uuid.UUID(user_id)} for user_id in user_ids if user_id in self.users]
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied.extend(records)
+
+    async def execute(self, sql, *args):
+        self.statements.append((sql, args))
+
+
+class _AsyncNull:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class RecordingDatabase:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def connect(self):
+        pass
+
+    def acquire(self):
+        conn = self.conn
+
+        class Acquire:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return Acquire()
+
+
+def test_activity_of_deleted_users_is_kept_without_its_user():
+    live, deleted = str(uuid.uuid4()), str(uuid.uuid4())
+    conn = RecordingConnection({live})
+    store = PostgresAccountStore(RecordingDatabase(conn))
+    at = datetime(2024, 5, 1, 10)
+
+    written = asyncio.run(store.insert_activity([
+        (live, "api_call", "/api/v1/news", "127.0.0.1", None, {}, at),
+        (deleted, "api_call", "/api/v1/news", "127.0.0.1", None, {}, at)
+    ]))
+    assert written == 2
+    assert [record[0] for record in conn.copied] == [live, None]
+    counters = next(args for sql, args in conn.statements if "user_dashboard_counters" in sql)
+    assert counters[0] == [live]
+
+
+class PartitionConnection:
+    """asyncpg connection stand-in for a partitioned activity_logs with a default partition"""
+
+    def __init__(self, existing=(), fail_on=None):
+        self.existing = set(existing)
+        self.fail_on = fail_on
+        self.statements = []
+
+    def transaction(self):
+        return _AsyncNull()
+
+    async def fetchval(self, sql, *args):
+        if "relkind" in sql:
+            return True
+        if "partdefid" in sql:
+            return "activity_logs_default"
+        return args[0] in self.existing
+
+    async def fetch(self, sql, *args):
+        return [(name,) for name in sorted(self.existing)]
+
+    async def execute(self, sql, *args):
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("partition constraint violated")
+        self.statements.append(sql)
+        return "DELETE 2"
+
+
+def test_open_creates_partitions_moving_rows_out_of_the_default(monkeypatch):
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_LOG_PARTITION", "month")
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_LOG_PARTITIONS_AHEAD", 1)
+    conn = PartitionConnection()
+    asyncio.run(PostgresAccountStore(RecordingDatabase(conn)).open())
+
+    attached = [sql for sql in conn.statements if "ATTACH PARTITION" in sql]
+    assert len(attached) == 2
+    moves = [sql for sql in conn.statements if sql.startswith("WITH moved")]
+    assert len(moves) == 2 and all("DELETE FROM activity_logs_default" in sql for sql in moves)
+
+
+def test_activity_maintenance_errors_are_raised_and_default_rows_expire(monkeypatch):
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_LOG_PARTITIONS_AHEAD", 0)
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_LOG_RETENTION_DAYS", 30)
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_ROLLUP_RETENTION_DAYS", 0)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(PostgresAccountStore(RecordingDatabase(PartitionConnection(fail_on="ATTACH"))).maintain_activity())
+
+    conn = PartitionConnection(existing={"activity_logs_default", "activity_logs_p200001"})
+    monkeypatch.setattr(accounts.settings, "ACTIVITY_LOG_PARTITION", "month")
+    result = asyncio.run(PostgresAccountStore(RecordingDatabase(conn)).maintain_activity())
+    assert "DROP TABLE activity_logs_p200001" in conn.statements
+    assert any(sql.startswith("DELETE FROM activity_logs_default WHERE created_at <") for sql in conn.statements)
+    assert (result["dropped"], result["deleted"]) == (1, 2)
@@ -0,0 +1,51 @@
+"""
+Tests for the batched activity writer
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services.account_store import SQLiteAccountStore
+from app.services.activity_log import ActivityLogger
+
+
+async def _api_calls(store: SQLiteAccountStore) -> int:
+    now = datetime.utcnow()
+    usage = await store.activity_usage(since=now - timedelta(hours=2), until=now + timedelta(hours=1))
+    return sum(row["calls"] for row in usage)
+
+
+def test_stop_writes_rows_still_queued(tmp_path):
+    async def main():
+        store = SQLiteAccountStore(str(tmp_path / "accounts.db"))
+        # A long flush interval keeps the first rows waiting in a batch
+        logger = ActivityLogger(store, max_queue=100, batch_size=2, flush_interval=60, policy="drop")
+        logger.start()
+        for _ in range(5):
+            assert await logger.log("api_call", user_id="user-1", resource="/api/v1/news")
+        await asyncio.sleep(0.05)
+
+        await logger.stop()
+        assert await _api_calls(store) == 5
+        assert logger.get_stats()["written"] == 5
+        # Rows logged after stopping are refused, not buffered
+        assert not await logger.log("api_call", user_id="user-1")
+        await store.close()
+
+    asyncio.run(main())
+
+
+def test_full_queue_drops_under_drop_policy(tmp_path):
+    async def main():
+        store = SQLiteAccountStore(str(tmp_path / "accounts.db"))
+        logger = ActivityLogger(store, max_queue=2, batch_size=10, flush_interval=60, policy="drop")
+        # Started but never yielded to, so the writer has not taken anything yet
+        logger.start()
+        results = [await logger.log("api_call") for _ in range(3)]
+        assert results == [True, True, False]
+        assert logger.get_stats()["dropped"] == 1
+
+        await logger.stop()
+        assert await _api_calls(store) == 2
+        await store.close()
+
+    asyncio.run(main())
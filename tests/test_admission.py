@@ -0,0 +1,109 @@
+"""
+Tests for admission control
+"""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import admission as admission_module
+from app.services.admission import AdmissionController, Overloaded, route_class
+
+
+def test_route_classes(monkeypatch):
+    monkeypatch.setattr(admission_module.article_store, "last_write", None)
+    assert route_class("/api/v1/health") == "critical"
+    assert route_class("/api/v1/cache/stats") == "critical"
+    assert route_class("/api/v1/news") == "fanout"
+    assert route_class("/api/v1/news/product/wheat") == "fanout"
+    assert route_class("/api/v1/news/perplexity") == "fanout"
+    assert route_class("/api/v1/news/changes") == "read"
+    assert route_class("/api/v1/news/changes/") == "read"
+    assert route_class("/api/v1/climate/weather") == "fanout"
+    assert route_class("/api/v1/search") == "read"
+    assert route_class("/api/v1/subscribe") == "stream"
+    assert route_class("/api/v1/news", {"stream": "sse"}) == "stream"
+
+
+def test_store_served_news_is_a_read(monkeypatch):
+    store = admission_module.article_store
+    monkeypatch.setattr(store, "last_write", None)
+    store.mark_fresh()
+    assert route_class("/api/v1/news") == "read"
+    assert route_class("/api/v1/news/product/wheat") == "read"
+    # Per-source news is always fetched live
+    assert route_class("/api/v1/news/zee_business") == "fanout"
+    # Pages are cut from a live fan-out snapshot
+    assert route_class("/api/v1/news", {"page_size": "20"}) == "fanout"
+    assert route_class("/api/v1/climate/weather") == "fanout"
+
+
+def test_streams_have_their_own_pool(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_INFLIGHT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_STREAMS", 2)
+
+    async def main():
+        controller = AdmissionController()
+        await controller.acquire("stream")
+        await controller.acquire("stream")
+        with pytest.raises(Overloaded):
+            await controller.acquire("stream")
+        # Open streams leave the request slots alone
+        await controller.acquire("read")
+        assert controller.total_inflight == 1
+
+    asyncio.run(main())
+
+
+def test_waiters_are_admitted_by_priority(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_INFLIGHT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_FANOUT_SHARE", 1.0)
+
+    async def main():
+        controller = AdmissionController()
+        await controller.acquire("read")
+        order = []
+
+        async def request(request_class):
+            await controller.acquire(request_class)
+            order.append(request_class)
+            controller.release(request_class)
+
+        fanout = asyncio.create_task(request("fanout"))
+        await asyncio.sleep(0)
+        read = asyncio.create_task(request("read"))
+        await asyncio.sleep(0)
+        controller.release("read")
+        await asyncio.gather(fanout, read)
+        assert order == ["read", "fanout"]
+
+    asyncio.run(main())
+
+
+def test_queue_timeout_sheds(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_INFLIGHT", 1)
+    monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT", 0.01)
+
+    async def main():
+        controller = AdmissionController()
+        await controller.acquire("read")
+        with pytest.raises(Overloaded):
+            await controller.acquire("read")
+        assert controller.get_stats()["shed"]["read"] == 1
+        assert controller.get_stats()["waiting"] == 0
+
+    asyncio.run(main())
+
+
+def test_lag_sheds_fanouts_first(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_MAX_LAG_MS", 100.0)
+
+    async def main():
+        controller = AdmissionController()
+        controller.lag_ms = 150.0
+        with pytest.raises(Overloaded):
+            await controller.acquire("fanout")
+        await controller.acquire("read")
+        await controller.acquire("critical")
+
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""
+Tests for the news aggregator
+"""
+import asyncio
+from datetime import datetime
+
+from app.connectors.base import BaseConnector
+from app.models.schemas import NewsArticle, NewsQuery, SourceType
+from app.services import aggregator
+from app.services.aggregator import NewsAggregatorService
+
+
+def _article(headline, **fields):
+    return NewsArticle(headline=headline, source="perplexity", **fields)
+
+
+def test_filter_articles_applies_every_filter_in_one_pass():
+    articles = [
+        _article("Corn exports rise", country="United States", commodity_tags=["grains"], tickers=["CORN"]),
+        _article("Wheat harvest starts", country="United States", commodity_tags=["grains"], tickers=["WHEAT"]),
+        _article("Gold steady", country="India", commodity_tags=["metals"], tickers=["GOLD"])
+    ]
+    service = NewsAggregatorService()
+    assert service.filter_articles(articles) is articles
+    # "USA" resolves to the canonical country name; commodity matches by substring
+    matched = service.filter_articles(articles, country="USA", commodity="grain", ticker="wheat")
+    assert [a.headline for a in matched] == ["Wheat harvest starts"]
+
+
+class WindowConnector(BaseConnector):
+    """Connector returning fixed articles, filtered by the query's time window"""
+
+    def __init__(self, articles):
+        super().__init__()
+        self.articles = articles
+
+    async def fetch_news(self, query=None, country=None, commodity=None, limit=10, news_query=None):
+        return [a for a in self.articles if self._in_window(a.timestamp, news_query)]
+
+
+def test_timezone_aware_window_is_compared_as_utc():
+    articles = [
+        _article("After the window opens", timestamp=datetime(2025, 11, 1, 6)),
+        _article("Before the window opens", timestamp=datetime(2025, 10, 31, 23))
+    ]
+    service = NewsAggregatorService()
+    service.connectors = {SourceType.PERPLEXITY: WindowConnector(articles)}
+
+    async def main():
+        for since in ("2025-11-01T00:00:00Z", "2025-11-01T05:30:00+05:30"):
+            page, ok, failed = await service.fetch_top(
+                limit=10, since=datetime.fromisoformat(since.replace("Z", "+00:00")), deduplicate=False
+            )
+            assert [a.headline for a in page] == ["After the window opens"] and not failed
+
+    asyncio.run(main())
+
+
+def _sourced(headline, source, hour, url=None):
+    return NewsArticle(headline=headline, source=source, url=url, timestamp=datetime(2025, 11, 1, hour))
+
+
+def test_merge_by_recency_interleaves_sources_newest_first():
+    streams = [
+        [_sourced("a9", "perplexity", 9), _sourced("a5", "perplexity", 5), _sourced("a1", "perplexity", 1)],
+        [_sourced("b8", "zee_business", 8), _sourced("b7", "zee_business", 7)],
+        [],
+        [_sourced("c6", "google_search", 6), _sourced("c2", "google_search", 2)]
+    ]
+    merged = NewsAggregatorService.merge_by_recency(streams)
+    assert [a.headline for a in merged] == ["a9", "b8", "b7", "c6", "a5", "c2", "a1"]
+
+
+def test_fetch_top_dedups_across_sources_and_stops_once_the_page_is_full(monkeypatch):
+    added = []
+
+    class CountingDeduplicator(aggregator.ArticleDeduplicator):
+        def add(self, article, tokens=None, signature=None):
+            added.append(article.headline)
+            return super().add(article, tokens, signature)
+
+    monkeypatch.setattr(aggregator, "ArticleDeduplicator", CountingDeduplicator)
+    service = NewsAggregatorService()
+    service.connectors = {
+        SourceType.PERPLEXITY: WindowConnector([
+            _sourced("Wheat prices surge on supply concerns", "perplexity", 10),
+            _sourced("Gold holds steady", "perplexity", 5),
+            _sourced("Old story", "perplexity", 1)
+        ]),
+        SourceType.ZEE_BUSINESS: WindowConnector([
+            _sourced("Wheat prices surge on supply concerns", "zee_business", 9, url="https://example.com/wheat"),
+            _sourced("Copper rallies", "zee_business", 8),
+            _sourced("Silver dips", "zee_business", 3)
+        ])
+    }
+
+    async def main():
+        page, ok, failed = await service.fetch_top(limit=3, limit_per_source=5)
+        # The syndicated copy replaced the perplexity one in its slot
+        assert [(a.headline, a.source) for a in page] == [
+            ("Wheat prices surge on supply concerns", "zee_business"),
+            ("Copper rallies", "zee_business"),
+            ("Gold holds steady", "perplexity")
+        ]
+        assert sorted(ok) == ["perplexity", "zee_business"] and not failed
+        # Silver and the old story were never merged
+        assert added == [
+            "Wheat prices surge on supply concerns", "Wheat prices surge on supply concerns",
+            "Copper rallies", "Gold holds steady"
+        ]
+
+        page, _, _ = await service.fetch_top(limit=3, limit_per_source=5, deduplicate=False)
+        assert [a.source for a in page] == ["perplexity", "zee_business", "zee_business"]
+
+    asyncio.run(main())
+
+
+class PushdownConnector(WindowConnector):
+    """WindowConnector claiming to push down the given predicates"""
+
+    def __init__(self, articles, pushed):
+        super().__init__(articles)
+        self.pushdown_predicates = frozenset(pushed)
+
+
+def test_only_unpushed_predicates_are_reapplied():
+    articles = [
+        _article("US wheat, in window", country="United States", commodity_tags=["grains"], timestamp=datetime(2025, 11, 2)),
+        _article("Indian wheat, in window", country="India", commodity_tags=["grains"], timestamp=datetime(2025, 11, 2)),
+        _article("US gold, in window", country="United States", commodity_tags=["metals"], timestamp=datetime(2025, 11, 2)),
+        _article("US wheat, too old", country="United States", commodity_tags=["grains"], timestamp=datetime(2025, 10, 1))
+    ]
+    query = NewsQuery(filters={"country": "United States", "commodity": "grain"}, since=datetime(2025, 11, 1))
+
+    def headlines(pushed):
+        return [a.headline for a in NewsAggregatorService._apply_remaining(PushdownConnector(articles, pushed), articles, query)]
+
+    # Nothing pushed: every filter and the window apply
+    assert headlines(()) == ["US wheat, in window"]
+    # Pushed predicates are trusted, not checked again
+    assert headlines(("country",)) == ["US wheat, in window", "Indian wheat, in window"]
+    assert headlines(("country", "commodity", "time_window")) == [a.headline for a in articles]
+    # The window is re-checked unless it was pushed
+    assert headlines(("country", "commodity")) == ["US wheat, in window", "Indian wheat, in window", "US gold, in window"]
+    assert headlines(("time_window",)) == ["US wheat, in window", "US wheat, too old"]
+
+
+def test_news_query_stores_naive_utc_bounds():
+    query = NewsQuery(since="2025-11-01T00:00:00Z", until="2025-11-01T12:00:00+02:00")
+    assert query.since == datetime(2025, 11, 1) and query.until == datetime(2025, 11, 1, 10)
+
+
+def test_product_route_accepts_utc_designator(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.routes import api
+
+    articles = [_article("Wheat rallies", tickers=["WHEAT"], timestamp=datetime(2025, 11, 2))]
+    monkeypatch.setattr(api.news_service, "connectors", {SourceType.PERPLEXITY: WindowConnector(articles)})
+    response = TestClient(app).get("/api/v1/news/product/WHEAT", params={"since": "2025-11-01T00:00:00Z", "refresh": "true"})
+    assert response.status_code == 200, response.text
+    assert [a["headline"] for a in response.json()["data"]] == ["Wheat rallies"]
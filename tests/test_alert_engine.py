@@ -0,0 +1,48 @@
+"""
+Tests for the threshold alert engine
+"""
+from app.services.alert_engine import AlertEngine
+
+
+def _engine(*rows):
+    engine = AlertEngine()
+    engine.load(rows)
+    return engine
+
+
+def test_first_tick_fires_alerts_already_past_threshold():
+    engine = _engine(("a1", "u1", "price_change", "wheat", None, 5.0))
+    assert [rule.id for rule in engine.tick("price_change", "wheat", 6.0)] == ["a1"]
+
+
+def test_alert_fires_again_only_after_dropping_below():
+    engine = _engine(("a1", "u1", "price_change", "wheat", None, 5.0))
+    assert engine.tick("price_change", "wheat", 2.0) == []
+    assert [rule.id for rule in engine.tick("price_change", "wheat", 5.0)] == ["a1"]
+    assert engine.tick("price_change", "wheat", 7.0) == []
+    assert engine.tick("price_change", "wheat", 1.0) == []
+    assert [rule.id for rule in engine.tick("price_change", "wheat", 8.0)] == ["a1"]
+
+
+def test_reload_fires_only_new_alerts_already_past_threshold():
+    engine = _engine(("a1", "u1", "price_change", "wheat", None, 5.0))
+    engine.tick("price_change", "wheat", 6.0)
+    engine.load([
+        ("a1", "u1", "price_change", "wheat", None, 5.0),
+        ("a2", "u2", "price_change", "wheat", None, 4.0)
+    ])
+    assert [rule.id for rule in engine.tick("price_change", "wheat", 6.0)] == ["a2"]
+    assert engine.tick("price_change", "wheat", 6.5) == []
+
+
+def test_country_alerts_only_fire_for_their_country():
+    engine = _engine(("a1", "u1", "weather_alert", "wheat", "India", 3.0))
+    assert engine.tick("weather_alert", "wheat", 4.0, country="United States") == []
+    assert [rule.id for rule in engine.tick("weather_alert", "wheat", 4.0, country="India")] == ["a1"]
+
+
+def test_fired_alerts_are_pending_until_taken():
+    engine = _engine(("a1", "u1", "price_change", "wheat", None, 5.0))
+    engine.tick("price_change", "wheat", 6.0)
+    assert [alert_id for alert_id, _ in engine.take_pending()] == ["a1"]
+    assert engine.take_pending() == []
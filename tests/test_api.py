@@ -0,0 +1,250 @@
+"""
+Tests for the API routes
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.connectors.base import BaseConnector
+from app.models.schemas import NewsArticle, SourceType
+from app.routes import api
+from app.services.account_store import SQLiteAccountStore
+from app.services.article_store import SQLiteArticleStore
+from app.services.pagination import decode_token, encode_cursor
+
+
+def _client(user_id: Optional[str] = None) -> TestClient:
+    """Client for the API router, as an authenticated user_id if given"""
+    app = FastAPI()
+    app.include_router(api.router)
+
+    async def as_user(scope, receive, send):
+        if user_id is not None:
+            scope.setdefault("state", {})["user_id"] = user_id
+        await app(scope, receive, send)
+
+    return TestClient(as_user)
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """SQLite article and account stores sharing one file, as when both default to ARTICLE_STORE_URL"""
+    path = str(tmp_path / "articles.db")
+    articles, accounts = SQLiteArticleStore(path), SQLiteAccountStore(path)
+    asyncio.run(articles.open())
+    asyncio.run(accounts.open())
+    monkeypatch.setattr(api, "article_store", articles)
+    monkeypatch.setattr(api, "account_store", accounts)
+    return articles, accounts
+
+
+def test_saved_query_matches_are_only_shown_to_the_owner(stores):
+    articles, accounts = stores
+    query_id = str(uuid.uuid4())
+    conn = accounts._connect()
+    conn.execute(
+        "INSERT INTO saved_queries (id, user_id, name, query_params) VALUES (?, ?, ?, ?)",
+        (query_id, "user-1", "Wheat", '{"commodity": "wheat"}')
+    )
+    conn.commit()
+    article = NewsArticle(headline="Wheat prices rise", source="perplexity")
+    asyncio.run(articles.upsert([article]))
+    asyncio.run(articles.record_matches([(query_id, article)]))
+
+    response = _client("user-1").get(f"/api/v1/saved-queries/{query_id}/matches")
+    assert response.status_code == 200, response.text
+    assert [a["headline"] for a in response.json()["data"]] == ["Wheat prices rise"]
+
+    # Someone else's query, an unauthenticated caller and a missing query look the same
+    assert _client("user-2").get(f"/api/v1/saved-queries/{query_id}/matches").status_code == 404
+    assert _client().get(f"/api/v1/saved-queries/{query_id}/matches").status_code == 404
+    assert _client("user-1").get(f"/api/v1/saved-queries/{uuid.uuid4()}/matches").status_code == 404
+    # Rejected before reaching a uuid column
+    assert _client("user-1").get("/api/v1/saved-queries/not-a-uuid/matches").status_code == 422
+
+
+def test_activity_usage_is_scoped_to_the_caller(stores):
+    _, accounts = stores
+    now = datetime.utcnow()
+    asyncio.run(accounts.insert_activity([
+        ("user-1", "api_call", "/api/v1/news", None, None, {}, now),
+        ("user-2", "api_call", "/api/v1/news", None, None, {}, now),
+        ("user-2", "api_call", "/api/v1/search", None, None, {}, now)
+    ]))
+
+    assert _client("user-1").get("/api/v1/activity/usage").json()["total"] == 1
+    # Asking for another user's activity is not possible
+    assert _client("user-1").get("/api/v1/activity/usage", params={"user_id": "user-2"}).json()["total"] == 1
+    # Without authentication the deployment has a single tenant
+    assert _client().get("/api/v1/activity/usage").json()["total"] == 3
+
+
+def _pages(client, path, params):
+    """Follow next_cursor from the first page to the last, returning every page's headlines"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([a["headline"] for a in body["data"]])
+        cursor = body["metadata"]["next_cursor"]
+        if not cursor:
+            return pages
+
+
+def test_search_ranks_headline_matches_and_pages_by_key(stores):
+    articles, _ = stores
+    start = datetime(2025, 11, 1)
+    asyncio.run(articles.upsert([
+        NewsArticle(headline="Rice market update", summary="New wheat export rules", source="perplexity", timestamp=start),
+        NewsArticle(headline="Wheat export ban extended", source="perplexity", timestamp=start - timedelta(days=1)),
+        *[
+            NewsArticle(headline=f"Wheat report {day}", source="perplexity", timestamp=start + timedelta(days=day))
+            for day in range(1, 4)
+        ]
+    ]))
+    client = _client()
+
+    ranked = client.get("/api/v1/search", params={"q": "wheat export"}).json()["data"]
+    assert [a["headline"] for a in ranked] == ["Wheat export ban extended", "Rice market update"]
+
+    recency = _pages(client, "/api/v1/search", {"q": "wheat", "sort": "recency", "page_size": 2})
+    assert recency == [
+        ["Wheat report 3", "Wheat report 2"],
+        ["Wheat report 1", "Rice market update"],
+        ["Wheat export ban extended"]
+    ]
+    relevance = _pages(client, "/api/v1/search", {"q": "wheat", "page_size": 2})
+    assert sorted(sum(relevance, [])) == sorted(sum(recency, []))
+    # Summary-only matches rank last
+    assert relevance[-1] == ["Rice market update"]
+
+
+def test_search_rejects_bad_cursors(stores):
+    articles, _ = stores
+    asyncio.run(articles.upsert([
+        NewsArticle(headline=f"Wheat report {day}", source="perplexity", timestamp=datetime(2025, 11, day))
+        for day in range(1, 4)
+    ]))
+    client = _client()
+    for sort in ("relevance", "recency"):
+        params = {"q": "wheat", "sort": sort, "page_size": 1}
+        state = decode_token(client.get("/api/v1/search", params=params).json()["metadata"]["next_cursor"])
+        for key in (["not a key", state["k"][1]], [state["k"][0], "1"], [None, 1], state["k"][:1], "k"):
+            tampered = encode_cursor({**state, "k": key})
+            response = client.get("/api/v1/search", params={**params, "cursor": tampered})
+            assert response.status_code == 400, (sort, key, response.text)
+        # A cursor only continues the query it came from
+        response = client.get("/api/v1/search", params={**params, "q": "rice", "cursor": encode_cursor(state)})
+        assert response.status_code == 400
+    assert client.get("/api/v1/search", params={"q": "wheat", "cursor": "%%%"}).status_code == 400
+
+
+def test_change_feed_pages_by_seq_and_replays_updates(stores):
+    articles, _ = stores
+    feed = [
+        NewsArticle(headline=f"Story {n}", source="perplexity", url=f"https://example.com/{n}", commodity_tags=tags)
+        for n, tags in enumerate((["grains"], ["metals"], ["grains"], ["grains"]))
+    ]
+    asyncio.run(articles.upsert(feed))
+    client = _client()
+
+    def poll(cursor=None, **params):
+        response = client.get("/api/v1/news/changes", params={**params, **({"since": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    first = poll(limit=2)
+    assert [c["article"]["headline"] for c in first["data"]] == ["Story 0", "Story 1"]
+    assert first["has_more"] and [c["seq"] for c in first["data"]] == sorted(c["seq"] for c in first["data"])
+    rest = poll(first["next_cursor"], limit=2)
+    assert [c["article"]["headline"] for c in rest["data"]] == ["Story 2", "Story 3"]
+    assert min(c["seq"] for c in rest["data"]) > max(c["seq"] for c in first["data"])
+    assert poll(rest["next_cursor"])["data"] == []
+
+    # A changed article comes back under the same key; an unchanged re-upsert does not
+    asyncio.run(articles.upsert([feed[1].model_copy(update={"summary": "Gold edges higher"}), feed[2]]))
+    updated = poll(rest["next_cursor"])
+    assert [(c["key"], c["article"]["summary"]) for c in updated["data"]] == [
+        (first["data"][1]["key"], "Gold edges higher")
+    ]
+
+    # Filtered feeds skip other articles but still advance the cursor past them
+    grains = poll(commodity="grains")
+    assert [c["article"]["headline"] for c in grains["data"]] == ["Story 0", "Story 2", "Story 3"]
+    assert poll(grains["next_cursor"], commodity="grains")["data"] == []
+
+
+def test_change_feed_rejects_invalid_cursors():
+    client = _client()
+    for cursor in ("%%%", encode_cursor({"q": -1}), encode_cursor({"q": "5"}), encode_cursor({"k": 5})):
+        assert client.get("/api/v1/news/changes", params={"since": cursor}).status_code == 400
+
+
+class StaticConnector(BaseConnector):
+    """Connector returning fixed articles, or raising a given error"""
+
+    def __init__(self, articles=(), error=None):
+        super().__init__()
+        self.articles = list(articles)
+        self.error = error
+
+    async def fetch_news(self, query=None, country=None, commodity=None, limit=10, news_query=None):
+        if self.error:
+            raise self.error
+        return list(self.articles)
+
+
+def _sse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_streams_report_only_failed_sources_as_failed(stores, monkeypatch):
+    wheat = "Wheat prices surge on supply concerns"
+    monkeypatch.setattr(api.news_service, "connectors", {
+        SourceType.ZEE_BUSINESS: StaticConnector([NewsArticle(headline=wheat, source="zee_business")]),
+        SourceType.PERPLEXITY: StaticConnector([NewsArticle(headline=wheat, source="perplexity")]),
+        SourceType.GOOGLE_SEARCH: StaticConnector([]),
+        SourceType.BAIDU_NEWS: StaticConnector(error=RuntimeError("upstream down"))
+    })
+    client = _client()
+
+    sse = client.get("/api/v1/news", params={"stream": "sse"})
+    assert sse.status_code == 200 and sse.headers["content-type"].startswith("text/event-stream")
+    ndjson = client.get("/api/v1/news", params={"stream": "ndjson"})
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+
+    for events in (_sse_events(sse.text), [(e["event"], e["data"]) for e in map(json.loads, ndjson.text.splitlines())]):
+        assert [data["source"] for event, data in events if event == "source_failed"] == ["baidu_news"]
+        # Both copies of the story arrive, the second is dropped as a duplicate
+        sent = [a["headline"] for event, data in events if event == "articles" for a in data["data"]]
+        assert sent == [wheat]
+        event, metadata = events[-1]
+        assert event == "metadata" and metadata["total_results"] == 1
+        assert metadata["failed_sources"] == ["baidu_news"]
+        assert sorted(metadata["sources_used"]) == ["google_search", "perplexity", "zee_business"]
+
+
+def test_store_served_news_reports_stale_sources(stores, monkeypatch):
+    articles, _ = stores
+    monkeypatch.setattr(api.settings, "NEWS_READ_FROM_STORE", True)
+    asyncio.run(articles.upsert([NewsArticle(headline="Wheat prices rise", source="perplexity", commodity_tags=["grains"])]))
+    articles.track_sources(["perplexity", "zee_business"])
+    articles.mark_fresh("perplexity")
+
+    metadata = _client().get("/api/v1/news", params={"commodity": "wheat"}).json()["metadata"]
+    assert metadata["sources_used"] == ["perplexity"]
+    assert metadata["failed_sources"] == ["zee_business"]
+
+    events = _sse_events(_client().get("/api/v1/news", params={"commodity": "wheat", "stream": "sse"}).text)
+    assert [data["source"] for event, data in events if event == "source_failed"] == ["zee_business"]
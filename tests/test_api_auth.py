@@ -0,0 +1,132 @@
+"""
+Tests for API-key authentication
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from app import middleware
+from app.middleware import ApiKeyAuthMiddleware
+from app.services.api_auth import ApiKeyAuthenticator, AuthError
+
+
+class StubDatabase:
+    """Answers key lookups after a delay, counting the queries"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.lookups = 0
+        self.touched = []
+
+    async def get_api_key(self, api_key):
+        self.lookups += 1
+        await asyncio.sleep(self.delay)
+        if api_key != "good":
+            return None
+        return {
+            "key_id": "k1", "user_id": "u1", "is_active": True, "expires_at": None,
+            "plan_type": "starter", "max_api_calls": 100
+        }
+
+    async def touch_api_keys(self, used):
+        self.touched.extend(used)
+        return len(used)
+
+
+def test_concurrent_misses_share_one_lookup():
+    async def main():
+        db = StubDatabase()
+        auth = ApiKeyAuthenticator(db)
+        results = await asyncio.gather(*(auth.authenticate("good") for _ in range(5)))
+        assert db.lookups == 1
+        assert {info.user_id for info, _ in results} == {"u1"}
+
+    asyncio.run(main())
+
+
+def test_waiters_survive_cancelled_lookup():
+    async def main():
+        db = StubDatabase()
+        auth = ApiKeyAuthenticator(db)
+        leader = asyncio.create_task(auth.authenticate("good"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(auth.authenticate("good"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        info, _ = await asyncio.wait_for(waiter, 1)
+        assert info.key_id == "k1"
+        assert db.lookups == 2
+
+    asyncio.run(main())
+
+
+def test_unknown_key_is_rejected_and_negatively_cached():
+    async def main():
+        db = StubDatabase(delay=0)
+        auth = ApiKeyAuthenticator(db)
+        for _ in range(3):
+            with pytest.raises(AuthError) as raised:
+                await auth.authenticate("bad")
+            assert raised.value.status_code == 401
+        assert db.lookups == 1
+
+    asyncio.run(main())
+
+
+def test_quota_exhaustion_returns_429(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "API_RATE_BURST", 2)
+
+    async def main():
+        auth = ApiKeyAuthenticator(StubDatabase(delay=0))
+        await auth.authenticate("good")
+        await auth.authenticate("good")
+        with pytest.raises(AuthError) as raised:
+            await auth.authenticate("good")
+        assert raised.value.status_code == 429
+        assert "Retry-After" in raised.value.headers
+
+    asyncio.run(main())
+
+
+def test_usage_is_flushed_in_one_batch():
+    async def main():
+        db = StubDatabase(delay=0)
+        auth = ApiKeyAuthenticator(db)
+        for _ in range(3):
+            await auth.authenticate("good")
+        assert await auth.flush() == 1
+        assert db.touched[0][:2] == ("k1", 3)
+
+    asyncio.run(main())
+
+
+def _socket_app():
+    app = FastAPI()
+
+    @app.websocket("/api/v1/subscribe/ws")
+    async def subscribe(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_json({"user_id": websocket.state.user_id})
+        await websocket.close()
+
+    app.add_middleware(ApiKeyAuthMiddleware)
+    return app
+
+
+def test_websockets_need_a_valid_key(monkeypatch):
+    monkeypatch.setattr(middleware, "authenticator", ApiKeyAuthenticator(StubDatabase(delay=0)))
+    client = TestClient(_socket_app())
+
+    for url in ("/api/v1/subscribe/ws", "/api/v1/subscribe/ws?api_key=bad"):
+        with pytest.raises(WebSocketDisconnect) as raised:
+            with client.websocket_connect(url):
+                pass
+        assert raised.value.code == 1008
+
+    with client.websocket_connect("/api/v1/subscribe/ws?api_key=good") as websocket:
+        assert websocket.receive_json() == {"user_id": "u1"}
+    with client.websocket_connect("/api/v1/subscribe/ws", headers={"X-API-Key": "good"}) as websocket:
+        assert websocket.receive_json() == {"user_id": "u1"}
@@ -0,0 +1,49 @@
+"""
+Tests for the article store backends
+"""
+import asyncio
+
+from app.models.schemas import NewsArticle
+from app.services.article_store import PostgresArticleStore, SQLiteArticleStore
+
+
+def test_backends_implement_every_store_method():
+    for backend in (SQLiteArticleStore, PostgresArticleStore):
+        assert not backend.__abstractmethods__, f"{backend.__name__} does not implement {set(backend.__abstractmethods__)}"
+
+
+def _article(headline, tags, summary=None):
+    return NewsArticle(headline=headline, source="perplexity", commodity_tags=tags, summary=summary)
+
+
+def test_commodity_filter_matches_tags_or_text(tmp_path):
+    async def main():
+        store = SQLiteArticleStore(str(tmp_path / "articles.db"))
+        await store.upsert([
+            _article("Wheat prices surge on supply concerns", ["grains"]),
+            _article("Harvest outlook improves", ["grains"], summary="Wheat and corn yields rise"),
+            _article("Monsoon arrives early", ["agriculture"]),
+            _article("Gold holds steady", ["metals"])
+        ])
+        wheat = await store.query(filters={"commodity": "wheat"})
+        assert {a.headline for a in wheat} == {
+            "Wheat prices surge on supply concerns", "Harvest outlook improves"
+        }
+        agriculture = await store.query(filters={"commodity": "agriculture"})
+        assert [a.headline for a in agriculture] == ["Monsoon arrives early"]
+
+    asyncio.run(main())
+
+
+def test_fresh_store_answers_even_when_nothing_matches(tmp_path, monkeypatch):
+    from app.routes import api
+
+    async def main():
+        store = SQLiteArticleStore(str(tmp_path / "articles.db"))
+        await store.open()
+        monkeypatch.setattr(api, "article_store", store)
+        assert await api._read_store({"commodity": "wheat"}) is None
+        store.mark_fresh()
+        assert await api._read_store({"commodity": "wheat"}) == []
+
+    asyncio.run(main())
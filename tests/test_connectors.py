@@ -0,0 +1,44 @@
+"""
+Tests for connector article building
+"""
+from app.connectors import PerplexityConnector
+from app.models.schemas import NewsCategory, NewsQuery
+from app.utils.model_classifier import NaiveBayesCategoryClassifier
+
+
+class CountingClassifier:
+    """Classifies everything as price news, recording each batch"""
+
+    def __init__(self):
+        self.batches = []
+
+    def classify_articles(self, items):
+        self.batches.append(list(items))
+        return [NewsCategory.PRICE] * len(items)
+
+
+def test_items_are_classified_in_one_batch_after_cheap_checks():
+    connector = PerplexityConnector()
+    connector.classifier = CountingClassifier()
+    articles = connector._build_articles(
+        "perplexity",
+        [
+            {"headline": "Wheat prices surge on export fears"},
+            {"headline": "Gold rallies as dollar weakens"},
+            {"headline": "Corn futures slip on rain forecast"}
+        ],
+        news_query=NewsQuery(commodity="grains", filters={"commodity": "grains"})
+    )
+    assert [a.headline for a in articles] == ["Wheat prices surge on export fears", "Corn futures slip on rain forecast"]
+    assert all(a.category == NewsCategory.PRICE for a in articles)
+    # The gold item fails the commodity filter before classification
+    assert [len(batch) for batch in connector.classifier.batches] == [2]
+
+
+def test_model_batch_matches_single_classification():
+    model = NaiveBayesCategoryClassifier(n_features=2 ** 10).fit(
+        ["wheat price rally futures", "drought flood rainfall storm", "export ban trade deal"],
+        [NewsCategory.PRICE, NewsCategory.CLIMATE, NewsCategory.TRADE]
+    )
+    items = [("Futures rally", "wheat price"), ("Storm and flood", None), ("", None)]
+    assert model.classify_articles(items) == [model.classify_article(h, s) for h, s in items]
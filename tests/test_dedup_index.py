@@ -0,0 +1,50 @@
+"""
+Tests for the persistent dedup index
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.schemas import NewsArticle
+from app.services.dedup_index import DedupIndex, canonicalize_url
+
+
+def _article(headline, url):
+    return NewsArticle(headline=headline, source="perplexity", url=url)
+
+
+def test_canonical_urls_ignore_tracking_and_case():
+    assert canonicalize_url("https://WWW.Example.com/a/?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+
+
+def test_both_url_and_headline_must_match(tmp_path):
+    async def main():
+        index = DedupIndex(str(tmp_path / "dedup.db"))
+        await index.add_many([("https://example.com/market", "Market update")])
+        candidates = [
+            _article("Market update", "https://example.com/market?utm_source=feed"),
+            _article("Market update", "https://example.com/other"),
+            _article("Wheat prices surge", "https://example.com/market")
+        ]
+        unseen = await index.filter_unseen(candidates)
+        assert [a.url for a in unseen] == ["https://example.com/other", "https://example.com/market"]
+        assert index.recently_seen("https://example.com/market", "update market")
+        index.close()
+
+    asyncio.run(main())
+
+
+def test_keys_expire_after_ttl(tmp_path, monkeypatch):
+    async def main():
+        index = DedupIndex(str(tmp_path / "dedup.db"))
+        article = _article("Wheat prices surge", "https://example.com/a")
+        await index.add_many([(article.url, article.headline)])
+        index._conn.execute("UPDATE seen_items SET first_seen = ?", (datetime.utcnow() - timedelta(days=2),))
+        index._recent.clear()
+        monkeypatch.setattr(settings, "DEDUP_INDEX_TTL_DAYS", 1)
+        assert await index.filter_unseen([article]) == [article]
+        assert await index.add_many([(article.url, article.headline)]) == 1
+        assert await index.filter_unseen([article]) == []
+        index.close()
+
+    asyncio.run(main())
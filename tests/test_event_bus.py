@@ -0,0 +1,54 @@
+"""
+Tests for the subscription event bus
+"""
+import asyncio
+
+from app.services.event_bus import EventBus, Interest
+
+
+def test_publish_reaches_only_interested_subscribers():
+    async def main():
+        bus = EventBus(buffer_size=10)
+        wheat = bus.subscribe(Interest(types=["news"], products=["wheat"]))
+        alerts = bus.subscribe(Interest(types=["weather_alert"]))
+        everything = bus.subscribe(Interest())
+
+        bus.publish("news", {"headline": "Wheat rallies"}, commodities=["Wheat"])
+        bus.publish("news", {"headline": "Gold slips"}, commodities=["gold"])
+
+        assert wheat.queue.get_nowait().data["headline"] == "Wheat rallies"
+        assert wheat.queue.empty() and alerts.queue.empty()
+        assert everything.queue.qsize() == 2
+
+        for subscriber in (wheat, alerts, everything):
+            bus.unsubscribe(subscriber)
+        assert bus.get_stats()["subscribers"] == 0
+
+    asyncio.run(main())
+
+
+def test_replay_reports_events_lost_from_the_buffer():
+    bus = EventBus(buffer_size=2)
+    for n in range(3):
+        bus.publish("news", {"n": n})
+
+    events, complete = bus.replay(0, Interest())
+    assert [e.data["n"] for e in events] == [1, 2] and not complete
+    events, complete = bus.replay(1, Interest())
+    assert [e.data["n"] for e in events] == [1, 2] and complete
+
+
+def test_wait_returns_the_next_event_or_times_out():
+    async def main():
+        bus = EventBus(buffer_size=10)
+        assert await bus.wait(0, Interest(), timeout=0.01) == ([], True)
+
+        waiter = asyncio.create_task(bus.wait(bus.last_seq, Interest(types=["news"]), timeout=5))
+        await asyncio.sleep(0)
+        bus.publish("weather_alert", {"n": 1})
+        bus.publish("news", {"n": 2})
+        events, complete = await waiter
+        assert [e.data["n"] for e in events] == [2] and complete
+        assert bus.get_stats()["subscribers"] == 0
+
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+"""
+Tests for adaptive fetch budgets
+"""
+from app.services.fetch_budget import PRIOR_YIELD, FetchBudgetTracker
+
+
+def test_unobserved_sources_use_the_prior():
+    tracker = FetchBudgetTracker(min_budget=2, max_budget=50)
+    assert tracker.expected_yield("perplexity") == PRIOR_YIELD
+    assert tracker.plan(["perplexity"], target=10) == {"perplexity": 20}
+
+
+def test_high_yield_sources_are_asked_first_and_for_less():
+    tracker = FetchBudgetTracker(min_budget=2, max_budget=50)
+    for _ in range(10):
+        tracker.record("perplexity", requested=10, kept=9)
+        tracker.record("google_search", requested=10, kept=1)
+
+    budgets = tracker.plan(["google_search", "perplexity"], target=9)
+    assert list(budgets) == ["perplexity", "google_search"]
+    assert budgets["perplexity"] <= 11
+    # The remaining need is tiny, so the low-yield source gets the floor
+    assert budgets["google_search"] == 2
+
+
+def test_yields_fall_back_to_coarser_keys():
+    tracker = FetchBudgetTracker()
+    tracker.record("perplexity", requested=10, kept=2, category="market", product="wheat")
+    assert tracker.expected_yield("perplexity", "market", "corn") == tracker.expected_yield("perplexity", "market", "wheat")
+    assert tracker.expected_yield("perplexity") < PRIOR_YIELD
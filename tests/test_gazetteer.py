@@ -0,0 +1,21 @@
+"""
+Tests for place extraction with the gazetteer
+"""
+from app.utils.gazetteer import gazetteer
+
+
+def test_extracts_country_and_state_from_text():
+    assert gazetteer.extract("Heavy rains lash Maharashtra as monsoon advances") == ("India", "Maharashtra")
+    assert gazetteer.extract("Drought grips Kansas wheat fields") == ("United States", "Kansas")
+    assert gazetteer.extract("Markets close higher") == (None, None)
+
+
+def test_known_country_takes_precedence():
+    country, _ = gazetteer.extract("Brazil and India lead soybean exports", country="USA")
+    assert country == "United States"
+
+
+def test_aliases_resolve_to_canonical_names():
+    assert gazetteer.canonical_country("USA") == "United States"
+    assert gazetteer.canonical_state("UP", country="India") == "Uttar Pradesh"
+    assert gazetteer.canonical_country("Atlantis") is None
@@ -0,0 +1,19 @@
+"""
+Tests that packages import on their own, in any order
+"""
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["app.connectors", "app.connectors.base", "app.services", "app.main"])
+def test_module_imports_in_a_fresh_interpreter(module):
+    result = subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_aggregator_is_exported_from_the_services_package():
+    from app.services import NewsAggregatorService
+    from app.services.aggregator import NewsAggregatorService as aggregator_class
+    assert NewsAggregatorService is aggregator_class
@@ -0,0 +1,111 @@
+"""
+Tests for background ingestion
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.schemas import NewsArticle, SourceType
+from app.services.aggregator import NewsAggregatorService
+from app.services.article_store import SQLiteArticleStore
+from app.services.dedup_index import DedupIndex
+from app.services.ingestion import IngestionService
+
+
+class StaticConnector:
+    """Returns the same articles on every fetch"""
+
+    def __init__(self, articles):
+        self.articles = articles
+
+    async def fetch_news(self, query=None, country=None, commodity=None, limit=10, news_query=None):
+        return list(self.articles)
+
+
+class StubAggregator:
+    """Answers every fetch with a fixed result"""
+
+    def __init__(self, articles=None, error=None):
+        self.articles = articles or []
+        self.error = error
+
+    async def fetch_from_source(self, source, query=None, limit=20):
+        return self.articles, self.error
+
+    async def record_ingested(self, articles):
+        return len(articles)
+
+
+def test_poll_without_new_articles_keeps_store_fresh(tmp_path):
+    async def main():
+        store = SQLiteArticleStore(str(tmp_path / "articles.db"))
+        await store.open()
+        service = IngestionService(store, aggregator=StubAggregator(), queries=["grains"])
+        assert not store.is_fresh()
+        assert await service.poll(SourceType.PERPLEXITY) == 0
+        assert store.is_fresh()
+
+    asyncio.run(main())
+
+
+def test_failed_poll_does_not_refresh_store(tmp_path):
+    async def main():
+        store = SQLiteArticleStore(str(tmp_path / "articles.db"))
+        await store.open()
+        service = IngestionService(store, aggregator=StubAggregator(error="timeout"), queries=["grains"])
+        with pytest.raises(RuntimeError):
+            await service.poll(SourceType.PERPLEXITY)
+        assert not store.is_fresh()
+
+    asyncio.run(main())
+
+
+class FailingStore(SQLiteArticleStore):
+    async def upsert(self, articles):
+        raise RuntimeError("disk full")
+
+
+def test_articles_are_recorded_only_once_stored(tmp_path):
+    async def main():
+        index = DedupIndex(str(tmp_path / "dedup.db"))
+        aggregator = NewsAggregatorService(dedup_index=index)
+        article = NewsArticle(headline="Wheat prices surge", source="perplexity", url="https://example.com/a")
+        aggregator.connectors = {SourceType.PERPLEXITY: StaticConnector([article])}
+
+        failing = IngestionService(FailingStore(str(tmp_path / "a.db")), aggregator=aggregator, queries=["grains"])
+        with pytest.raises(RuntimeError):
+            await failing.poll(SourceType.PERPLEXITY)
+        assert await index.filter_unseen([article]) == [article]
+
+        store = SQLiteArticleStore(str(tmp_path / "b.db"))
+        service = IngestionService(store, aggregator=aggregator, queries=["grains"])
+        assert await service.poll(SourceType.PERPLEXITY) == 1
+        assert await index.filter_unseen([article]) == []
+        assert await service.poll(SourceType.PERPLEXITY) == 0
+        index.close()
+
+    asyncio.run(main())
+
+
+def test_freshness_is_tracked_per_source(tmp_path):
+    async def main():
+        store = SQLiteArticleStore(str(tmp_path / "articles.db"))
+        await store.open()
+        store.track_sources(["perplexity", "zee_business"])
+        healthy = IngestionService(store, aggregator=StubAggregator(), queries=["grains"])
+        failing = IngestionService(store, aggregator=StubAggregator(error="timeout"), queries=["grains"])
+
+        assert store.stale_sources() == ["perplexity", "zee_business"]
+        await healthy.poll(SourceType.PERPLEXITY)
+        with pytest.raises(RuntimeError):
+            await failing.poll(SourceType.ZEE_BUSINESS)
+        # One healthy source keeps the store readable, but the other is reported
+        assert store.is_fresh()
+        assert store.stale_sources() == ["zee_business"]
+
+        store.source_polls["perplexity"] -= timedelta(seconds=settings.ARTICLE_STORE_MAX_AGE + 1)
+        assert store.stale_sources() == ["perplexity", "zee_business"]
+
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""
+Tests for the Prometheus metrics registry
+"""
+from app.services.metrics import Histogram, Metrics
+
+
+def test_histogram_buckets_are_rendered_cumulative():
+    metrics = Metrics()
+    for seconds in (0.003, 0.02, 0.02, 30.0):
+        metrics.observe_request("GET", "/api/v1/news", 200, seconds)
+    metrics.observe_request("GET", "/api/v1/news", 503, 0.001)
+
+    lines = metrics.render().splitlines()
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/news",le="0.005"} 2' in lines
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/news",le="0.025"} 4' in lines
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/news",le="+Inf"} 5' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/news"} 5' in lines
+    assert 'http_responses_total{method="GET",route="/api/v1/news",status="503"} 1' in lines
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+
+
+def test_upstream_errors_and_label_escaping():
+    metrics = Metrics()
+    metrics.observe_upstream("perplexity", 'api."x"', 0.2, error="http_429")
+    metrics.observe_upstream("perplexity", 'api."x"', 0.1)
+
+    lines = metrics.render().splitlines()
+    assert 'upstream_errors_total{upstream="perplexity",host="api.\\"x\\"",reason="http_429"} 1' in lines
+    assert 'upstream_request_duration_seconds_count{upstream="perplexity",host="api.\\"x\\""} 2' in lines
+
+
+def test_observations_fall_in_the_first_bucket_at_or_above_them():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.1, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 1, 1]
+    assert histogram.sum == 2.6
@@ -0,0 +1,66 @@
+"""
+Tests for the ASGI middleware layers
+"""
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware import MetricsMiddleware, TracingMiddleware
+from app.services.metrics import metrics
+from app.services.tracing import TracedRoute, span
+
+
+def _app() -> FastAPI:
+    router = APIRouter(route_class=TracedRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with span("lookup"):
+            return {"id": item_id}
+
+    @router.get("/stream")
+    async def stream():
+        async def chunks():
+            with span("produce"):
+                yield b"a\n"
+                yield b"b\n"
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_server_timing_covers_finished_spans():
+    response = TestClient(_app()).get("/items/7")
+    assert response.json() == {"id": 7}
+    timing = response.headers["server-timing"]
+    assert timing.startswith("total;dur=")
+    assert "lookup;dur=" in timing and "endpoint;dur=" in timing
+    assert response.headers["traceparent"].startswith("00-")
+
+
+def test_streamed_responses_get_no_server_timing():
+    response = TestClient(_app()).get("/stream")
+    assert response.text == "a\nb\n"
+    assert "server-timing" not in response.headers
+    assert "traceparent" in response.headers
+
+
+def test_debug_trace_is_added_to_json_bodies(monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_DEBUG", True)
+    body = TestClient(_app()).get("/items/7?trace=tree").json()
+    assert body["id"] == 7
+    assert body["trace"]["root"]["name"] == "GET /items/{item_id}"
+
+
+def test_metrics_are_recorded_by_route_template():
+    before = metrics.responses.get(("GET", "/items/{item_id}", "200"), 0)
+    client = TestClient(_app())
+    client.get("/items/1")
+    client.get("/items/2")
+    assert metrics.responses[("GET", "/items/{item_id}", "200")] == before + 2
+    assert metrics.inflight == 0
@@ -0,0 +1,44 @@
+"""
+Tests for headline near-duplicate detection
+"""
+from app.models.schemas import NewsArticle
+from app.utils.normalizer import ArticleDeduplicator, deduplicate_articles
+
+
+def _article(headline, source="perplexity", url=None):
+    return NewsArticle(headline=headline, source=source, url=url)
+
+
+def test_near_duplicate_headlines_keep_the_best_sourced_copy():
+    kept = deduplicate_articles([
+        _article("Wheat prices surge on supply concerns"),
+        _article("Gold holds steady"),
+        _article("Wheat Prices Surge on Supply Concerns!", source="zee_business", url="https://example.com/wheat")
+    ], threshold=0.7)
+    assert [(a.headline, a.source) for a in kept] == [
+        ("Wheat Prices Surge on Supply Concerns!", "zee_business"),
+        ("Gold holds steady", "perplexity")
+    ]
+
+
+def test_later_copies_are_compared_with_the_replacement():
+    deduplicator = ArticleDeduplicator(threshold=0.7)
+    assert deduplicator.add(_article("Wheat prices surge on supply concerns"))
+    # Better sourced, so it replaces the first copy
+    assert not deduplicator.add(_article("Wheat prices surge on global supply concerns", "zee_business", "https://example.com/a"))
+    # Too far from the first headline (5 of 8 words), close to the replacement (6 of 8)
+    assert not deduplicator.add(_article("Wheat prices surge on global supply worries"))
+    assert [a.headline for a in deduplicator.articles] == ["Wheat prices surge on global supply concerns"]
+
+
+def test_headlines_sharing_most_words_stay_distinct():
+    headlines = [
+        "Wheat prices rise on strong export demand",
+        "Wheat prices fall on strong export demand",
+        "Wheat prices rise",
+        "Wheat prices fall",
+        "Corn futures rally as drought hits Midwest",
+        "Corn futures slide as drought eases in Midwest"
+    ]
+    kept = deduplicate_articles([_article(headline) for headline in headlines], threshold=0.7)
+    assert [a.headline for a in kept] == headlines
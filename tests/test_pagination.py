@@ -0,0 +1,67 @@
+"""
+Tests for cursor pagination over merged snapshots
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.schemas import NewsArticle
+from app.services.pagination import CursorExpiredError, InvalidCursorError, NewsPaginator, SnapshotCache
+
+NOW = datetime(2026, 1, 1, 12)
+
+
+class StubAggregator:
+    """Two sources with interleaved timestamps, counting fan-outs"""
+
+    def __init__(self):
+        self.fanouts = 0
+
+    async def fetch_streams(self, **kwargs):
+        self.fanouts += 1
+        streams = [
+            [NewsArticle(headline=f"Wheat story {i}", source="a", timestamp=NOW - timedelta(minutes=2 * i)) for i in range(5)],
+            [NewsArticle(headline=f"Gold report {i}", source="b", timestamp=NOW - timedelta(minutes=2 * i + 1)) for i in range(5)]
+        ]
+        return streams, ["a", "b"], []
+
+
+def test_pages_walk_the_snapshot_without_refetching():
+    async def main():
+        aggregator = StubAggregator()
+        paginator = NewsPaginator(aggregator, SnapshotCache(max_entries=4, ttl_seconds=60))
+        seen, cursor = [], None
+        while True:
+            articles, cursor, _, _ = await paginator.page(page_size=3, cursor=cursor)
+            seen.extend(articles)
+            if cursor is None:
+                break
+        assert aggregator.fanouts == 1
+        assert len(seen) == 10
+        assert [a.timestamp for a in seen] == sorted((a.timestamp for a in seen), reverse=True)
+
+    asyncio.run(main())
+
+
+def test_expired_or_evicted_snapshot_is_reported():
+    async def main():
+        paginator = NewsPaginator(StubAggregator(), SnapshotCache(max_entries=1, ttl_seconds=60))
+        _, first, _, _ = await paginator.page(page_size=3)
+        # A second query's snapshot evicts the first one
+        await paginator.page(page_size=3, query="other")
+        assert len(paginator.snapshots) == 1
+        with pytest.raises(CursorExpiredError):
+            await paginator.page(page_size=3, cursor=first)
+        with pytest.raises(InvalidCursorError):
+            await paginator.page(page_size=3, cursor=first, query="other")
+
+    asyncio.run(main())
+
+
+def test_snapshot_cache_drops_expired_entries():
+    snapshots = SnapshotCache(max_entries=10, ttl_seconds=0)
+    snapshots.put("a", {"streams": []})
+    assert snapshots.get("a") is None
+    snapshots.put("b", {"streams": []})
+    assert len(snapshots) == 0
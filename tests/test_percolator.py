@@ -0,0 +1,47 @@
+"""
+Tests for the saved-query percolator
+"""
+from app.models.schemas import NewsArticle
+from app.services.percolator import Percolator
+
+
+def _article(headline, tickers=(), tags=(), country=None, summary=None):
+    return NewsArticle(
+        headline=headline, source="perplexity", tickers=list(tickers),
+        commodity_tags=list(tags), country=country, summary=summary
+    )
+
+
+def _percolator():
+    percolator = Percolator()
+    count = percolator.load([
+        ("wheat", "user-1", {"commodity": "wheat"}),
+        ("deere", "user-1", {"ticker": "DE"}),
+        ("india-rain", "user-2", {"country": "India", "query": "rain"}),
+        ("monsoon", None, {"query": "monsoon"})
+    ])
+    assert count == 4
+    return percolator
+
+
+def test_articles_match_anchored_and_unanchored_queries():
+    percolator = _percolator()
+    matches = percolator.match_many([
+        _article("Wheat futures climb", tags=["wheat"]),
+        _article("Deere raises outlook", tickers=["DE"]),
+        _article("Heavy rain lifts sowing", country="India", summary="Monsoon arrives early")
+    ])
+    assert {(query_id, article.headline) for query_id, article in matches} == {
+        ("wheat", "Wheat futures climb"),
+        ("deere", "Deere raises outlook"),
+        ("india-rain", "Heavy rain lifts sowing"),
+        ("monsoon", "Heavy rain lifts sowing")
+    }
+
+
+def test_articles_only_verify_queries_anchored_on_their_values():
+    percolator = _percolator()
+    assert percolator.match(_article("Gold holds steady", tags=["gold"])) == []
+    # Only the unanchored query is a candidate for an article sharing no anchor value
+    assert percolator.get_stats()["candidates"] == 1
+    assert percolator.get_stats()["unanchored"] == 1
@@ -0,0 +1,58 @@
+"""
+Tests for commodity price fetching within the Alpha Vantage quota
+"""
+import asyncio
+
+import httpx
+
+from app.services import price_service as price_module
+from app.services.price_service import AlphaVantageBudget, PriceService
+
+
+def _service(monkeypatch, alpha_answer):
+    """PriceService against fake upstreams; returns it and the hosts it called"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        if request.url.host == "www.alphavantage.co":
+            return httpx.Response(200, json=alpha_answer)
+        return httpx.Response(200, json={"chart": {"result": [
+            {"meta": {"regularMarketPrice": 101.0, "previousClose": 100.0}}
+        ]}})
+
+    monkeypatch.setattr(price_module.config, "alpha_vantage_key", "test-key")
+    monkeypatch.setattr(
+        price_module, "http_client",
+        lambda upstream, **kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return PriceService(AlphaVantageBudget(daily_limit=8)), calls
+
+
+def test_alpha_vantage_quotes_are_cached_to_fit_the_daily_quota(monkeypatch):
+    quote = {"Global Quote": {"05. price": "5.5", "09. change": "0.1", "10. change percent": "1.8%"}}
+    service, calls = _service(monkeypatch, quote)
+    # 4 symbols on 8 calls a day: each quote is good for 12 hours
+    assert service.alpha_vantage_budget.quote_ttl == 12 * 3600
+
+    async def main():
+        for _ in range(5):
+            prices = await service.get_commodity_prices(["Wheat", "Corn"])
+            assert prices["Wheat"]["source"] == "alpha_vantage" and prices["Wheat"]["price"] == 5.5
+
+    asyncio.run(main())
+    assert calls == ["www.alphavantage.co"] * 2
+
+
+def test_rate_limited_alpha_vantage_falls_back_to_yahoo_until_tomorrow(monkeypatch):
+    service, calls = _service(monkeypatch, {"Information": "Our standard API rate limit is 25 requests per day."})
+
+    async def main():
+        for _ in range(3):
+            prices = await service.get_commodity_prices(["Wheat"])
+            assert prices["Wheat"]["source"] == "yahoo_finance"
+
+    asyncio.run(main())
+    # Only the first poll asked Alpha Vantage
+    assert calls == ["www.alphavantage.co", "query1.finance.yahoo.com", "query1.finance.yahoo.com", "query1.finance.yahoo.com"]
+    assert not service.alpha_vantage_budget.take()
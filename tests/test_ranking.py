@@ -0,0 +1,40 @@
+"""
+Tests for relevance ranking
+"""
+from datetime import datetime, timedelta
+
+from app.models.schemas import NewsArticle
+from app.services.ranking import RankingEngine
+
+
+def _article(headline, hours_old=0.0, tags=(), source="perplexity", now=datetime(2024, 5, 1, 12)):
+    return NewsArticle(
+        headline=headline, source=source, commodity_tags=list(tags),
+        timestamp=now - timedelta(hours=hours_old)
+    )
+
+
+def test_query_terms_drop_stopwords_and_duplicates():
+    assert RankingEngine.query_terms("The wheat and the WHEAT prices") == ["wheat", "prices"]
+    assert RankingEngine.query_terms(None) == []
+
+
+def test_text_match_outranks_unrelated_articles():
+    now = datetime(2024, 5, 1, 12)
+    engine = RankingEngine(weights={"bm25": 1.0, "recency": 0.0, "source": 0.0, "tags": 0.0})
+    articles = [
+        _article("Gold holds steady"),
+        _article("Wheat prices surge on wheat export curbs"),
+        _article("Wheat harvest begins")
+    ]
+    ranked = engine.rank(articles, "wheat prices", now=now)
+    assert [a.headline for a in ranked] == [
+        "Wheat prices surge on wheat export curbs", "Wheat harvest begins", "Gold holds steady"
+    ]
+
+
+def test_recency_breaks_ties_without_a_query():
+    now = datetime(2024, 5, 1, 12)
+    engine = RankingEngine(weights={"bm25": 0.0, "recency": 1.0, "source": 0.0, "tags": 0.0})
+    articles = [_article("Older", hours_old=48), _article("Newer", hours_old=1)]
+    assert [a.headline for a in engine.rank(articles, now=now)] == ["Newer", "Older"]
@@ -0,0 +1,44 @@
+"""
+Tests for request tracing spans
+"""
+from app.services import tracing
+from app.services.tracing import server_timing, span, start_trace, to_otlp, traceparent
+
+
+def test_spans_nest_and_sum_by_name_in_server_timing():
+    with start_trace("GET /api/v1/news") as root:
+        with span("fetch") as outer:
+            with span("fetch"):
+                pass
+        with span("encode"):
+            pass
+    assert [child.name for child in root.children] == ["fetch", "encode"]
+    assert outer.children[0].parent_id == outer.span_id
+
+    entries = [entry.split(";")[0] for entry in server_timing(root).split(", ")]
+    assert entries == ["total", "fetch", "encode"]
+
+
+def test_spans_outside_a_trace_are_free():
+    with span("orphan") as orphan:
+        assert orphan is None
+
+
+def test_incoming_traceparent_is_joined():
+    incoming = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    with start_trace("GET /", incoming) as root:
+        pass
+    assert root.trace.trace_id == "a" * 32 and root.parent_id == "b" * 16
+    assert traceparent(root).startswith("00-" + "a" * 32 + "-")
+
+    spans = to_otlp(root)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["parentSpanId"] == "b" * 16
+
+
+def test_spans_past_the_limit_are_dropped(monkeypatch):
+    monkeypatch.setattr(tracing.settings, "TRACING_MAX_SPANS", 3)
+    with start_trace("GET /") as root:
+        for _ in range(5):
+            with span("step"):
+                pass
+    assert len(root.children) == 2 and root.trace.dropped == 3
@@ -0,0 +1,54 @@
+"""
+Train the naive Bayes category model from labelled articles
+
+Input is a JSON Lines file with one article per line:
+    {"headline": "...", "summary": "...", "category": "price"}
+
+Usage:
+    python train_classifier.py labelled.jsonl models/category_nb.npz
+
+Then set CATEGORY_MODEL_PATH=models/category_nb.npz in .env.
+"""
+import argparse
+import json
+import os
+from typing import List, Tuple
+
+from app.models.schemas import NewsCategory
+from app.utils.model_classifier import NaiveBayesCategoryClassifier
+
+
+def load_labelled(path: str) -> Tuple[List[str], List[NewsCategory]]:
+    """Read (text, category) pairs from a JSON Lines file"""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            texts.append(f"{row.get('headline', '')} {row.get('summary') or ''}".strip())
+            labels.append(NewsCategory(row["category"]))
+    return texts, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="Labelled articles (.jsonl)")
+    parser.add_argument("output", help="Where to write the model (.npz)")
+    parser.add_argument("--features", type=int, default=2 ** 18, help="Hash buckets (power of two)")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Smoothing")
+    args = parser.parse_args()
+
+    texts, labels = load_labelled(args.data)
+    model = NaiveBayesCategoryClassifier(n_features=args.features, alpha=args.alpha).fit(texts, labels)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    model.save(args.output)
+
+    print(f"✅ Trained on {len(texts)} articles, {len(model.categories)} categories -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()